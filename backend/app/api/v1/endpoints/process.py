@@ -1,36 +1,67 @@
 from fastapi import APIRouter, HTTPException
-from app.core.processing.api.indexer import ApiIndexer
-from app.core.processing.document.indexer import DocumentIndexer
+from app.core.progress import progress_manager
 from app.core.state import state_manager, ProcessingStatus
+from app.core.tasks.queue import task_queue
 
 router = APIRouter()
 
-@router.post("/document")
-def process_document():
+
+async def _enqueue_indexing_job(source: str, label: str, task_name: str, kwargs: dict = None):
+    """
+    Marks a source as PROCESSING and enqueues its indexing task, restoring the
+    previous status if the task could not be enqueued.
+    """
+    previous_status = state_manager.begin_processing(source)
+    if previous_status is None:
+        raise HTTPException(status_code=409, detail=f"{label} processing is already in progress.")
+
+    try:
+        task_id = await task_queue.enqueue_task(task_name, kwargs=kwargs, metadata={"source": source})
+    except Exception as e:
+        state_manager.set_status(source, previous_status)
+        raise HTTPException(status_code=503, detail=f"Could not enqueue {label} processing: {e}")
+
+    return {
+        "job_id": task_id,
+        "status": ProcessingStatus.PROCESSING.value,
+        "status_url": f"/api/v1/process/jobs/{task_id}",
+    }
+
+
+@router.post("/document", status_code=202)
+async def process_document():
     """
     Endpoint to trigger the processing and indexing of the user guide.
-    This is now a synchronous operation.
+    Indexing runs as a background job; poll the returned job id for progress.
     """
-    if state_manager.get_status("document") == ProcessingStatus.PROCESSING:
-        raise HTTPException(status_code=409, detail="Document processing is already in progress.")
-    
-    indexer = DocumentIndexer()
-    if indexer.index():
-        return {"message": "Document processing completed successfully."}
-    else:
-        raise HTTPException(status_code=500, detail="Document processing failed.")
+    return await _enqueue_indexing_job("document", "Document", "index_document")
 
-@router.post("/api")
-def process_api_spec():
+@router.post("/api", status_code=202)
+async def process_api_spec(incremental: bool = True):
     """
     Endpoint to trigger the processing and indexing of the API specification.
-    This is now a synchronous operation.
+    Indexing runs as a background job; poll the returned job id for progress.
+    By default only the endpoints that were added, changed or removed since
+    the last build are re-indexed; pass ``incremental=false`` to force a full
+    rebuild.
+    """
+    return await _enqueue_indexing_job("api", "API spec", "index_api_spec", {"incremental": incremental})
+
+@router.get("/jobs/{job_id}")
+async def get_processing_job(job_id: str):
+    """
+    Endpoint to get the status and per-phase progress of an indexing job.
     """
-    if state_manager.get_status("api") == ProcessingStatus.PROCESSING:
-        raise HTTPException(status_code=409, detail="API spec processing is already in progress.")
+    task_info = await task_queue.get_task_info(job_id)
+    if task_info is None:
+        raise HTTPException(status_code=404, detail="Job not found.")
 
-    indexer = ApiIndexer()
-    if indexer.index():
-        return {"message": "API spec processing completed successfully."}
-    else:
-        raise HTTPException(status_code=500, detail="API spec processing failed.")
\ No newline at end of file
+    return {
+        "job_id": job_id,
+        "source": task_info.metadata.get("source"),
+        "status": task_info.status.value,
+        "progress": task_info.progress,
+        "error": task_info.error,
+        "result": task_info.result,
+        "phases": await progress_manager.get_progress_status(job_id),
+    }
@@ -1,7 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
+from functools import partial
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
 from app.core.retrieval.api.retriever import ApiRetriever
 from app.core.retrieval.document.retriever import DocumentRetriever
+from app.core.retrieval.fusion.coordinator import RetrievalCoordinator
 from app.core.retrieval.fusion.fuser import Fuser
+from app.core.config import settings
+from app.core.model_registry import model_registry
 from app.core.state import state_manager, ProcessingStatus
 
 router = APIRouter()
@@ -10,6 +15,10 @@ router = APIRouter()
 api_retriever = ApiRetriever()
 doc_retriever = DocumentRetriever()
 fuser = Fuser()
+coordinator = RetrievalCoordinator(
+    fuser,
+    timeouts={"api": settings.RETRIEVAL_API_TIMEOUT_S, "document": settings.RETRIEVAL_DOCUMENT_TIMEOUT_S},
+)
 
 def get_api_retriever():
     return api_retriever
@@ -20,14 +29,24 @@ def get_doc_retriever():
 def get_fuser():
     return fuser
 
+def get_coordinator():
+    return coordinator
+
 @router.get("/document")
-def retrieve_from_document(query: str, retriever: DocumentRetriever = Depends(get_doc_retriever)):
+async def retrieve_from_document(
+    query: str,
+    top_k: int = Query(5, ge=1, le=100),
+    nprobe: Optional[int] = Query(None, ge=1),
+    ef_search: Optional[int] = Query(None, ge=1),
+    retriever: DocumentRetriever = Depends(get_doc_retriever),
+):
     """
     Endpoint to retrieve information from the user guide.
+    ``nprobe`` / ``ef_search`` trade recall for latency on IVF / HNSW indexes.
     """
     if state_manager.get_status("document") != ProcessingStatus.READY:
         raise HTTPException(status_code=400, detail="Document index is not ready. Please process the document first.")
-    results = retriever.retrieve(query)
+    results = await retriever.aretrieve(query, top_k=top_k, nprobe=nprobe, ef_search=ef_search)
     return {"query": query, "source": "document", "results": results}
 
 @router.get("/api")
@@ -41,14 +60,20 @@ def retrieve_from_api_spec(query: str, retriever: ApiRetriever = Depends(get_api
     return {"query": query, "source": "api", "results": results}
 
 @router.get("/fuse")
-def retrieve_fused(
+async def retrieve_fused(
     query: str,
+    top_k: int = Query(settings.FUSION_TOP_K, ge=1, le=100),
+    nprobe: Optional[int] = Query(None, ge=1),
+    ef_search: Optional[int] = Query(None, ge=1),
     api_retriever: ApiRetriever = Depends(get_api_retriever),
     doc_retriever: DocumentRetriever = Depends(get_doc_retriever),
-    fuser: Fuser = Depends(get_fuser)
+    coordinator: RetrievalCoordinator = Depends(get_coordinator)
 ):
     """
     Endpoint to retrieve fused results from all available retrievers.
+    Each retriever only returns as many candidates as fusion needs for top_k.
+    Both retrievers run concurrently; a retriever that times out or fails is
+    left out (``partial`` is true) and per-retriever timings are reported.
     """
     doc_status = state_manager.get_status("document")
     api_status = state_manager.get_status("api")
@@ -59,9 +84,21 @@ def retrieve_fused(
             detail=f"One or more indexes are not ready. Document status: {doc_status.value}, API status: {api_status.value}"
         )
 
-    api_results = api_retriever.retrieve(query)
-    doc_results = doc_retriever.retrieve(query)
+    depth = coordinator.fuser.candidate_depth(top_k)
+    fused = await coordinator.arun(
+        {
+            "api": partial(api_retriever.retrieve_scored, query, top_k=depth, num_candidates=2 * depth),
+            "document": partial(doc_retriever.retrieve_scored, query, top_k=depth, nprobe=nprobe, ef_search=ef_search),
+        },
+        top_k=top_k,
+    )
     
-    fused_results = fuser.fuse([api_results, doc_results])
-    
-    return {"query": query, "source": "fused", "results": fused_results}
\ No newline at end of file
+    return {"query": query, "source": "fused", **fused}
+
+@router.get("/models")
+def get_model_stats():
+    """
+    Endpoint to report which retrieval models are loaded, with their load
+    time and resident-memory footprint.
+    """
+    return {"models": model_registry.get_stats()}
@@ -1,3 +1,4 @@
+from functools import partial
 from typing import List, Any, Optional
 import logging
 
@@ -22,6 +23,8 @@ class AugmentAgent(BaseAgent):
     def _initialize_retriever(self) -> Any:
         """Initialize the retrieval component using existing fusion system"""
         try:
+            from ...config import settings
+            from ...retrieval.fusion.coordinator import RetrievalCoordinator
             from ...retrieval.fusion.fuser import Fuser
             from ...retrieval.api.retriever import ApiRetriever
             from ...retrieval.document.retriever import DocumentRetriever
@@ -30,6 +33,10 @@ class AugmentAgent(BaseAgent):
             api_retriever = ApiRetriever()
             doc_retriever = DocumentRetriever()
             fuser = Fuser()
+            coordinator = RetrievalCoordinator(
+                fuser,
+                timeouts={"api": settings.RETRIEVAL_API_TIMEOUT_S, "document": settings.RETRIEVAL_DOCUMENT_TIMEOUT_S},
+            )
             
             # Create a wrapper that mimics the expected interface
             class RetrievalWrapper:
@@ -38,14 +45,31 @@ class AugmentAgent(BaseAgent):
                     self.doc_retriever = doc_ret
                     self.fuser = fusion
                     self.top_k = top_k
+
+                def _legs(self, query: str):
+                    """API and document retrieval legs, sized for the fused top_k"""
+                    depth = self.fuser.candidate_depth(self.top_k)
+                    return {
+                        "api": partial(self.api_retriever.retrieve_scored, query, top_k=depth, num_candidates=2 * depth),
+                        "document": partial(self.doc_retriever.retrieve_scored, query, top_k=depth),
+                    }
                 
                 def retrieve(self, query: str) -> List[dict]:
                     """Retrieve using fusion of API and document results"""
                     try:
-                        api_results = self.api_retriever.retrieve(query)
-                        doc_results = self.doc_retriever.retrieve(query)
-                        fused_results = self.fuser.fuse([api_results, doc_results])
-                        return fused_results[:self.top_k]
+                        fused = coordinator.run(self._legs(query), top_k=self.top_k)
+                        logger.debug(f"Retrieval timings: {fused['timings']}")
+                        return fused["results"]
+                    except Exception as e:
+                        logger.error(f"Retrieval failed: {e}")
+                        return []
+
+                async def aretrieve(self, query: str) -> List[dict]:
+                    """Async retrieve; both legs run concurrently off the event loop"""
+                    try:
+                        fused = await coordinator.arun(self._legs(query), top_k=self.top_k)
+                        logger.debug(f"Retrieval timings: {fused['timings']}")
+                        return fused["results"]
                     except Exception as e:
                         logger.error(f"Retrieval failed: {e}")
                         return []
@@ -56,6 +80,15 @@ class AugmentAgent(BaseAgent):
             logger.warning(f"Could not initialize retrieval system: {e}")
             return None
     
+    def _query_embedder(self) -> Any:
+        """Share the document retriever's query embeddings, so each query is embedded once"""
+        from ...retrieval.document.query_cache import QueryEmbeddingCache
+        
+        query_cache = getattr(getattr(self.retriever, "doc_retriever", None), "query_cache", None)
+        if isinstance(query_cache, QueryEmbeddingCache):
+            return query_cache.get
+        return super()._query_embedder()
+    
     def _initialize_tools(self) -> List[Any]:
         """Initialize tools available to the agent"""
         tools = []
@@ -65,7 +98,8 @@ class AugmentAgent(BaseAgent):
             retrieval_tool = type('Tool', (), {
                 'name': 'knowledge_retriever',
                 'description': 'Search Infraon documentation and APIs',
-                'func': self.retriever.retrieve
+                'func': self.retriever.retrieve,
+                'retrieve': getattr(self.retriever, 'aretrieve', self.retriever.retrieve)
             })()
             tools.append(retrieval_tool)
         
@@ -99,6 +133,8 @@ class AugmentAgent(BaseAgent):
         
         strategy_config = {
             "max_reasoning_loops": self.augment_config.max_reasoning_loops,
+            "parallel_actions": self.augment_config.react_parallel_actions,
+            "max_parallel_actions": self.augment_config.react_max_parallel_actions,
             "system_prompt_template": self.augment_config.system_prompt_template,
             "confidence_threshold": self.augment_config.retrieval_confidence_threshold,
             "enable_itsm_context": self.augment_config.enable_itsm_context,
@@ -123,7 +159,8 @@ class AugmentAgent(BaseAgent):
             "memory_enabled": self.augment_config.enable_memory,
             "max_context_tokens": self.augment_config.max_context_tokens,
             "tools_count": len(self.tools),
-            "prompt_template": self.augment_config.system_prompt_template
+            "prompt_template": self.augment_config.system_prompt_template,
+            "semantic_cache": self.response_cache.get_stats() if self.response_cache else None
         }
     
     def update_config(self, **kwargs) -> None:
@@ -135,10 +172,14 @@ class AugmentAgent(BaseAgent):
             else:
                 logger.warning(f"Unknown config parameter: {key}")
         
-        # Reinitialize strategy if strategy changed
-        if 'strategy' in kwargs:
+        # Reinitialize strategy if strategy or its settings changed
+        if 'strategy' in kwargs or any(key.startswith('react_') for key in kwargs):
             self.strategy = self._initialize_strategy()
             logger.info(f"Strategy updated to: {self.augment_config.strategy}")
+        
+        # Rebuild the response cache if its settings changed
+        if any(key.startswith('semantic_cache_') for key in kwargs):
+            self.response_cache = self._initialize_response_cache() if self.augment_config.semantic_cache_enabled else None
 
 
 # Convenience function for creating agent instances
@@ -9,6 +9,8 @@ class AugmentConfig(BaseAgentConfig):
     # Strategy Configuration
     strategy: str = Field(default="direct", env="AUGMENT_STRATEGY")  # "direct", "react"
     max_reasoning_loops: int = Field(default=5, env="AUGMENT_MAX_LOOPS")
+    react_parallel_actions: bool = Field(default=False, env="AUGMENT_REACT_PARALLEL_ACTIONS")
+    react_max_parallel_actions: int = Field(default=3, env="AUGMENT_REACT_MAX_PARALLEL_ACTIONS")
     
     # Prompt Configuration
     system_prompt_template: str = Field(default="default", env="AUGMENT_PROMPT_TEMPLATE")
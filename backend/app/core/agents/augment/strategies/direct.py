@@ -2,7 +2,7 @@ from typing import List, Dict, Any, Optional
 import asyncio
 from datetime import datetime
 
-from ...base.strategy import AgentStrategy, StrategyResult
+from ...base.strategy import AgentStrategy, StrategyResult, TokenCallback
 from ...base.response import AgentResponse, ReasoningStep, Source, ReasoningStepType
 from ...base.llm_service import LLMService, LLMServiceError
 from ...base.config import BaseAgentConfig
@@ -12,6 +12,8 @@ from ..prompts.manager import PromptManager
 class DirectStrategy(AgentStrategy):
     """Direct response strategy without iterative reasoning"""
     
+    supports_streaming = True
+    
     def __init__(self, config: Dict[str, Any], agent_config: BaseAgentConfig):
         super().__init__(config)
         self.prompt_manager = PromptManager()
@@ -24,9 +26,10 @@ class DirectStrategy(AgentStrategy):
         query: str,
         context: Optional[Dict[str, Any]],
         tools: List[Any],
-        memory_context: str = ""
+        memory_context: str = "",
+        on_token: Optional[TokenCallback] = None
     ) -> AgentResponse:
-        """Execute direct response strategy"""
+        """Execute direct response strategy, streaming the answer to ``on_token`` if given"""
         
         reasoning_steps = []
         sources = []
@@ -74,7 +77,7 @@ class DirectStrategy(AgentStrategy):
             )
             
             # Generate response (placeholder - would use actual LLM here)
-            answer = await self._generate_llm_response(formatted_prompt, query, knowledge_base)
+            answer = await self._generate_llm_response(formatted_prompt, query, knowledge_base, on_token)
             
             reasoning_steps.append(ReasoningStep(
                 step_type=ReasoningStepType.CONCLUSION,
@@ -183,7 +186,13 @@ class DirectStrategy(AgentStrategy):
         
         return sources
     
-    async def _generate_llm_response(self, prompt: str, query: str, knowledge_base: str) -> str:
+    async def _generate_llm_response(
+        self,
+        prompt: str,
+        query: str,
+        knowledge_base: str,
+        on_token: Optional[TokenCallback] = None
+    ) -> str:
         """Generate LLM response using the configured LLM service"""
         try:
             if not self.llm_service.is_available():
@@ -204,7 +213,8 @@ class DirectStrategy(AgentStrategy):
                 prompt=query,
                 system_prompt=formatted_prompt,
                 temperature=self.agent_config.temperature,
-                max_tokens=self.agent_config.max_tokens
+                max_tokens=self.agent_config.max_tokens,
+                on_token=on_token
             )
             
             return response
@@ -1,24 +1,34 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import asyncio
 import re
 from datetime import datetime
 
-from ...base.strategy import AgentStrategy, StrategyResult
+from ...base.strategy import AgentStrategy, StrategyResult, TokenCallback
 from ...base.response import AgentResponse, ReasoningStep, Source, ReasoningStepType
 from ...base.llm_service import LLMService, LLMServiceError
 from ...base.config import BaseAgentConfig
 from ..prompts.manager import PromptManager
 
+# One planned action per line: "search: <query>", "calculate: <expression>" or "conclude"
+PLANNED_ACTION = re.compile(
+    r"^\s*(?:[-*]|\d+[.)])?\s*(?:(search|calculate)\s*[:\-]\s*(.+)|(conclude)\b.*)$",
+    re.IGNORECASE
+)
+
 
 class ReActStrategy(AgentStrategy):
     """ReAct (Reasoning + Acting) strategy with iterative thought-action-observation loops"""
     
+    supports_streaming = True
+    
     def __init__(self, config: Dict[str, Any], agent_config: BaseAgentConfig):
         super().__init__(config)
         self.prompt_manager = PromptManager()
         self.template_name = config.get("system_prompt_template", "default")
         self.max_loops = config.get("max_reasoning_loops", 5)
         self.confidence_threshold = config.get("confidence_threshold", 0.7)
+        self.parallel_actions = config.get("parallel_actions", False)
+        self.max_parallel_actions = config.get("max_parallel_actions", 3)
         self.llm_service = LLMService(agent_config)
         self.agent_config = agent_config
     
@@ -27,9 +37,10 @@ class ReActStrategy(AgentStrategy):
         query: str,
         context: Optional[Dict[str, Any]],
         tools: List[Any],
-        memory_context: str = ""
+        memory_context: str = "",
+        on_token: Optional[TokenCallback] = None
     ) -> AgentResponse:
-        """Execute ReAct strategy with iterative reasoning"""
+        """Execute ReAct strategy with iterative reasoning; only the final answer is streamed"""
         
         reasoning_steps = []
         sources = []
@@ -44,7 +55,57 @@ class ReActStrategy(AgentStrategy):
         # Get available tools
         available_tools = self._get_tool_descriptions(tools)
         
-        # ReAct loop
+        # Tool calls are memoized for the duration of this request
+        tool_calls: Dict[Tuple[str, str], asyncio.Future] = {}
+        
+        if self.parallel_actions:
+            await self._run_parallel_loop(query, tools, available_tools, reasoning_steps, sources, all_observations, tool_calls)
+        else:
+            await self._run_serial_loop(query, tools, available_tools, reasoning_steps, sources, all_observations, tool_calls)
+        
+        # A speculative search the plan did not use may still be running
+        for call in tool_calls.values():
+            if not call.done():
+                call.cancel()
+        
+        # Generate final answer based on all observations
+        final_answer = await self._generate_final_answer(
+            query, all_observations, memory_context, context, on_token
+        )
+        
+        reasoning_steps.append(ReasoningStep(
+            step_type=ReasoningStepType.CONCLUSION,
+            content="Generated comprehensive answer based on research and reasoning."
+        ))
+        
+        return AgentResponse(
+            answer=final_answer,
+            sources=sources,
+            reasoning_chain=reasoning_steps,
+            confidence=self._calculate_confidence(all_observations, sources),
+            metadata={
+                "strategy": "react",
+                "iterations": len([s for s in reasoning_steps if s.step_type == ReasoningStepType.ACTION]),
+                "template_used": self.template_name,
+                "sources_count": len(sources),
+                "observations_count": len(all_observations)
+            }
+        )
+    
+    def get_strategy_name(self) -> str:
+        return "react"
+    
+    async def _run_serial_loop(
+        self,
+        query: str,
+        tools: List[Any],
+        available_tools: str,
+        reasoning_steps: List[ReasoningStep],
+        sources: List[Source],
+        all_observations: List[str],
+        tool_calls: Dict[Tuple[str, str], asyncio.Future]
+    ) -> None:
+        """One thought, one action and one observation per iteration"""
         for iteration in range(self.max_loops):
             reasoning_steps.append(ReasoningStep(
                 step_type=ReasoningStepType.THOUGHT,
@@ -66,7 +127,7 @@ class ReActStrategy(AgentStrategy):
             
             if action_needed == "search":
                 # Use retrieval tool
-                action_result = await self._perform_search_action(query, tools)
+                action_result = await self._tool_call("search", query, tools, tool_calls)
                 reasoning_steps.append(ReasoningStep(
                     step_type=ReasoningStepType.ACTION,
                     content=f"Searching knowledge base for information about: {query}"
@@ -78,7 +139,7 @@ class ReActStrategy(AgentStrategy):
             elif action_needed == "calculate":
                 # Use calculation tool
                 calculation_query = self._extract_calculation_from_thought(thought)
-                action_result = await self._perform_calculation_action(calculation_query, tools)
+                action_result = await self._tool_call("calculate", calculation_query, tools, tool_calls)
                 reasoning_steps.append(ReasoningStep(
                     step_type=ReasoningStepType.ACTION,
                     content=f"Performing calculation: {calculation_query}"
@@ -96,7 +157,7 @@ class ReActStrategy(AgentStrategy):
                 
             else:
                 # Search by default if unclear
-                action_result = await self._perform_search_action(query, tools)
+                action_result = await self._tool_call("search", query, tools, tool_calls)
                 reasoning_steps.append(ReasoningStep(
                     step_type=ReasoningStepType.ACTION,
                     content="Searching for relevant information to answer the query."
@@ -120,33 +181,152 @@ class ReActStrategy(AgentStrategy):
                     content="I believe I have sufficient information to provide a good answer."
                 ))
                 break
-        
-        # Generate final answer based on all observations
-        final_answer = await self._generate_final_answer(
-            query, all_observations, memory_context, context
-        )
-        
-        reasoning_steps.append(ReasoningStep(
-            step_type=ReasoningStepType.CONCLUSION,
-            content="Generated comprehensive answer based on research and reasoning."
-        ))
-        
-        return AgentResponse(
-            answer=final_answer,
-            sources=sources,
-            reasoning_chain=reasoning_steps,
-            confidence=self._calculate_confidence(all_observations, sources),
-            metadata={
-                "strategy": "react",
-                "iterations": len([s for s in reasoning_steps if s.step_type == ReasoningStepType.ACTION]),
-                "template_used": self.template_name,
-                "sources_count": len(sources),
-                "observations_count": len(all_observations)
-            }
-        )
     
-    def get_strategy_name(self) -> str:
-        return "react"
+    async def _run_parallel_loop(
+        self,
+        query: str,
+        tools: List[Any],
+        available_tools: str,
+        reasoning_steps: List[ReasoningStep],
+        sources: List[Source],
+        observations: List[str],
+        tool_calls: Dict[Tuple[str, str], asyncio.Future]
+    ) -> None:
+        """
+        Each iteration the planner may emit several independent actions, which
+        run concurrently. The original query is searched while the first plan
+        is generated; if that search alone satisfies ``_should_conclude`` the
+        planning call is cancelled and no further LLM round-trip is made.
+        """
+        for iteration in range(self.max_loops):
+            reasoning_steps.append(ReasoningStep(
+                step_type=ReasoningStepType.THOUGHT,
+                content=f"Iteration {iteration + 1}: Planning the next actions."
+            ))
+            
+            thought_task = asyncio.ensure_future(self._generate_thought(
+                query, observations, available_tools, iteration, plan=True
+            ))
+            if iteration == 0:
+                prefetch = self._tool_call("search", query, tools, tool_calls)
+                await asyncio.wait({thought_task, prefetch}, return_when=asyncio.FIRST_COMPLETED)
+                if not thought_task.done():
+                    observation = self._process_search_results(prefetch.result())
+                    if self._should_conclude([observation], query):
+                        thought_task.cancel()
+                        self._record_action("search", query, prefetch.result(), reasoning_steps, sources, observations)
+                        reasoning_steps.append(ReasoningStep(
+                            step_type=ReasoningStepType.THOUGHT,
+                            content="The initial search already answers the query."
+                        ))
+                        return
+            
+            thought = await thought_task
+            reasoning_steps.append(ReasoningStep(
+                step_type=ReasoningStepType.THOUGHT,
+                content=thought
+            ))
+            
+            actions = self._plan_actions(thought, query, observations, tools)
+            if actions == [("conclude", "")]:
+                reasoning_steps.append(ReasoningStep(
+                    step_type=ReasoningStepType.THOUGHT,
+                    content="I have gathered sufficient information to provide a comprehensive answer."
+                ))
+                return
+            
+            results = await asyncio.gather(*(
+                self._tool_call(action, argument, tools, tool_calls) for action, argument in actions
+            ))
+            for (action, argument), result in zip(actions, results):
+                self._record_action(action, argument, result, reasoning_steps, sources, observations)
+            
+            if self._should_conclude(observations, query):
+                reasoning_steps.append(ReasoningStep(
+                    step_type=ReasoningStepType.THOUGHT,
+                    content="I believe I have sufficient information to provide a good answer."
+                ))
+                return
+    
+    def _plan_actions(
+        self,
+        thought: str,
+        query: str,
+        observations: List[str],
+        tools: List[Any]
+    ) -> List[Tuple[str, str]]:
+        """
+        Parses the planner's action lines into (action, argument) pairs. Falls
+        back to a single action chosen by ``_analyze_action_needed`` when the
+        thought does not list any.
+        """
+        has_calculator = any(getattr(tool, 'name', '') == 'calculator' for tool in tools)
+        actions = []
+        for line in thought.splitlines():
+            match = PLANNED_ACTION.match(line)
+            if not match:
+                continue
+            if match.group(3):
+                if observations:
+                    return [("conclude", "")]
+                continue
+            action = match.group(1).lower()
+            argument = match.group(2).strip().strip('`"\'')
+            if action == "calculate" and not has_calculator:
+                continue
+            planned = (action, argument or query)
+            if planned not in actions:
+                actions.append(planned)
+        
+        if not actions:
+            needed = self._analyze_action_needed(thought, observations, tools)
+            if needed == "conclude":
+                return [("conclude", "")]
+            if needed == "calculate":
+                actions = [("calculate", self._extract_calculation_from_thought(thought))]
+            else:
+                actions = [("search", query)]
+        return actions[:self.max_parallel_actions]
+    
+    def _tool_call(
+        self,
+        action: str,
+        argument: str,
+        tools: List[Any],
+        tool_calls: Dict[Tuple[str, str], asyncio.Future]
+    ) -> asyncio.Future:
+        """Starts a tool call, or returns the one already made with the same input in this request"""
+        key = (action, " ".join(argument.lower().split()))
+        call = tool_calls.get(key)
+        if call is None:
+            if action == "calculate":
+                call = asyncio.ensure_future(self._perform_calculation_action(argument, tools))
+            else:
+                call = asyncio.ensure_future(self._perform_search_action(argument, tools))
+            tool_calls[key] = call
+        return call
+    
+    def _record_action(
+        self,
+        action: str,
+        argument: str,
+        result: Any,
+        reasoning_steps: List[ReasoningStep],
+        sources: List[Source],
+        observations: List[str]
+    ) -> None:
+        """Adds an action, its observation and any sources to the reasoning chain"""
+        if action == "calculate":
+            content = f"Performing calculation: {argument}"
+            observation = f"Calculation result: {result}"
+        else:
+            content = f"Searching knowledge base for information about: {argument}"
+            observation = self._process_search_results(result)
+            sources.extend(self._extract_sources_from_results(result))
+        
+        reasoning_steps.append(ReasoningStep(step_type=ReasoningStepType.ACTION, content=content))
+        reasoning_steps.append(ReasoningStep(step_type=ReasoningStepType.OBSERVATION, content=observation))
+        observations.append(observation)
     
     def _get_tool_descriptions(self, tools: List[Any]) -> str:
         """Get descriptions of available tools"""
@@ -166,9 +346,13 @@ class ReActStrategy(AgentStrategy):
         query: str, 
         observations: List[str], 
         available_tools: str, 
-        iteration: int
+        iteration: int,
+        plan: bool = False
     ) -> str:
-        """Generate a thought about what to do next using LLM"""
+        """
+        Generate a thought about what to do next using LLM. With ``plan`` the
+        LLM is asked for a list of independent actions instead.
+        """
         
         try:
             if not self.llm_service.is_available():
@@ -194,6 +378,12 @@ Think about what you should do next. Consider:
 4. Should you conclude with the available information?
 
 Respond with a single thought about what to do next (1-2 sentences).
+"""
+            if plan:
+                context += f"""
+Then list the independent actions to take next, one per line, as
+"search: <search query>" or "calculate: <expression>" (at most {self.max_parallel_actions}).
+Reply with a line "conclude" instead if the observations already answer the query.
 """
             
             thought = await self.llm_service.generate_response(
@@ -380,7 +570,8 @@ Respond with a single thought about what to do next (1-2 sentences).
         query: str, 
         observations: List[str], 
         memory_context: str, 
-        context: Optional[Dict[str, Any]]
+        context: Optional[Dict[str, Any]],
+        on_token: Optional[TokenCallback] = None
     ) -> str:
         """Generate final answer based on observations using LLM"""
         
@@ -422,7 +613,8 @@ Make the response professional and specific to the Infraon ITSM platform context
                 prompt=final_prompt,
                 system_prompt=system_prompt,
                 temperature=self.agent_config.temperature,
-                max_tokens=self.agent_config.max_tokens
+                max_tokens=self.agent_config.max_tokens,
+                on_token=on_token
             )
             
             return response
@@ -5,7 +5,8 @@ import logging
 from .config import BaseAgentConfig
 from .memory import AgentMemory
 from .response import AgentRequest, AgentResponse
-from .strategy import AgentStrategy
+from .semantic_cache import SemanticResponseCache
+from .strategy import AgentStrategy, TokenCallback
 
 
 logger = logging.getLogger(__name__)
@@ -20,6 +21,7 @@ class BaseAgent(ABC):
         self.retriever = None
         self.tools: List[Any] = []
         self.strategy: Optional[AgentStrategy] = None
+        self.response_cache: Optional[SemanticResponseCache] = None
         
         self._initialize_components()
     
@@ -29,7 +31,8 @@ class BaseAgent(ABC):
         if self.config.enable_memory:
             self.memory = AgentMemory(
                 max_tokens=self.config.max_context_tokens,
-                model_name=self.config.model_name
+                model_name=self.config.model_name,
+                store=self._initialize_memory_store()
             )
         
         # Initialize retriever
@@ -42,8 +45,19 @@ class BaseAgent(ABC):
         # Initialize strategy
         self.strategy = self._initialize_strategy()
         
+        # Initialize semantic response cache
+        if self.config.semantic_cache_enabled:
+            self.response_cache = self._initialize_response_cache()
+        
         logger.info(f"Initialized {self.__class__.__name__} with strategy: {self.strategy.get_strategy_name()}")
     
+    def _initialize_memory_store(self) -> Optional[Any]:
+        """Shared store for conversation memory, or None to keep it in-process"""
+        if self.config.memory_store == "redis":
+            from .memory_store import RedisMemoryStore
+            return RedisMemoryStore(ttl=self.config.memory_ttl)
+        return None
+    
     @abstractmethod
     def _initialize_retriever(self) -> Any:
         """Initialize the retrieval component"""
@@ -59,25 +73,96 @@ class BaseAgent(ABC):
         """Initialize the reasoning strategy"""
         pass
     
-    async def process(self, request: AgentRequest) -> AgentResponse:
-        """Main processing method for handling requests"""
+    def _query_embedder(self) -> Any:
+        """Embedding function used to match near-duplicate queries"""
+        from app.core.config import settings
+        from app.core.processing.document.embeddings import SharedEmbeddings
+        from app.core.retrieval.document.query_cache import QueryEmbeddingCache
+        
+        return QueryEmbeddingCache(SharedEmbeddings().embed_query, settings.QUERY_EMBEDDING_CACHE_SIZE).get
+    
+    def _initialize_response_cache(self) -> Optional[SemanticResponseCache]:
+        """Initialize the semantic cache for final responses"""
+        return SemanticResponseCache(
+            self._query_embedder(),
+            threshold=self.config.semantic_cache_threshold,
+            ttl=self.config.semantic_cache_ttl,
+            max_entries=self.config.semantic_cache_max_entries
+        )
+    
+    def _cache_scope(self) -> str:
+        """Responses are only shared between requests served the same way"""
+        return ":".join([
+            self.__class__.__name__,
+            self.strategy.get_strategy_name() if self.strategy else "",
+            self.config.model_name,
+            str(getattr(self.config, "system_prompt_template", ""))
+        ])
+    
+    def _is_cacheable(self, request: AgentRequest) -> bool:
+        """Requests with their own context, or that opt out, bypass the cache"""
+        if self.response_cache is None or request.context:
+            return False
+        return (request.options or {}).get("use_cache", True)
+    
+    async def process(self, request: AgentRequest, on_token: Optional[TokenCallback] = None) -> AgentResponse:
+        """
+        Main processing method for handling requests.
+        
+        With ``on_token`` the final answer is streamed through the callback as
+        it is generated. Answers that were not generated token by token (cache
+        hits, fallbacks, strategies without streaming) are sent as one chunk.
+        """
+        streamed = False
+        
+        async def emit(delta: str) -> None:
+            nonlocal streamed
+            streamed = True
+            await on_token(delta)
+        
         try:
+            memory = await self.memory.for_session(request.session_id) if self.memory else None
+            
             # Get memory context if available
             memory_context = ""
-            if self.memory:
-                memory_context = self.memory.get_context_string()
+            if memory:
+                memory_context = memory.get_context_string()
+            
+            # Cached answers ignore conversation history, so follow-ups bypass the cache
+            use_cache = self._is_cacheable(request) and not memory_context
+            if use_cache:
+                cached = await self.response_cache.lookup(request.query, scope=self._cache_scope())
+                if cached is not None:
+                    if memory:
+                        memory.add_exchange(request, cached)
+                        await memory.save()
+                    logger.info(f"Served query from semantic cache: {request.query[:50]}...")
+                    if on_token is not None:
+                        await on_token(cached.answer)
+                    return cached
             
             # Execute strategy
+            stream_kwargs = {}
+            if on_token is not None and self.strategy.supports_streaming:
+                stream_kwargs["on_token"] = emit
             response = await self.strategy.execute(
                 query=request.query,
                 context=request.context,
                 tools=self.tools,
-                memory_context=memory_context
+                memory_context=memory_context,
+                **stream_kwargs
             )
+            if on_token is not None and not streamed:
+                await on_token(response.answer)
             
             # Store in memory if enabled
-            if self.memory:
-                self.memory.add_exchange(request, response)
+            if memory:
+                memory.add_exchange(request, response)
+                await memory.save()
+            
+            # Failed or zero-confidence answers are never cached
+            if use_cache and response.confidence and not (response.metadata or {}).get("error"):
+                await self.response_cache.store(request.query, response, scope=self._cache_scope())
             
             logger.info(f"Successfully processed query: {request.query[:50]}...")
             return response
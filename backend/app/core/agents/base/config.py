@@ -17,10 +17,31 @@ class BaseAgentConfig(BaseSettings):
     openrouter_base_url: str = Field(default="https://openrouter.ai/api/v1", env="OPENROUTER_BASE_URL")
     openrouter_app_name: str = Field(default="Infraon-ITSM-Agent", env="OPENROUTER_APP_NAME")
     
+    # Shared LLM client pool (one per base URL and API key)
+    llm_max_concurrency: int = Field(default=16, env="AGENT_LLM_MAX_CONCURRENCY")
+    llm_max_connections: int = Field(default=32, env="AGENT_LLM_MAX_CONNECTIONS")
+    llm_requests_per_minute: Optional[int] = Field(default=None, env="AGENT_LLM_REQUESTS_PER_MINUTE")
+    llm_tokens_per_minute: Optional[int] = Field(default=None, env="AGENT_LLM_TOKENS_PER_MINUTE")
+    llm_max_retries: int = Field(default=3, env="AGENT_LLM_MAX_RETRIES")
+    llm_retry_base_delay: float = Field(default=0.5, env="AGENT_LLM_RETRY_BASE_DELAY")
+    llm_retry_max_delay: float = Field(default=20.0, env="AGENT_LLM_RETRY_MAX_DELAY")
+    llm_hedge_after: Optional[float] = Field(default=None, env="AGENT_LLM_HEDGE_AFTER")
+    llm_timeout: float = Field(default=60.0, env="AGENT_LLM_TIMEOUT")
+    
+    # LLM response cache (opt-in; only calls at or below the max temperature are cached)
+    llm_cache_enabled: bool = Field(default=False, env="AGENT_LLM_CACHE_ENABLED")
+    llm_cache_ttl: int = Field(default=3600, env="AGENT_LLM_CACHE_TTL")
+    llm_cache_max_entries: int = Field(default=2048, env="AGENT_LLM_CACHE_MAX_ENTRIES")
+    llm_cache_max_temperature: float = Field(default=0.0, env="AGENT_LLM_CACHE_MAX_TEMPERATURE")
+    llm_cache_shared: bool = Field(default=False, env="AGENT_LLM_CACHE_SHARED")
+    
     # Context Management
     max_context_tokens: int = Field(default=8000, env="AGENT_MAX_CONTEXT_TOKENS")
     enable_memory: bool = Field(default=True, env="AGENT_ENABLE_MEMORY")
     memory_trim_strategy: str = Field(default="oldest_first", env="AGENT_MEMORY_TRIM_STRATEGY")
+    # "local" keeps memory in the worker; "redis" shares it per session across workers
+    memory_store: str = Field(default="local", env="AGENT_MEMORY_STORE")
+    memory_ttl: int = Field(default=86400, env="AGENT_MEMORY_TTL")
     
     # Retrieval Configuration
     retrieval_enabled: bool = Field(default=True, env="AGENT_RETRIEVAL_ENABLED")
@@ -31,6 +52,12 @@ class BaseAgentConfig(BaseSettings):
     enable_source_attribution: bool = Field(default=True, env="AGENT_ENABLE_SOURCE_ATTRIBUTION")
     confidence_threshold: float = Field(default=0.7, env="AGENT_CONFIDENCE_THRESHOLD")
     
+    # Semantic Response Cache
+    semantic_cache_enabled: bool = Field(default=False, env="AGENT_SEMANTIC_CACHE_ENABLED")
+    semantic_cache_threshold: float = Field(default=0.92, env="AGENT_SEMANTIC_CACHE_THRESHOLD")
+    semantic_cache_ttl: int = Field(default=3600, env="AGENT_SEMANTIC_CACHE_TTL")
+    semantic_cache_max_entries: int = Field(default=1024, env="AGENT_SEMANTIC_CACHE_MAX_ENTRIES")
+    
     # Legacy API Keys (kept for compatibility)
     openai_api_key: Optional[str] = Field(default=None, env="OPENAI_API_KEY")
     anthropic_api_key: Optional[str] = Field(default=None, env="ANTHROPIC_API_KEY")
@@ -0,0 +1,142 @@
+"""
+Prompt/response cache for LLMService.
+
+Completions are keyed on a hash of everything that determines them: the kind
+of call, model, messages (system prompt included), temperature and
+max_tokens. Only calls at or below ``max_temperature`` are cached, since
+sampled responses are not meant to repeat. Entries live in the
+AdvancedCacheManager with a TTL, in process memory and optionally in Redis so
+several workers can share them.
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+from app.core.cache import AdvancedCacheManager, CacheConfig, CacheLevel, InvalidationStrategy, advanced_cache
+
+from .config import BaseAgentConfig
+
+logger = logging.getLogger(__name__)
+
+# Tag shared by every cached completion, for dropping them all at once
+LLM_RESPONSE_TAG = "llm_response"
+
+
+class LLMResponseCache:
+    """
+    Caches LLM completions by content hash and tracks hit rate and the LLM
+    latency that hits saved.
+    """
+
+    def __init__(
+        self,
+        cache: Optional[AdvancedCacheManager] = None,
+        ttl: int = 3600,
+        max_entries: int = 2048,
+        max_temperature: float = 0.0,
+        shared: bool = False,
+        pattern: str = "llm_response"
+    ):
+        self.cache = cache or advanced_cache
+        self.ttl = ttl
+        self.max_temperature = max_temperature
+        self.pattern = pattern
+        levels = [CacheLevel.L1_MEMORY, CacheLevel.L2_REDIS] if shared else [CacheLevel.L1_MEMORY]
+        self.cache.configure_cache(pattern, CacheConfig(
+            levels=levels,
+            invalidation=InvalidationStrategy.LRU,
+            ttl=ttl,
+            max_size=max_entries,
+            tags=[LLM_RESPONSE_TAG]
+        ))
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "bypassed": 0, "errors": 0, "latency_saved_ms": 0.0}
+
+    def accepts(self, temperature: Optional[float]) -> bool:
+        """Whether a call at this temperature is deterministic enough to cache"""
+        return temperature is not None and temperature <= self.max_temperature
+
+    def make_key(
+        self,
+        kind: str,
+        model: str,
+        messages: List[Dict[str, Any]],
+        temperature: Optional[float],
+        max_tokens: Optional[int]
+    ) -> str:
+        payload = json.dumps({
+            "kind": kind,
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens
+        }, sort_keys=True, ensure_ascii=False)
+        return f"{self.pattern}:{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+
+    def record_bypass(self):
+        self.stats["bypassed"] += 1
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Returns the cached completion for a key, or None"""
+        try:
+            entry = await self.cache.get(key, pattern=self.pattern)
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.warning(f"LLM response cache lookup failed: {e}")
+            entry = None
+
+        if not isinstance(entry, dict) or "value" not in entry:
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        self.stats["latency_saved_ms"] += entry.get("latency_ms", 0.0)
+        # Structured responses are dicts; callers get their own copy to mutate
+        return copy.deepcopy(entry["value"])
+
+    async def set(self, key: str, value: Any, latency_ms: float):
+        """Caches a completion along with the latency it took to produce"""
+        try:
+            await self.cache.set(key, {"value": copy.deepcopy(value), "latency_ms": round(latency_ms, 3)}, pattern=self.pattern)
+            self.stats["stores"] += 1
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.warning(f"LLM response cache store failed: {e}")
+
+    async def clear(self) -> int:
+        return await self.cache.invalidate_tags([LLM_RESPONSE_TAG])
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "latency_saved_ms": round(self.stats["latency_saved_ms"], 3),
+            "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+            "max_temperature": self.max_temperature,
+            "ttl": self.ttl
+        }
+
+
+_shared_cache: Optional[LLMResponseCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_llm_response_cache(config: BaseAgentConfig) -> Optional[LLMResponseCache]:
+    """
+    Returns the process-wide LLM response cache, or None when the config has
+    not opted in. Cache settings come from the first config that enables it.
+    """
+    global _shared_cache
+    if not config.llm_cache_enabled:
+        return None
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = LLMResponseCache(
+                ttl=config.llm_cache_ttl,
+                max_entries=config.llm_cache_max_entries,
+                max_temperature=config.llm_cache_max_temperature,
+                shared=config.llm_cache_shared
+            )
+        return _shared_cache
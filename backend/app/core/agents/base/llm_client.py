@@ -0,0 +1,309 @@
+"""
+Shared, rate-limited OpenAI-compatible client for every LLMService.
+
+One PooledLLMClient is kept per (base_url, api_key), so strategies and agents
+that each build their own LLMService still share one HTTP connection pool, one
+global concurrency limit and one set of per-model rate limits. Requests that
+fail with 429, 5xx or a connection error are retried with jittered exponential
+backoff (honouring Retry-After), and non-streaming requests can be hedged with
+a second attempt once they exceed a latency threshold.
+"""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Tuple
+
+from .config import BaseAgentConfig
+
+logger = logging.getLogger(__name__)
+
+# Rough characters-per-token ratio used to estimate prompt size for the token bucket
+CHARS_PER_TOKEN = 4
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at ``rate_per_minute``. Waiters are
+    served in arrival order.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float = 1.0) -> float:
+        """
+        Takes ``amount`` tokens, sleeping until they are available. Returns the
+        time spent waiting in seconds.
+        """
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return waited
+                delay = (amount - self.tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+
+
+class ModelRateLimiter:
+    """Requests-per-minute and tokens-per-minute limits for one model"""
+
+    def __init__(self, requests_per_minute: Optional[int] = None, tokens_per_minute: Optional[int] = None):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+
+    async def acquire(self, estimated_tokens: int) -> float:
+        waited = 0.0
+        if self.requests is not None:
+            waited += await self.requests.acquire(1)
+        if self.tokens is not None:
+            waited += await self.tokens.acquire(estimated_tokens)
+        return waited
+
+
+def is_retryable(error: Exception) -> bool:
+    """429, 5xx, timeouts and connection errors are worth retrying"""
+    from openai import APIConnectionError
+
+    if isinstance(error, (APIConnectionError, asyncio.TimeoutError)):
+        return True
+    status = getattr(error, "status_code", None)
+    return status == 429 or (status is not None and status >= 500)
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Returns the server's Retry-After hint in seconds, if it sent one"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        value = headers.get("retry-after-ms")
+        if value is not None:
+            return float(value) / 1000.0
+        value = headers.get("retry-after")
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def estimate_tokens(messages, max_tokens: Optional[int]) -> int:
+    prompt_chars = sum(len(str(message.get("content") or "")) for message in messages or [])
+    return prompt_chars // CHARS_PER_TOKEN + (max_tokens or 0)
+
+
+class PooledLLMClient:
+    """
+    Wraps an AsyncOpenAI client with a global concurrency limit, per-model
+    rate limits, retries and optional request hedging.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        max_concurrency: int = 16,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        max_retries: int = 3,
+        retry_base_delay: float = 0.5,
+        retry_max_delay: float = 20.0,
+        hedge_after: Optional[float] = None
+    ):
+        self.client = client
+        self.max_concurrency = max_concurrency
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.hedge_after = hedge_after
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._limiters: Dict[str, ModelRateLimiter] = {}
+        self.stats = {
+            "requests": 0,
+            "attempts": 0,
+            "retries": 0,
+            "failures": 0,
+            "hedged": 0,
+            "hedge_wins": 0,
+            "in_flight": 0,
+            "rate_limited_seconds": 0.0
+        }
+
+    def _limiter(self, model: str) -> ModelRateLimiter:
+        limiter = self._limiters.get(model)
+        if limiter is None:
+            limiter = self._limiters[model] = ModelRateLimiter(self.requests_per_minute, self.tokens_per_minute)
+        return limiter
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        """Full-jitter exponential backoff, stretched to any Retry-After hint"""
+        delay = random.uniform(0, min(self.retry_max_delay, self.retry_base_delay * (2 ** attempt)))
+        hint = retry_after_seconds(error)
+        if hint is not None:
+            delay = max(delay, min(hint, self.retry_max_delay))
+        return delay
+
+    async def _call(self, kwargs: Dict[str, Any]) -> Any:
+        """One API request, after waiting for the model's rate limits"""
+        waited = await self._limiter(kwargs.get("model", "")).acquire(
+            estimate_tokens(kwargs.get("messages"), kwargs.get("max_tokens"))
+        )
+        self.stats["rate_limited_seconds"] += waited
+        self.stats["attempts"] += 1
+        return await self.client.chat.completions.create(**kwargs)
+
+    async def _attempt(self, kwargs: Dict[str, Any]) -> Any:
+        async with self._semaphore:
+            self.stats["in_flight"] += 1
+            try:
+                return await self._call(kwargs)
+            finally:
+                self.stats["in_flight"] -= 1
+
+    async def _hedged(self, kwargs: Dict[str, Any]) -> Any:
+        """
+        Runs an attempt and, if it has not finished after ``hedge_after``
+        seconds, races a second one against it. The loser is cancelled.
+        """
+        if not self.hedge_after:
+            return await self._attempt(kwargs)
+
+        primary = asyncio.create_task(self._attempt(kwargs))
+        done, _ = await asyncio.wait({primary}, timeout=self.hedge_after)
+        if done:
+            return primary.result()
+
+        self.stats["hedged"] += 1
+        hedge = asyncio.create_task(self._attempt(kwargs))
+        pending = {primary, hedge}
+        error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.stats["hedge_wins"] += 1
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _with_retries(self, call: Callable[[Dict[str, Any]], Any], kwargs: Dict[str, Any]) -> Any:
+        for attempt in range(self.max_retries + 1):
+            try:
+                return await call(kwargs)
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e):
+                    self.stats["failures"] += 1
+                    raise
+                delay = self._backoff(attempt, e)
+                self.stats["retries"] += 1
+                logger.warning(f"LLM request failed ({e}); retry {attempt + 1}/{self.max_retries} in {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+    async def create_chat_completion(self, **kwargs) -> Any:
+        """Non-streaming chat completion with retries and optional hedging"""
+        kwargs["stream"] = False
+        self.stats["requests"] += 1
+        return await self._with_retries(self._hedged, kwargs)
+
+    async def stream_chat_completion(self, **kwargs) -> AsyncIterator[Any]:
+        """
+        Streaming chat completion. Opening the stream is retried; once chunks
+        have been yielded a failure is raised to the caller. The concurrency
+        slot is held until the stream is exhausted or closed.
+        """
+        kwargs["stream"] = True
+        self.stats["requests"] += 1
+        async with self._semaphore:
+            self.stats["in_flight"] += 1
+            try:
+                stream = await self._with_retries(self._call, kwargs)
+                async for chunk in stream:
+                    yield chunk
+            finally:
+                self.stats["in_flight"] -= 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "max_concurrency": self.max_concurrency,
+            "models": sorted(self._limiters),
+            "hedge_after": self.hedge_after
+        }
+
+
+_clients: Dict[Tuple[str, str], PooledLLMClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_llm_client(config: BaseAgentConfig) -> PooledLLMClient:
+    """
+    Returns the shared client for the config's base URL and API key, creating
+    it on first use. Pool limits come from the first config seen for that key.
+    """
+    key = (config.openrouter_base_url, config.openrouter_api_key or "")
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+            import httpx
+
+            http_client = DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=config.llm_max_connections,
+                    max_keepalive_connections=config.llm_max_connections
+                )
+            )
+            openai_client = AsyncOpenAI(
+                api_key=config.openrouter_api_key,
+                base_url=config.openrouter_base_url,
+                timeout=httpx.Timeout(config.llm_timeout, connect=10.0),
+                # Retries are handled by PooledLLMClient
+                max_retries=0,
+                http_client=http_client,
+                default_headers={
+                    "HTTP-Referer": "https://github.com/your-org/infraon-itsm-agent",
+                    "X-Title": config.openrouter_app_name,
+                }
+            )
+            client = _clients[key] = PooledLLMClient(
+                openai_client,
+                max_concurrency=config.llm_max_concurrency,
+                requests_per_minute=config.llm_requests_per_minute,
+                tokens_per_minute=config.llm_tokens_per_minute,
+                max_retries=config.llm_max_retries,
+                retry_base_delay=config.llm_retry_base_delay,
+                retry_max_delay=config.llm_retry_max_delay,
+                hedge_after=config.llm_hedge_after
+            )
+            logger.info(f"Created pooled LLM client for {config.openrouter_base_url}")
+    return client
+
+
+def clear_llm_clients():
+    """Drops the shared clients, e.g. after changing pool settings"""
+    with _clients_lock:
+        _clients.clear()
@@ -1,10 +1,13 @@
 import asyncio
 import logging
-from typing import Optional, Dict, Any, List
-from openai import AsyncOpenAI
+import time
+from typing import Optional, Dict, Any, List, AsyncIterator
 import json
 
 from .config import BaseAgentConfig
+from .llm_cache import LLMResponseCache, get_llm_response_cache
+from .llm_client import PooledLLMClient, get_llm_client
+from .strategy import TokenCallback
 
 logger = logging.getLogger(__name__)
 
@@ -19,63 +22,105 @@ class LLMService:
     
     def __init__(self, config: BaseAgentConfig):
         self.config = config
-        self.client = None
+        self.client: Optional[PooledLLMClient] = None
+        self.response_cache: Optional[LLMResponseCache] = get_llm_response_cache(config)
         self._initialize_client()
     
     def _initialize_client(self) -> None:
-        """Initialize the OpenAI client for OpenRouter"""
+        """Attach the shared pooled client for OpenRouter"""
         if not self.config.openrouter_api_key:
             logger.warning("No OpenRouter API key provided. LLM calls will fail.")
             return
         
         try:
-            self.client = AsyncOpenAI(
-                api_key=self.config.openrouter_api_key,
-                base_url=self.config.openrouter_base_url,
-                default_headers={
-                    "HTTP-Referer": "https://github.com/your-org/infraon-itsm-agent",
-                    "X-Title": self.config.openrouter_app_name,
-                }
-            )
+            self.client = get_llm_client(self.config)
             logger.info(f"LLM client initialized for model: {self.config.model_name}")
         except Exception as e:
             logger.error(f"Failed to initialize LLM client: {e}")
             raise LLMServiceError(f"Failed to initialize LLM client: {e}")
     
+    def _build_messages(self, prompt: str, system_prompt: Optional[str] = None) -> List[Dict[str, str]]:
+        """Build the chat messages for a single prompt"""
+        messages = []
+        
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        
+        messages.append({"role": "user", "content": prompt})
+        return messages
+    
+    def _cache_key(
+        self,
+        kind: str,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: Optional[int],
+        use_cache: bool
+    ) -> Optional[str]:
+        """Cache key for a call, or None when the call bypasses the cache"""
+        if self.response_cache is None:
+            return None
+        if not use_cache or not self.response_cache.accepts(temperature):
+            self.response_cache.record_bypass()
+            return None
+        return self.response_cache.make_key(kind, self.config.model_name, messages, temperature, max_tokens)
+    
     async def generate_response(
         self, 
         prompt: str, 
         system_prompt: Optional[str] = None,
         temperature: Optional[float] = None,
-        max_tokens: Optional[int] = None
+        max_tokens: Optional[int] = None,
+        on_token: Optional[TokenCallback] = None,
+        use_cache: bool = True
     ) -> str:
-        """Generate a response from the LLM"""
+        """
+        Generate a response from the LLM.
+        
+        When ``on_token`` is given the response is streamed and every content
+        delta is passed to it as it arrives; the full text is still returned.
+        Pass ``use_cache=False`` to bypass the response cache.
+        """
         
         if not self.client:
             raise LLMServiceError("LLM client not initialized. Check your OpenRouter API key.")
         
+        # Prepare messages, using config defaults if not specified
+        messages = self._build_messages(prompt, system_prompt)
+        temperature = temperature if temperature is not None else self.config.temperature
+        max_tokens = max_tokens if max_tokens is not None else self.config.max_tokens
+        
+        cache_key = self._cache_key("text", messages, temperature, max_tokens, use_cache)
+        if cache_key is not None:
+            cached = await self.response_cache.get(cache_key)
+            if cached is not None:
+                if on_token is not None:
+                    await on_token(cached)
+                return cached
+        start = time.perf_counter()
+        
+        if on_token is not None:
+            parts = []
+            async for delta in self.stream_response(prompt, system_prompt, temperature, max_tokens):
+                parts.append(delta)
+                await on_token(delta)
+            content = "".join(parts).strip()
+            if not content:
+                logger.warning("LLM returned empty streamed response")
+                return "I apologize, but I was unable to generate a response to your query."
+            if cache_key is not None:
+                await self.response_cache.set(cache_key, content, (time.perf_counter() - start) * 1000)
+            return content
+        
         try:
-            # Prepare messages
-            messages = []
-            
-            if system_prompt:
-                messages.append({"role": "system", "content": system_prompt})
-            
-            messages.append({"role": "user", "content": prompt})
-            
-            # Use config defaults if not specified
-            temperature = temperature if temperature is not None else self.config.temperature
-            max_tokens = max_tokens if max_tokens is not None else self.config.max_tokens
-            
             logger.debug(f"Generating response with model: {self.config.model_name}")
             
             # Make API call
-            response = await self.client.chat.completions.create(
+            response = await self.client.create_chat_completion(
                 model=self.config.model_name,
                 messages=messages,
                 temperature=temperature,
-                max_tokens=max_tokens,
-                stream=False
+                max_tokens=max_tokens
             )
             
             # Extract response content
@@ -83,6 +128,8 @@ class LLMService:
                 content = response.choices[0].message.content
                 if content:
                     logger.debug(f"Generated response length: {len(content)} characters")
+                    if cache_key is not None:
+                        await self.response_cache.set(cache_key, content.strip(), (time.perf_counter() - start) * 1000)
                     return content.strip()
                 else:
                     logger.warning("LLM returned empty response")
@@ -95,13 +142,51 @@ class LLMService:
             logger.error(f"Error generating LLM response: {e}")
             raise LLMServiceError(f"Failed to generate response: {e}")
     
+    async def stream_response(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        """Stream a response from the LLM, yielding content deltas as they arrive"""
+        
+        if not self.client:
+            raise LLMServiceError("LLM client not initialized. Check your OpenRouter API key.")
+        
+        try:
+            # Use config defaults if not specified
+            temperature = temperature if temperature is not None else self.config.temperature
+            max_tokens = max_tokens if max_tokens is not None else self.config.max_tokens
+            
+            logger.debug(f"Streaming response with model: {self.config.model_name}")
+            
+            stream = self.client.stream_chat_completion(
+                model=self.config.model_name,
+                messages=self._build_messages(prompt, system_prompt),
+                temperature=temperature,
+                max_tokens=max_tokens
+            )
+            
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield delta
+                    
+        except Exception as e:
+            logger.error(f"Error streaming LLM response: {e}")
+            raise LLMServiceError(f"Failed to stream response: {e}")
+    
     async def generate_structured_response(
         self,
         prompt: str,
         system_prompt: Optional[str] = None,
         response_format: Optional[Dict[str, Any]] = None,
         temperature: Optional[float] = None,
-        max_tokens: Optional[int] = None
+        max_tokens: Optional[int] = None,
+        use_cache: bool = True
     ) -> Dict[str, Any]:
         """Generate a structured response (JSON) from the LLM"""
         
@@ -128,15 +213,21 @@ class LLMService:
             temperature = temperature if temperature is not None else self.config.temperature
             max_tokens = max_tokens if max_tokens is not None else self.config.max_tokens
             
+            cache_key = self._cache_key("structured", messages, temperature, max_tokens, use_cache)
+            if cache_key is not None:
+                cached = await self.response_cache.get(cache_key)
+                if cached is not None:
+                    return cached
+            start = time.perf_counter()
+            
             logger.debug(f"Generating structured response with model: {self.config.model_name}")
             
             # Make API call
-            response = await self.client.chat.completions.create(
+            response = await self.client.create_chat_completion(
                 model=self.config.model_name,
                 messages=messages,
                 temperature=temperature,
-                max_tokens=max_tokens,
-                stream=False
+                max_tokens=max_tokens
             )
             
             # Extract and parse response content
@@ -147,6 +238,8 @@ class LLMService:
                         # Try to parse as JSON
                         parsed_response = json.loads(content.strip())
                         logger.debug("Successfully parsed structured response")
+                        if cache_key is not None:
+                            await self.response_cache.set(cache_key, parsed_response, (time.perf_counter() - start) * 1000)
                         return parsed_response
                     except json.JSONDecodeError:
                         logger.warning("LLM response was not valid JSON, returning as text")
@@ -166,7 +259,8 @@ class LLMService:
         self,
         messages: List[Dict[str, str]],
         temperature: Optional[float] = None,
-        max_tokens: Optional[int] = None
+        max_tokens: Optional[int] = None,
+        use_cache: bool = True
     ) -> str:
         """Generate a response from a conversation history"""
         
@@ -178,15 +272,21 @@ class LLMService:
             temperature = temperature if temperature is not None else self.config.temperature
             max_tokens = max_tokens if max_tokens is not None else self.config.max_tokens
             
+            cache_key = self._cache_key("chat", messages, temperature, max_tokens, use_cache)
+            if cache_key is not None:
+                cached = await self.response_cache.get(cache_key)
+                if cached is not None:
+                    return cached
+            start = time.perf_counter()
+            
             logger.debug(f"Generating chat response with {len(messages)} messages")
             
             # Make API call
-            response = await self.client.chat.completions.create(
+            response = await self.client.create_chat_completion(
                 model=self.config.model_name,
                 messages=messages,
                 temperature=temperature,
-                max_tokens=max_tokens,
-                stream=False
+                max_tokens=max_tokens
             )
             
             # Extract response content
@@ -194,6 +294,8 @@ class LLMService:
                 content = response.choices[0].message.content
                 if content:
                     logger.debug(f"Generated chat response length: {len(content)} characters")
+                    if cache_key is not None:
+                        await self.response_cache.set(cache_key, content.strip(), (time.perf_counter() - start) * 1000)
                     return content.strip()
                 else:
                     logger.warning("LLM returned empty chat response")
@@ -218,5 +320,7 @@ class LLMService:
             "temperature": self.config.temperature,
             "max_tokens": self.config.max_tokens,
             "base_url": self.config.openrouter_base_url,
-            "available": self.is_available()
+            "available": self.is_available(),
+            "client": self.client.get_stats() if self.client else None,
+            "cache": self.response_cache.get_stats() if self.response_cache else None
         }
\ No newline at end of file
@@ -1,9 +1,21 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, Deque
+from collections import deque
 from datetime import datetime
+import itertools
+import logging
 import tiktoken
 from .response import AgentRequest, AgentResponse
 
 
+logger = logging.getLogger(__name__)
+
+# Separator placed between exchanges in the context string
+EXCHANGE_SEPARATOR = "\n\n"
+
+# Called with the evicted exchanges and the current summary; returns the new summary
+Summarizer = Callable[[List["ConversationExchange"], str], Optional[str]]
+
+
 class ConversationExchange:
     """Represents a single query-response exchange"""
     def __init__(self, request: AgentRequest, response: AgentResponse, timestamp: datetime = None):
@@ -11,6 +23,11 @@ class ConversationExchange:
         self.response = response
         self.timestamp = timestamp or datetime.now()
         self.metadata = {}
+        self.token_count: Optional[int] = None
+    
+    def to_context(self) -> str:
+        """Render the exchange as it appears in the context string"""
+        return f"Human: {self.request.query}{EXCHANGE_SEPARATOR}Assistant: {self.response.answer}"
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -19,68 +36,144 @@ class ConversationExchange:
             "timestamp": self.timestamp.isoformat(),
             "metadata": self.metadata
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ConversationExchange":
+        exchange = cls(
+            AgentRequest(query=data["query"]),
+            AgentResponse(answer=data["answer"]),
+            timestamp=datetime.fromisoformat(data["timestamp"]) if data.get("timestamp") else None
+        )
+        exchange.metadata = data.get("metadata") or {}
+        exchange.token_count = data.get("tokens")
+        return exchange
 
 
 class AgentMemory:
-    """Manages conversation history and context for agents"""
+    """
+    Manages conversation history and context for agents.
     
-    def __init__(self, max_tokens: int = 8000, model_name: str = "gpt-4"):
+    Each exchange is encoded once when it is added and its token count is
+    kept alongside it, so the running total is updated in O(1) and trimming
+    pops from the front of a deque instead of re-encoding the whole history.
+    """
+    
+    def __init__(
+        self,
+        max_tokens: int = 8000,
+        model_name: str = "gpt-4",
+        summarizer: Optional[Summarizer] = None,
+        store: Optional[Any] = None,
+        session_id: str = "default",
+        token_counter: Optional[Callable[[str], int]] = None
+    ):
         self.max_tokens = max_tokens
-        self.conversation_history: List[ConversationExchange] = []
+        self.conversation_history: Deque[ConversationExchange] = deque()
         self.session_data: Dict[str, Any] = {}
-        
-        # Initialize tokenizer based on model
-        try:
-            self.tokenizer = tiktoken.encoding_for_model(model_name)
-        except KeyError:
-            # Fallback to a common encoding
-            self.tokenizer = tiktoken.get_encoding("cl100k_base")
+        self.summarizer = summarizer
+        self.summary = ""
+        self.store = store
+        self.session_id = session_id
+        self.total_tokens = 0
+        self._summary_tokens = 0
+    
+        if token_counter is not None:
+            self.tokenizer = None
+            self._count = token_counter
+        else:
+            # Initialize tokenizer based on model
+            try:
+                self.tokenizer = tiktoken.encoding_for_model(model_name)
+            except KeyError:
+                # Fallback to a common encoding
+                self.tokenizer = tiktoken.get_encoding("cl100k_base")
+            self._count = lambda text: len(self.tokenizer.encode(text))
+        self._separator_tokens = self._count(EXCHANGE_SEPARATOR)
     
     def add_exchange(self, request: AgentRequest, response: AgentResponse) -> None:
         """Add a new query-response exchange to memory"""
-        exchange = ConversationExchange(request, response)
-        
-        # Add the exchange
-        self.conversation_history.append(exchange)
-        
+        self._append(ConversationExchange(request, response))
+    
         # Trim if necessary
         self._trim_to_fit()
     
+    def _append(self, exchange: ConversationExchange) -> None:
+        if exchange.token_count is None:
+            exchange.token_count = self._count_tokens(exchange.to_context())
+        if self.conversation_history:
+            self.total_tokens += self._separator_tokens
+        self.conversation_history.append(exchange)
+        self.total_tokens += exchange.token_count
+    
+    def _popleft(self) -> ConversationExchange:
+        removed = self.conversation_history.popleft()
+        self.total_tokens -= removed.token_count
+        if self.conversation_history:
+            self.total_tokens -= self._separator_tokens
+        return removed
+    
     def get_context_string(self) -> str:
         """Get conversation history as a formatted string"""
-        if not self.conversation_history:
-            return ""
-        
         context_parts = []
-        for exchange in self.conversation_history:
-            context_parts.append(f"Human: {exchange.request.query}")
-            context_parts.append(f"Assistant: {exchange.response.answer}")
-        
-        return "\n\n".join(context_parts)
+        if self.summary:
+            context_parts.append(f"Summary of earlier conversation: {self.summary}")
+        context_parts.extend(exchange.to_context() for exchange in self.conversation_history)
+        return EXCHANGE_SEPARATOR.join(context_parts)
     
     def get_recent_exchanges(self, count: int = 5) -> List[ConversationExchange]:
         """Get the most recent exchanges"""
-        return self.conversation_history[-count:] if self.conversation_history else []
+        if count <= 0:
+            return []
+        start = max(len(self.conversation_history) - count, 0)
+        return list(itertools.islice(self.conversation_history, start, None))
     
     def _count_tokens(self, text: str) -> int:
         """Count tokens in a text string"""
-        return len(self.tokenizer.encode(text))
+        return self._count(text)
     
     def _trim_to_fit(self) -> None:
         """Remove oldest exchanges to stay within token limit"""
+        evicted = []
+        while self.conversation_history and self._get_total_tokens() > self.max_tokens:
+            removed = self._popleft()
+            evicted.append(removed)
+            logger.debug(f"Trimmed conversation exchange from {removed.timestamp}")
+    
+        if evicted and self.summarizer:
+            self._summarize(evicted)
+    
+    def _summarize(self, evicted: List[ConversationExchange]) -> None:
+        """Fold evicted exchanges into the running summary"""
+        try:
+            summary = self.summarizer(evicted, self.summary)
+        except Exception as e:
+            logger.warning(f"Memory summarizer failed: {e}")
+            return
+        self.summary = summary or ""
+        self._summary_tokens = self._count_tokens(self.summary) if self.summary else 0
+    
+        # The summary shares the budget; drop it if it no longer fits on its own
         while self.conversation_history and self._get_total_tokens() > self.max_tokens:
-            removed = self.conversation_history.pop(0)
-            print(f"Trimmed conversation exchange from {removed.timestamp}")
+            self._popleft()
+        if self._get_total_tokens() > self.max_tokens:
+            logger.warning("Conversation summary exceeds the memory token budget; dropping it")
+            self.summary = ""
+            self._summary_tokens = 0
     
     def _get_total_tokens(self) -> int:
-        """Calculate total tokens in conversation history"""
-        context_string = self.get_context_string()
-        return self._count_tokens(context_string)
+        """Total tokens in conversation history, from the cached per-exchange counts"""
+        total = self.total_tokens
+        if self._summary_tokens:
+            total += self._summary_tokens + (self._separator_tokens if self.conversation_history else 0)
+        return total
     
     def clear(self) -> None:
         """Clear all conversation history"""
         self.conversation_history.clear()
         self.session_data.clear()
+        self.summary = ""
+        self.total_tokens = 0
+        self._summary_tokens = 0
     
     def set_session_data(self, key: str, value: Any) -> None:
         """Store session-specific data"""
@@ -88,4 +181,60 @@ class AgentMemory:
     
     def get_session_data(self, key: str, default: Any = None) -> Any:
         """Retrieve session-specific data"""
-        return self.session_data.get(key, default)
\ No newline at end of file
+        return self.session_data.get(key, default)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Snapshot of the memory, with token counts so loading skips re-encoding"""
+        return {
+            "exchanges": [
+                {**exchange.to_dict(), "tokens": exchange.token_count}
+                for exchange in self.conversation_history
+            ],
+            "summary": self.summary,
+            "session_data": self.session_data
+        }
+    
+    def load_dict(self, data: Dict[str, Any]) -> None:
+        """Replace the memory contents with a snapshot from ``to_dict``"""
+        self.conversation_history.clear()
+        self.total_tokens = 0
+        for item in data.get("exchanges") or []:
+            self._append(ConversationExchange.from_dict(item))
+        self.summary = data.get("summary") or ""
+        self._summary_tokens = self._count_tokens(self.summary) if self.summary else 0
+        self.session_data = dict(data.get("session_data") or {})
+        # The budget may have shrunk since the snapshot was written
+        self._trim_to_fit()
+    
+    async def for_session(self, session_id: Optional[str] = None) -> "AgentMemory":
+        """
+        Memory for one session, loaded from the store. Without a store this
+        memory is returned, shared by every session as before.
+        """
+        if self.store is None:
+            return self
+        memory = AgentMemory(
+            max_tokens=self.max_tokens,
+            summarizer=self.summarizer,
+            store=self.store,
+            session_id=session_id or "default",
+            token_counter=self._count
+        )
+        memory.tokenizer = self.tokenizer
+        try:
+            data = await self.store.load(memory.session_id)
+        except Exception as e:
+            logger.warning(f"Failed to load memory for session {memory.session_id}: {e}")
+            data = None
+        if data:
+            memory.load_dict(data)
+        return memory
+    
+    async def save(self) -> None:
+        """Persist the memory to the store, if one is configured"""
+        if self.store is None:
+            return
+        try:
+            await self.store.save(self.session_id, self.to_dict())
+        except Exception as e:
+            logger.warning(f"Failed to save memory for session {self.session_id}: {e}")
@@ -0,0 +1,31 @@
+"""
+Redis-backed storage for AgentMemory.
+
+Conversation memory is kept per session as a single JSON snapshot, including
+the per-exchange token counts, so any worker can pick up a session where
+another left off without re-encoding its history.
+"""
+
+from typing import Any, Dict, Optional
+
+from app.core.cache import CacheManager, cache_manager
+
+
+class RedisMemoryStore:
+    """Stores AgentMemory snapshots in Redis through the CacheManager"""
+
+    def __init__(self, cache: Optional[CacheManager] = None, ttl: int = 86400, prefix: str = "agent_memory"):
+        self.cache = cache or cache_manager
+        self.ttl = ttl
+        self.prefix = prefix
+
+    async def load(self, session_id: str) -> Optional[Dict[str, Any]]:
+        data = await self.cache.get(session_id, prefix=self.prefix)
+        return data if isinstance(data, dict) else None
+
+    async def save(self, session_id: str, data: Dict[str, Any]) -> None:
+        # Each save refreshes the TTL, so active sessions never expire
+        await self.cache.set(session_id, data, expire=self.ttl, prefix=self.prefix)
+
+    async def delete(self, session_id: str) -> bool:
+        return await self.cache.delete(session_id, prefix=self.prefix)
@@ -0,0 +1,208 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import asyncio
+import hashlib
+import logging
+
+import numpy as np
+
+from app.core.cache import (
+    SERVICE_REGISTRY_TAG,
+    AdvancedCacheManager,
+    CacheConfig,
+    CacheLevel,
+    InvalidationStrategy,
+    advanced_cache,
+    index_tag,
+)
+from .response import AgentResponse
+
+
+logger = logging.getLogger(__name__)
+
+# Tag shared by every cached agent response, for invalidating them all at once
+AGENT_RESPONSE_TAG = "agent_response"
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+class SemanticResponseCache:
+    """
+    Caches final agent responses keyed on the query embedding.
+
+    A lookup first tries an exact match on the normalized query text, which
+    needs no embedding. Otherwise it embeds the query and returns the cached
+    response of the most similar earlier query in the same scope, as long as
+    the cosine similarity reaches ``threshold``. This lets near-duplicates
+    such as "list open incidents" and "show open incidents" share an answer.
+
+    Responses live in the AdvancedCacheManager, tagged with the registry and
+    index sources they were derived from. Invalidating those tags (or
+    ``AGENT_RESPONSE_TAG``) drops them, and the matching vectors are pruned
+    from the in-process similarity index on their next match.
+    """
+
+    def __init__(
+        self,
+        embed_query: Callable[[str], Any],
+        cache: Optional[AdvancedCacheManager] = None,
+        threshold: float = 0.92,
+        ttl: int = 3600,
+        max_entries: int = 1024,
+        pattern: str = "agent_response"
+    ):
+        self.embed_query = embed_query
+        self.cache = cache or advanced_cache
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.pattern = pattern
+        self.tags = [AGENT_RESPONSE_TAG, SERVICE_REGISTRY_TAG, index_tag("api"), index_tag("document")]
+        self.cache.configure_cache(pattern, CacheConfig(
+            levels=[CacheLevel.L1_MEMORY],
+            invalidation=InvalidationStrategy.LRU,
+            ttl=ttl,
+            max_size=max_entries,
+            tags=self.tags
+        ))
+
+        # cache key -> (scope, normalized query, vector slot or None), oldest first
+        self._entries: "OrderedDict[str, Tuple[str, str, Optional[int]]]" = OrderedDict()
+        self._vectors: Optional[np.ndarray] = None
+        self._slot_scopes: List[Optional[str]] = [None] * max_entries
+        self._slot_keys: List[Optional[str]] = [None] * max_entries
+        self._free_slots = list(range(max_entries - 1, -1, -1))
+
+        self.stats = {"hits": 0, "exact_hits": 0, "misses": 0, "stores": 0, "stale": 0, "errors": 0}
+
+    def _key(self, scope: str, normalized: str) -> str:
+        digest = hashlib.sha1(f"{scope}\0{normalized}".encode("utf-8")).hexdigest()
+        return f"{self.pattern}:{digest}"
+
+    async def _embed(self, query: str) -> Optional[np.ndarray]:
+        try:
+            vector = np.asarray(await asyncio.to_thread(self.embed_query, query), dtype=np.float32)
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.warning(f"Semantic cache could not embed query: {e}")
+            return None
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm > 0 else None
+
+    def _nearest(self, scope: str, vector: np.ndarray) -> Tuple[Optional[int], float]:
+        """Returns the best slot in scope and its cosine similarity."""
+        if self._vectors is None or self._vectors.shape[1] != len(vector):
+            return None, 0.0
+        in_scope = np.array([slot_scope == scope for slot_scope in self._slot_scopes])
+        if not in_scope.any():
+            return None, 0.0
+        similarities = self._vectors @ vector
+        similarities[~in_scope] = -np.inf
+        slot = int(np.argmax(similarities))
+        return slot, float(similarities[slot])
+
+    def _forget(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None and entry[2] is not None:
+            self._slot_scopes[entry[2]] = None
+            self._slot_keys[entry[2]] = None
+            self._free_slots.append(entry[2])
+
+    async def _load(self, key: str) -> Optional[AgentResponse]:
+        data = await self.cache.get(key, pattern=self.pattern)
+        if data is None:
+            # Expired, evicted or invalidated since it was indexed
+            self.stats["stale"] += 1
+            self._forget(key)
+            return None
+        self._entries.move_to_end(key)
+        return AgentResponse(**data)
+
+    async def lookup(self, query: str, scope: str = "") -> Optional[AgentResponse]:
+        """
+        Returns a cached response for the query or a near-duplicate of it, or None.
+        """
+        normalized = normalize_query(query)
+        try:
+            key = self._key(scope, normalized)
+            if key in self._entries:
+                response = await self._load(key)
+                if response is not None:
+                    self.stats["hits"] += 1
+                    self.stats["exact_hits"] += 1
+                    return self._annotate(response, normalized, 1.0)
+
+            vector = await self._embed(query)
+            if vector is not None:
+                slot, similarity = self._nearest(scope, vector)
+                if slot is not None and similarity >= self.threshold:
+                    match = self._slot_keys[slot]
+                    response = await self._load(match) if match is not None else None
+                    if response is not None:
+                        self.stats["hits"] += 1
+                        return self._annotate(response, self._entries[match][1], similarity)
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.warning(f"Semantic cache lookup failed: {e}")
+
+        self.stats["misses"] += 1
+        return None
+
+    @staticmethod
+    def _annotate(response: AgentResponse, matched_query: str, similarity: float) -> AgentResponse:
+        metadata = dict(response.metadata or {})
+        metadata["semantic_cache"] = {"hit": True, "matched_query": matched_query, "similarity": round(similarity, 4)}
+        response.metadata = metadata
+        return response
+
+    async def store(self, query: str, response: AgentResponse, scope: str = ""):
+        """
+        Caches a final response for the query within the given scope.
+        """
+        normalized = normalize_query(query)
+        key = self._key(scope, normalized)
+        try:
+            vector = await self._embed(query)
+            self._forget(key)
+            while len(self._entries) >= self.max_entries:
+                self._forget(next(iter(self._entries)))
+
+            slot = None
+            if vector is not None:
+                if self._vectors is None or self._vectors.shape[1] != len(vector):
+                    # A different embedding model; earlier vectors are not comparable
+                    for stale_key in [k for k, entry in self._entries.items() if entry[2] is not None]:
+                        self._forget(stale_key)
+                    self._vectors = np.zeros((self.max_entries, len(vector)), dtype=np.float32)
+                slot = self._free_slots.pop()
+                self._vectors[slot] = vector
+                self._slot_scopes[slot] = scope
+                self._slot_keys[slot] = key
+
+            await self.cache.set(key, response.model_dump(mode="json"), pattern=self.pattern)
+            self._entries[key] = (scope, normalized, slot)
+            self.stats["stores"] += 1
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.warning(f"Semantic cache store failed: {e}")
+
+    async def invalidate(self, tags: Optional[List[str]] = None) -> int:
+        """
+        Drops cached responses under the given tags (all of them by default).
+        """
+        count = await self.cache.invalidate_tags(tags or [AGENT_RESPONSE_TAG])
+        if not tags or AGENT_RESPONSE_TAG in tags:
+            for key in list(self._entries):
+                self._forget(key)
+        return count
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "entries": len(self._entries),
+            "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+            "threshold": self.threshold
+        }
@@ -1,11 +1,19 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Awaitable, Callable
 from .response import AgentResponse, ReasoningStep, Source
 
 
+# Receives each chunk of the final answer as the LLM streams it
+TokenCallback = Callable[[str], Awaitable[None]]
+
+
 class AgentStrategy(ABC):
     """Abstract base class for agent reasoning strategies"""
     
+    # Strategies that accept an ``on_token`` callback in execute() and stream
+    # their final answer through it
+    supports_streaming: bool = False
+    
     def __init__(self, config: Dict[str, Any]):
         self.config = config
     
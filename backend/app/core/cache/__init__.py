@@ -13,6 +13,8 @@ from .strategy import (
     cached,
     cache_context
 )
+from .codecs import CacheCodec, CodecError, get_codec
+from .tags import SERVICE_REGISTRY_TAG, index_tag
 
 __all__ = [
     # Basic cache manager (for backward compatibility)
@@ -27,5 +29,14 @@ __all__ = [
     "CachePattern",
     "advanced_cache",
     "cached",
-    "cache_context"
+    "cache_context",
+    
+    # Binary serialization and compression of cached values
+    "CacheCodec",
+    "CodecError",
+    "get_codec",
+    
+    # Source tags for invalidation on rebuilds
+    "SERVICE_REGISTRY_TAG",
+    "index_tag"
 ]
\ No newline at end of file
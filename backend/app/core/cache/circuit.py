@@ -0,0 +1,64 @@
+"""
+Circuit breaker guarding the Redis (L2) cache tier.
+
+After ``failure_threshold`` consecutive failures the circuit opens and L2 is
+skipped entirely for ``reset_timeout`` seconds. After that a single trial
+call is let through (half-open); success closes the circuit, failure opens it
+again.
+"""
+
+import time
+from enum import Enum
+from typing import Any, Dict, Optional
+
+
+class CircuitState(Enum):
+    """Circuit breaker states."""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker."""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self.stats = {"opened": 0, "rejected": 0}
+
+    def allow(self) -> bool:
+        """Whether a call may go through now."""
+        if self.state == CircuitState.OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                self.stats["rejected"] += 1
+                return False
+            self.state = CircuitState.HALF_OPEN
+            self._trial_in_flight = False
+        if self.state == CircuitState.HALF_OPEN:
+            if self._trial_in_flight:
+                self.stats["rejected"] += 1
+                return False
+            self._trial_in_flight = True
+        return True
+
+    def record_success(self):
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == CircuitState.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != CircuitState.OPEN:
+                self.stats["opened"] += 1
+            self.state = CircuitState.OPEN
+            self.opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "state": self.state.value, "failures": self.failures}
@@ -0,0 +1,201 @@
+"""
+Binary serialization and compression codecs for cached values.
+
+An encoded value is one header byte followed by the payload. The high nibble
+of the header names the serializer and the low nibble the compressor, so any
+process can decode a value without knowing how the writer was configured.
+Payloads below the compression threshold, or that do not shrink, are stored
+uncompressed.
+
+orjson, msgpack, zstandard and lz4 are optional; a codec asking for one that
+is not installed falls back to stdlib json and zlib.
+"""
+
+import json
+import logging
+import zlib
+from dataclasses import dataclass
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Callable, Dict, Optional, Tuple, Type
+from uuid import UUID
+
+from pydantic import BaseModel, ValidationError
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:  # pragma: no cover - optional dependency
+    lz4_frame = None
+
+
+class CodecError(ValueError):
+    """Raised when a payload cannot be decoded."""
+
+
+def _default(value: Any) -> Any:
+    """Converts values the serializers do not handle natively."""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    if hasattr(value, "tolist"):
+        # numpy arrays and scalars
+        return value.tolist()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+@dataclass(frozen=True)
+class Serializer:
+    id: int
+    name: str
+    dumps: Callable[[Any], bytes]
+    loads: Callable[[bytes], Any]
+    # Output is JSON text, so pydantic can encode and validate it directly
+    is_json: bool = False
+
+
+@dataclass(frozen=True)
+class Compressor:
+    id: int
+    name: str
+    compress: Callable[[bytes], bytes]
+    decompress: Callable[[bytes], bytes]
+
+
+SERIALIZERS: Dict[str, Serializer] = {
+    "json": Serializer(
+        1, "json",
+        lambda value: json.dumps(value, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+        lambda data: json.loads(data.decode("utf-8")),
+        is_json=True
+    )
+}
+if orjson is not None:
+    SERIALIZERS["orjson"] = Serializer(
+        2, "orjson",
+        lambda value: orjson.dumps(value, default=_default, option=orjson.OPT_NON_STR_KEYS),
+        orjson.loads,
+        is_json=True
+    )
+if msgpack is not None:
+    SERIALIZERS["msgpack"] = Serializer(
+        3, "msgpack",
+        lambda value: msgpack.packb(value, default=_default, use_bin_type=True),
+        lambda data: msgpack.unpackb(data, raw=False, strict_map_key=False)
+    )
+
+COMPRESSORS: Dict[str, Compressor] = {
+    "none": Compressor(0, "none", bytes, bytes),
+    "zlib": Compressor(1, "zlib", lambda data: zlib.compress(data, 6), zlib.decompress)
+}
+if zstandard is not None:
+    _zstd_compressor = zstandard.ZstdCompressor(level=3)
+    _zstd_decompressor = zstandard.ZstdDecompressor()
+    COMPRESSORS["zstd"] = Compressor(2, "zstd", _zstd_compressor.compress, _zstd_decompressor.decompress)
+if lz4_frame is not None:
+    COMPRESSORS["lz4"] = Compressor(3, "lz4", lz4_frame.compress, lz4_frame.decompress)
+
+_SERIALIZERS_BY_ID = {serializer.id: serializer for serializer in SERIALIZERS.values()}
+_COMPRESSORS_BY_ID = {compressor.id: compressor for compressor in COMPRESSORS.values()}
+
+# Preference order when a requested library is not installed
+SERIALIZER_FALLBACKS = ("orjson", "msgpack", "json")
+COMPRESSOR_FALLBACKS = ("zstd", "lz4", "zlib")
+
+
+def _pick(requested: str, available: Dict[str, Any], fallbacks: Tuple[str, ...], kind: str) -> Any:
+    if requested in available:
+        return available[requested]
+    if requested == "none" and "none" in available:
+        return available["none"]
+    chosen = next(name for name in fallbacks if name in available)
+    logger.warning(f"Cache {kind} '{requested}' is not available; using '{chosen}'")
+    return available[chosen]
+
+
+class CacheCodec:
+    """Encodes values as a header byte plus a serialized, optionally compressed, payload."""
+
+    def __init__(self, serializer: str = "orjson", compressor: str = "zstd", compress_threshold: int = 1024):
+        self.serializer = _pick(serializer, SERIALIZERS, SERIALIZER_FALLBACKS, "serializer")
+        self.compressor = _pick(compressor, COMPRESSORS, COMPRESSOR_FALLBACKS, "compressor")
+        self.compress_threshold = compress_threshold
+
+    @property
+    def name(self) -> str:
+        return f"{self.serializer.name}+{self.compressor.name}"
+
+    def encode(self, value: Any) -> bytes:
+        if self.serializer.is_json and isinstance(value, BaseModel):
+            payload = value.model_dump_json().encode("utf-8")
+        else:
+            payload = self.serializer.dumps(value)
+        compressor = COMPRESSORS["none"]
+        if self.compressor.id and len(payload) >= self.compress_threshold:
+            compressed = self.compressor.compress(payload)
+            if len(compressed) < len(payload):
+                payload, compressor = compressed, self.compressor
+        return bytes(((self.serializer.id << 4) | compressor.id,)) + payload
+
+    def decode(self, data: bytes, model: Optional[Type[BaseModel]] = None) -> Any:
+        """Decodes any codec's output, not only this one's."""
+        return decode(data, model)
+
+    def __repr__(self) -> str:
+        return f"CacheCodec({self.name}, threshold={self.compress_threshold})"
+
+
+def decode(data: bytes, model: Optional[Type[BaseModel]] = None) -> Any:
+    """Decodes a value written by any codec; ``model`` rebuilds a pydantic model."""
+    if not data:
+        raise CodecError("Empty cache payload")
+    header = data[0]
+    serializer = _SERIALIZERS_BY_ID.get(header >> 4)
+    compressor = _COMPRESSORS_BY_ID.get(header & 0x0F)
+    if serializer is None or compressor is None:
+        raise CodecError(f"Unknown cache codec header 0x{header:02x}")
+    try:
+        payload = compressor.decompress(data[1:])
+        if model is not None and serializer.is_json:
+            return model.model_validate_json(payload)
+        value = serializer.loads(payload)
+    except ValidationError:
+        raise
+    except Exception as e:
+        raise CodecError(f"Failed to decode {serializer.name}+{compressor.name} payload: {e}") from e
+    return model.model_validate(value) if model is not None else value
+
+
+_codecs: Dict[Tuple[str, str, int], CacheCodec] = {}
+
+
+def get_codec(serializer: str = "orjson", compressor: str = "zstd", compress_threshold: int = 1024) -> CacheCodec:
+    """Returns a shared codec for the given settings."""
+    key = (serializer, compressor, compress_threshold)
+    codec = _codecs.get(key)
+    if codec is None:
+        codec = _codecs[key] = CacheCodec(serializer, compressor, compress_threshold)
+    return codec
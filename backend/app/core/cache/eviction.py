@@ -0,0 +1,181 @@
+"""
+Eviction structures for the in-memory (L1) cache tier.
+
+Every policy supports add, touch, remove and picking a victim in O(1), so
+storing into a full cache costs the same regardless of how many entries it
+holds. Expiry is tracked separately in a min-heap ordered by expiry time.
+"""
+
+import heapq
+import itertools
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+
+class EvictionPolicy(ABC):
+    """Tracks keys and picks which one to evict next."""
+
+    @abstractmethod
+    def add(self, key: str):
+        """Start tracking a newly stored key"""
+        pass
+
+    @abstractmethod
+    def touch(self, key: str):
+        """Record an access to a tracked key"""
+        pass
+
+    @abstractmethod
+    def remove(self, key: str):
+        """Stop tracking a key; unknown keys are ignored"""
+        pass
+
+    @abstractmethod
+    def victim(self) -> Optional[str]:
+        """Return the key to evict next, or None when empty"""
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Return the number of tracked keys"""
+        pass
+
+
+class FIFOPolicy(EvictionPolicy):
+    """Evicts the oldest inserted key; access does not change the order."""
+
+    def __init__(self):
+        self._order: "OrderedDict[str, None]" = OrderedDict()
+
+    def add(self, key: str):
+        self._order[key] = None
+        self._order.move_to_end(key)
+
+    def touch(self, key: str):
+        pass
+
+    def remove(self, key: str):
+        self._order.pop(key, None)
+
+    def victim(self) -> Optional[str]:
+        return next(iter(self._order), None)
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+
+class LRUPolicy(FIFOPolicy):
+    """Evicts the least recently used key."""
+
+    def touch(self, key: str):
+        if key in self._order:
+            self._order.move_to_end(key)
+
+
+class LFUPolicy(EvictionPolicy):
+    """
+    Evicts the least frequently used key, least recently used among ties.
+    Keys are kept in per-frequency buckets with the lowest non-empty
+    frequency tracked, so no operation has to scan.
+    """
+
+    def __init__(self):
+        self._freq: Dict[str, int] = {}
+        self._buckets: Dict[int, "OrderedDict[str, None]"] = {}
+        self._min_freq = 0
+
+    def _bucket(self, freq: int) -> "OrderedDict[str, None]":
+        bucket = self._buckets.get(freq)
+        if bucket is None:
+            bucket = self._buckets[freq] = OrderedDict()
+        return bucket
+
+    def _unlink(self, key: str, freq: int):
+        bucket = self._buckets[freq]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[freq]
+
+    def add(self, key: str):
+        if key in self._freq:
+            self.remove(key)
+        self._freq[key] = 1
+        self._bucket(1)[key] = None
+        self._min_freq = 1
+
+    def touch(self, key: str):
+        freq = self._freq.get(key)
+        if freq is None:
+            return
+        self._unlink(key, freq)
+        if freq == self._min_freq and freq not in self._buckets:
+            self._min_freq = freq + 1
+        self._freq[key] = freq + 1
+        self._bucket(freq + 1)[key] = None
+
+    def remove(self, key: str):
+        freq = self._freq.pop(key, None)
+        if freq is None:
+            return
+        self._unlink(key, freq)
+        if freq == self._min_freq and freq not in self._buckets:
+            # Only reached when evicting or deleting; the next add resets it to 1
+            self._min_freq = min(self._buckets, default=0)
+
+    def victim(self) -> Optional[str]:
+        bucket = self._buckets.get(self._min_freq)
+        return next(iter(bucket), None) if bucket else None
+
+    def frequency(self, key: str) -> int:
+        return self._freq.get(key, 0)
+
+    def __len__(self) -> int:
+        return len(self._freq)
+
+
+class ExpiryHeap:
+    """
+    Min-heap of expiry times. Replaced or removed keys leave stale heap
+    items behind, which are skipped when they reach the top.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[datetime, int, str]] = []
+        self._expiry: Dict[str, datetime] = {}
+        self._counter = itertools.count()
+
+    def push(self, key: str, expires_at: datetime):
+        self._expiry[key] = expires_at
+        heapq.heappush(self._heap, (expires_at, next(self._counter), key))
+
+    def remove(self, key: str):
+        self._expiry.pop(key, None)
+        # Keep stale items from piling up when keys are rewritten often
+        if len(self._heap) > 2 * len(self._expiry) + 64:
+            self._heap = [(at, n, k) for at, n, k in self._heap if self._expiry.get(k) == at]
+            heapq.heapify(self._heap)
+
+    def pop_expired(self, now: datetime) -> List[str]:
+        """Removes and returns every key that has expired by ``now``."""
+        expired = []
+        while self._heap and self._heap[0][0] <= now:
+            expires_at, _, key = heapq.heappop(self._heap)
+            if self._expiry.get(key) == expires_at:
+                del self._expiry[key]
+                expired.append(key)
+        return expired
+
+    def __len__(self) -> int:
+        return len(self._expiry)
+
+
+def make_policy(strategy) -> EvictionPolicy:
+    """Eviction policy for an InvalidationStrategy; anything else evicts oldest first."""
+    name = getattr(strategy, "value", strategy)
+    if name == "lru":
+        return LRUPolicy()
+    if name == "lfu":
+        return LFUPolicy()
+    return FIFOPolicy()
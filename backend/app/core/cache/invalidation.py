@@ -0,0 +1,165 @@
+"""
+Cross-process L1 invalidation over Redis pub/sub.
+
+Each process's L1 tier is private, so when one worker deletes, updates or
+invalidates entries it publishes the affected keys, tags or dependencies on a
+shared channel and every other worker drops its own L1 copies. Messages are
+stamped with the sending process and a per-process sequence number. Pub/sub
+delivery is at-most-once, so a gap in a sender's sequence, or a dropped
+subscription, makes the receiver clear its whole L1 rather than risk serving
+stale entries.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from ..cache_manager import cache_manager as default_cache_manager
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "cache:invalidate"
+
+# Kinds of invalidation message
+KEYS = "keys"
+TAGS = "tags"
+DEPENDENCIES = "dependencies"
+
+# Called with the invalidation kind and names, or with ("all", []) after a gap
+InvalidationHandler = Callable[[str, List[str]], Awaitable[None]]
+
+
+class InvalidationBus:
+    """Publishes and receives L1 invalidations for one process."""
+
+    def __init__(
+        self,
+        cache: Any = None,
+        channel: str = INVALIDATION_CHANNEL,
+        origin: Optional[str] = None,
+        max_reconnect_delay: float = 30.0
+    ):
+        self.cache = cache or default_cache_manager
+        self.channel = channel
+        self.origin = origin or uuid.uuid4().hex
+        self.max_reconnect_delay = max_reconnect_delay
+        self._sequence = itertools.count(1)
+        self._last_seen: Dict[str, int] = {}
+        self._handler: Optional[InvalidationHandler] = None
+        self._listener: Optional[asyncio.Task] = None
+        self.subscribed = asyncio.Event()
+        self.stats = {
+            "published": 0,
+            "publish_errors": 0,
+            "received": 0,
+            "applied": 0,
+            "gaps": 0,
+            "resyncs": 0,
+            "errors": 0
+        }
+
+    @property
+    def running(self) -> bool:
+        return self._listener is not None and not self._listener.done()
+
+    async def start(self, handler: InvalidationHandler):
+        """Subscribe to the channel and apply other processes' invalidations."""
+        self._handler = handler
+        if not self.running:
+            self.subscribed = asyncio.Event()
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self._listener:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+
+    async def publish(self, kind: str, names: List[str]) -> bool:
+        """
+        Broadcast an invalidation. Does nothing until the bus is started, so
+        processes without a listener never pay for a round-trip.
+        """
+        if not names or not self.running:
+            return False
+        message = json.dumps({
+            "origin": self.origin,
+            "seq": next(self._sequence),
+            "kind": kind,
+            "names": list(names)
+        })
+        try:
+            await self.cache.connect()
+            await self.cache.redis.publish(self.channel, message)
+            self.stats["published"] += 1
+            return True
+        except Exception as e:
+            # Other processes fall back to TTL expiry for this change
+            self.stats["publish_errors"] += 1
+            logger.warning("Error publishing cache invalidation: %s", e)
+            return False
+
+    async def _listen(self):
+        delay = 1.0
+        subscribed_before = False
+        while True:
+            pubsub = None
+            try:
+                await self.cache.connect()
+                pubsub = self.cache.redis.pubsub()
+                await pubsub.subscribe(self.channel)
+                if subscribed_before:
+                    # Anything published while we were away was missed
+                    self.stats["resyncs"] += 1
+                    await self._handler("all", [])
+                subscribed_before = True
+                self.subscribed.set()
+                delay = 1.0
+
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        await self._receive(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.warning("Cache invalidation listener error, reconnecting in %.0fs: %s", delay, e)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+            finally:
+                self.subscribed.clear()
+                if pubsub is not None:
+                    try:
+                        await pubsub.unsubscribe(self.channel)
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
+
+    async def _receive(self, data: Any):
+        try:
+            message = json.loads(data)
+            origin, seq = message["origin"], int(message["seq"])
+        except (TypeError, ValueError, KeyError):
+            self.stats["errors"] += 1
+            return
+        if origin == self.origin:
+            return
+        self.stats["received"] += 1
+
+        last = self._last_seen.get(origin)
+        if last is not None and seq <= last:
+            # Duplicate or reordered delivery of something already applied
+            return
+        self._last_seen[origin] = seq
+        if last is not None and seq > last + 1:
+            self.stats["gaps"] += 1
+            await self._handler("all", [])
+
+        await self._handler(message.get("kind", KEYS), message.get("names") or [])
+        self.stats["applied"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "origin": self.origin, "running": self.running, "peers": len(self._last_seen)}
@@ -6,22 +6,37 @@ including intelligent invalidation, cache warming, hierarchical caching, and
 performance optimization patterns.
 """
 
-from typing import Dict, Any, Optional, List, Union, Callable, TypeVar, Generic
+from typing import Dict, Any, Optional, List, Set, Tuple, Type, Union, Callable, Awaitable, TypeVar, Generic
+from collections import OrderedDict
 from enum import Enum
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 import uuid
 import asyncio
+import functools
 import hashlib
+import inspect
+import logging
+import math
 import pickle
+import random
+import sys
+import time
 import zlib
 from contextlib import asynccontextmanager
 import json
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError
 
 # Import basic cache manager from the renamed file
 from ..cache_manager import cache_manager
+from .circuit import CircuitBreaker
+from .codecs import CacheCodec, CodecError, decode, get_codec
+from .eviction import EvictionPolicy, ExpiryHeap, make_policy
+from .invalidation import DEPENDENCIES, KEYS, TAGS, InvalidationBus
+from ..config import settings
+
+logger = logging.getLogger(__name__)
 
 T = TypeVar('T')
 
@@ -61,12 +76,26 @@ class CacheConfig:
     pattern: CachePattern = CachePattern.CACHE_ASIDE
     ttl: int = 3600  # Default 1 hour
     max_size: Optional[int] = None
+    max_bytes: Optional[int] = None  # L1 byte budget for the pattern, from CacheEntry.size_bytes
+    # Serializer for L2 values ("orjson", "msgpack", "json"); None keeps the
+    # legacy JSON text format. compression also compresses large values with
+    # settings.CACHE_COMPRESSOR, in L2 and L1.
+    codec: Optional[str] = None
     compression: bool = False
+    # Pydantic model that codec-decoded values are rebuilt into
+    model: Optional[Type[BaseModel]] = None
     encryption: bool = False
     tags: List[str] = field(default_factory=list)
     dependencies: List[str] = field(default_factory=list)
     warming_strategy: Optional[str] = None
     prefetch_related: List[str] = field(default_factory=list)
+    # REFRESH_AHEAD: XFetch early-refresh aggressiveness and how long an expired
+    # entry may still be served while it is recomputed in the background
+    refresh_beta: float = 1.0
+    stale_ttl: int = 0
+    # Backing store for WRITE_THROUGH (awaited on every set) and WRITE_BEHIND
+    # (called for each key when the buffer is flushed); takes (key, value)
+    writer: Optional[Callable[[str, Any], Any]] = None
 
 
 @dataclass
@@ -84,6 +113,8 @@ class CacheEntry:
     size_bytes: Optional[int] = None
     compressed: bool = False
     encrypted: bool = False
+    pattern: Optional[str] = None
+    compute_seconds: float = 0.0  # How long the fallback took to produce the value
     
     def is_expired(self) -> bool:
         """Check if cache entry is expired."""
@@ -95,6 +126,35 @@ class CacheEntry:
         """Update access metadata."""
         self.last_accessed = datetime.utcnow()
         self.access_count += 1
+    
+    @property
+    def expires_at(self) -> Optional[datetime]:
+        return self.created_at + timedelta(seconds=self.ttl) if self.ttl else None
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate in-memory size of a cached value, in bytes."""
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(value)
+
+
+class L1Partition:
+    """L1 bookkeeping for one cache pattern: eviction order and size budgets."""
+    
+    def __init__(self, config: "CacheConfig"):
+        self.invalidation = config.invalidation
+        self.max_size = config.max_size
+        self.max_bytes = config.max_bytes
+        self.policy: EvictionPolicy = make_policy(config.invalidation)
+        self.bytes = 0
+    
+    def needs_room(self, incoming_bytes: int = 0) -> bool:
+        """Whether an entry of ``incoming_bytes`` would exceed the budgets."""
+        if self.max_size and len(self.policy) >= self.max_size:
+            return True
+        return bool(self.max_bytes) and self.bytes + incoming_bytes > self.max_bytes
 
 
 class AdvancedCacheManager:
@@ -111,11 +171,46 @@ class AdvancedCacheManager:
     - Circuit breaker patterns
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        write_behind_interval: float = 1.0,
+        write_behind_batch_size: int = 100,
+        l2_failure_threshold: int = 5,
+        l2_reset_timeout: float = 30.0,
+        invalidation_bus: Optional[InvalidationBus] = None
+    ):
         self.l1_cache: Dict[str, CacheEntry] = {}  # In-memory cache
         self.cache_configs: Dict[str, CacheConfig] = {}
-        self.dependency_graph: Dict[str, List[str]] = {}
-        self.tag_index: Dict[str, List[str]] = {}
+        self.dependency_graph: Dict[str, Set[str]] = {}
+        self.tag_index: Dict[str, Set[str]] = {}
+        # Reverse indexes, so removing a key touches only its own tags and dependencies
+        self.key_tags: Dict[str, Set[str]] = {}
+        self.key_dependencies: Dict[str, Set[str]] = {}
+        
+        # L1 eviction state per pattern, and expiry times across all of L1
+        self.l1_partitions: Dict[Optional[str], L1Partition] = {}
+        self.l1_expiry = ExpiryHeap()
+        
+        # Fallback computations in progress, one per key
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._refresh_tasks: Set[asyncio.Task] = set()
+        
+        # WRITE_BEHIND buffer: key -> (value, ttl, pattern); rewrites replace the pending value
+        self.write_behind_interval = write_behind_interval
+        self.write_behind_batch_size = write_behind_batch_size
+        self._write_buffer: "OrderedDict[str, Tuple[Any, Optional[int], Optional[str]]]" = OrderedDict()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_now = asyncio.Event()
+        
+        # Skips Redis for CIRCUIT_BREAKER patterns while it keeps failing
+        self.l2_breaker = CircuitBreaker(l2_failure_threshold, l2_reset_timeout)
+        
+        # Keeps other processes' L1 tiers in step with this one
+        self.invalidation_bus = invalidation_bus
+        # key -> monotonic time it was last invalidated, so fallbacks that
+        # started earlier do not cache what they read
+        self._invalidated_at: "OrderedDict[str, float]" = OrderedDict()
+        self._max_tombstones = 10000
         
         # Performance metrics
         self.stats = {
@@ -128,7 +223,23 @@ class AdvancedCacheManager:
             "evictions": 0,
             "invalidations": 0,
             "compressions": 0,
-            "decompressions": 0
+            "decompressions": 0,
+            "fallback_calls": 0,
+            "coalesced": 0,
+            "early_refreshes": 0,
+            "stale_served": 0,
+            "refresh_errors": 0,
+            "write_through": 0,
+            "write_behind_queued": 0,
+            "write_behind_coalesced": 0,
+            "write_behind_flushes": 0,
+            "write_behind_flushed": 0,
+            "write_behind_errors": 0,
+            "l2_skipped": 0,
+            "l2_errors": 0,
+            "l2_decode_errors": 0,
+            "remote_invalidations": 0,
+            "stale_loads_discarded": 0
         }
         
         # Background tasks
@@ -141,6 +252,8 @@ class AdvancedCacheManager:
             self.cleanup_task = asyncio.create_task(self._cleanup_loop())
         if not self.warming_task:
             self.warming_task = asyncio.create_task(self._warming_loop())
+        if self.invalidation_bus:
+            await self.invalidation_bus.start(self._apply_remote_invalidation)
     
     async def stop(self):
         """Stop background tasks."""
@@ -156,43 +269,97 @@ class AdvancedCacheManager:
                 await self.warming_task
             except asyncio.CancelledError:
                 pass
+        for task in list(self._refresh_tasks):
+            task.cancel()
+        await asyncio.gather(*self._refresh_tasks, return_exceptions=True)
+        
+        # Drain buffered writes so they are not lost on shutdown
+        if self._flush_task:
+            self._flush_now.set()
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+        if self._flush_task:
+            # Rescheduled after a failed flush; the final flush below retries it
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self.flush()
+        
+        if self.invalidation_bus:
+            await self.invalidation_bus.stop()
     
     def configure_cache(self, pattern: str, config: CacheConfig):
         """Configure caching strategy for a pattern."""
         self.cache_configs[pattern] = config
+        
+        partition = self.l1_partitions.get(pattern)
+        if partition is not None:
+            # Rebuild the eviction order under the new policy
+            keys = [key for key, entry in self.l1_cache.items() if entry.pattern == pattern]
+            new_partition = L1Partition(config)
+            for key in keys:
+                new_partition.policy.add(key)
+            new_partition.bytes = partition.bytes
+            self.l1_partitions[pattern] = new_partition
     
     async def get(
         self,
         key: str,
         pattern: Optional[str] = None,
-        fallback: Optional[Callable] = None
+        fallback: Optional[Callable] = None,
+        ttl: Optional[int] = None,
+        tags: Optional[List[str]] = None,
+        dependencies: Optional[List[str]] = None
     ) -> Optional[Any]:
-        """Get value from cache with advanced strategies."""
+        """
+        Get value from cache with advanced strategies.
+        
+        On a miss, ``fallback`` computes the value, which is stored with the
+        given ttl, tags and dependencies. Concurrent misses on the same key
+        share one fallback call. Under REFRESH_AHEAD, hits are refreshed in
+        the background shortly before they expire (XFetch), and expired
+        entries are served for up to ``stale_ttl`` seconds while refreshing.
+        """
         config = self.cache_configs.get(pattern, CacheConfig())
+        refresh_ahead = fallback is not None and config.pattern == CachePattern.REFRESH_AHEAD
         
         # Try L1 cache first (in-memory)
         if CacheLevel.L1_MEMORY in config.levels:
             if key in self.l1_cache:
                 entry = self.l1_cache[key]
-                if not entry.is_expired():
+                expired = entry.is_expired()
+                if not expired or (refresh_ahead and self._within_stale_window(entry, config)):
                     entry.touch()
+                    self._partition(entry.pattern).policy.touch(key)
                     self.stats["hits"] += 1
                     self.stats["l1_hits"] += 1
-                    return self._deserialize_value(entry.value, entry.compressed, entry.encrypted)
+                    if expired:
+                        self.stats["stale_served"] += 1
+                        self._refresh(key, pattern, fallback, ttl, tags, dependencies)
+                    elif refresh_ahead and self._should_refresh_early(entry, config):
+                        self.stats["early_refreshes"] += 1
+                        self._refresh(key, pattern, fallback, ttl, tags, dependencies)
+                    return self._deserialize_value(entry.value, entry.compressed, entry.encrypted, config.model)
                 else:
                     # Remove expired entry
-                    del self.l1_cache[key]
+                    self._drop_l1(key)
+        
+        # Writes still waiting in the write-behind buffer are the newest values
+        if key in self._write_buffer:
+            self.stats["hits"] += 1
+            return self._write_buffer[key][0]
         
         # Try L2 cache (Redis)
         if CacheLevel.L2_REDIS in config.levels:
-            value = await cache_manager.get(key)
+            value = await self._l2(config, lambda: self._l2_get(key, config))
             if value is not None:
                 self.stats["hits"] += 1
                 self.stats["l2_hits"] += 1
                 
-                # Populate L1 cache if configured
+                # Populate L1 cache if configured; the pattern's tags and
+                # dependencies are indexed so remote invalidations reach it
                 if CacheLevel.L1_MEMORY in config.levels:
-                    await self._store_l1(key, value, config)
+                    await self._store_l1(key, value, config, tags=config.tags,
+                                         dependencies=config.dependencies, pattern=pattern)
+                    await self._update_indexes(key, config.tags, config.dependencies)
                 
                 return value
         
@@ -200,13 +367,102 @@ class AdvancedCacheManager:
         self.stats["misses"] += 1
         
         if fallback:
-            value = await fallback() if asyncio.iscoroutinefunction(fallback) else fallback()
-            if value is not None:
-                await self.set(key, value, pattern=pattern)
-            return value
+            task = self._inflight.get(key)
+            if task is not None:
+                self.stats["coalesced"] += 1
+            else:
+                task = self._start_fallback(key, pattern, fallback, ttl, tags, dependencies)
+            # Shielded so a cancelled caller does not cancel the shared computation
+            return await asyncio.shield(task)
         
         return None
     
+    def _within_stale_window(self, entry: CacheEntry, config: CacheConfig) -> bool:
+        expires_at = entry.expires_at
+        return bool(config.stale_ttl) and expires_at is not None and \
+            datetime.utcnow() < expires_at + timedelta(seconds=config.stale_ttl)
+    
+    def _should_refresh_early(self, entry: CacheEntry, config: CacheConfig) -> bool:
+        """
+        XFetch: refresh with a probability that rises as expiry approaches,
+        scaled by how long the value took to compute.
+        """
+        expires_at = entry.expires_at
+        if expires_at is None or not entry.compute_seconds or config.refresh_beta <= 0:
+            return False
+        gap = entry.compute_seconds * config.refresh_beta * -math.log(1.0 - random.random())
+        return datetime.utcnow() + timedelta(seconds=gap) >= expires_at
+    
+    def _start_fallback(
+        self,
+        key: str,
+        pattern: Optional[str],
+        fallback: Callable,
+        ttl: Optional[int],
+        tags: Optional[List[str]],
+        dependencies: Optional[List[str]]
+    ) -> asyncio.Task:
+        task = asyncio.ensure_future(self._load(key, pattern, fallback, ttl, tags, dependencies))
+        self._inflight[key] = task
+        
+        def _done(finished: asyncio.Task):
+            if self._inflight.get(key) is finished:
+                del self._inflight[key]
+        
+        task.add_done_callback(_done)
+        return task
+    
+    def _refresh(
+        self,
+        key: str,
+        pattern: Optional[str],
+        fallback: Callable,
+        ttl: Optional[int],
+        tags: Optional[List[str]],
+        dependencies: Optional[List[str]]
+    ):
+        """Recompute a key in the background unless that is already under way."""
+        if key in self._inflight:
+            return
+        task = self._start_fallback(key, pattern, fallback, ttl, tags, dependencies)
+        self._refresh_tasks.add(task)
+        
+        def _done(finished: asyncio.Task):
+            self._refresh_tasks.discard(finished)
+            if not finished.cancelled() and finished.exception() is not None:
+                # The current entry stays in place until a later refresh succeeds
+                self.stats["refresh_errors"] += 1
+                logger.warning("Error refreshing cache key '%s': %s", key, finished.exception())
+        
+        task.add_done_callback(_done)
+    
+    async def _load(
+        self,
+        key: str,
+        pattern: Optional[str],
+        fallback: Callable,
+        ttl: Optional[int],
+        tags: Optional[List[str]],
+        dependencies: Optional[List[str]]
+    ) -> Any:
+        """Run a fallback and cache its result along with how long it took."""
+        self.stats["fallback_calls"] += 1
+        started = time.perf_counter()
+        started_at = time.monotonic()
+        value = fallback()
+        if inspect.isawaitable(value):
+            value = await value
+        if value is not None and self._invalidated_at.get(key, 0.0) >= started_at:
+            # Invalidated while loading: what the fallback read may predate the change
+            self.stats["stale_loads_discarded"] += 1
+        elif value is not None:
+            # A fill repeats what the source already holds, so peers need no invalidation
+            await self.set(key, value, pattern=pattern, ttl=ttl, tags=tags, dependencies=dependencies, broadcast=False)
+            entry = self.l1_cache.get(key)
+            if entry is not None:
+                entry.compute_seconds = time.perf_counter() - started
+        return value
+    
     async def set(
         self,
         key: str,
@@ -214,38 +470,116 @@ class AdvancedCacheManager:
         pattern: Optional[str] = None,
         ttl: Optional[int] = None,
         tags: Optional[List[str]] = None,
-        dependencies: Optional[List[str]] = None
+        dependencies: Optional[List[str]] = None,
+        broadcast: bool = True
     ):
-        """Set value in cache with advanced options."""
+        """
+        Set value in cache with advanced options. For patterns shared through
+        L2, ``broadcast`` drops other processes' L1 copies of the key.
+        """
         config = self.cache_configs.get(pattern, CacheConfig())
         effective_ttl = ttl or config.ttl
         effective_tags = tags or config.tags
         effective_deps = dependencies or config.dependencies
         
+        # Write-through: the backing store is written first; if it fails nothing is cached
+        if config.pattern == CachePattern.WRITE_THROUGH and config.writer:
+            result = config.writer(key, value)
+            if inspect.isawaitable(result):
+                await result
+            self.stats["write_through"] += 1
+        
         # Store in configured levels
         if CacheLevel.L1_MEMORY in config.levels:
-            await self._store_l1(key, value, config, effective_ttl, effective_tags, effective_deps)
+            await self._store_l1(key, value, config, effective_ttl, effective_tags, effective_deps, pattern=pattern)
         
-        if CacheLevel.L2_REDIS in config.levels:
-            await cache_manager.set(key, value, expire=effective_ttl)
+        if config.pattern == CachePattern.WRITE_BEHIND:
+            # Peers are told when the buffered write reaches Redis
+            self._buffer_write(key, value, effective_ttl, pattern)
+        elif CacheLevel.L2_REDIS in config.levels:
+            await self._l2(config, lambda: cache_manager.set(key, value, expire=effective_ttl, **self._codec_kwargs(config)))
+            if broadcast:
+                await self._publish(KEYS, [key])
         
         # Update indexes
         await self._update_indexes(key, effective_tags, effective_deps)
     
     async def delete(self, key: str):
         """Delete from all cache levels."""
-        # Remove from L1
-        if key in self.l1_cache:
-            del self.l1_cache[key]
+        # Remove from L1, any pending write and the indexes
+        self._write_buffer.pop(key, None)
+        await self._invalidate_local([key])
         
         # Remove from L2
         await cache_manager.delete(key)
         
-        # Remove from indexes
-        await self._remove_from_indexes(key)
-        
+        await self._publish(KEYS, [key])
         self.stats["invalidations"] += 1
     
+    async def invalidate_tags(self, tags: List[str]) -> int:
+        """
+        Delete every entry stored under any of the given tags. Returns the
+        number of keys invalidated.
+        """
+        return await self._invalidate_index(self.tag_index, TAGS, tags)
+    
+    async def invalidate_dependencies(self, dependencies: List[str]) -> int:
+        """
+        Delete every entry that depends on any of the given dependencies.
+        Returns the number of keys invalidated.
+        """
+        return await self._invalidate_index(self.dependency_graph, DEPENDENCIES, dependencies)
+    
+    async def _invalidate_index(self, index: Dict[str, Set[str]], kind: str, names: List[str]) -> int:
+        keys = []
+        for name in names:
+            keys.extend(index.pop(name, []))
+        keys = list(dict.fromkeys(keys))
+        
+        for key in keys:
+            self._write_buffer.pop(key, None)
+        await self._invalidate_local(keys)
+        for key in keys:
+            try:
+                await cache_manager.delete(key)
+            except Exception as e:
+                # An unreachable L2 must not keep stale L1 entries alive
+                logger.warning("Error invalidating '%s' in Redis: %s", key, e)
+        
+        # Peers resolve the names against their own indexes
+        await self._publish(kind, names)
+        self.stats["invalidations"] += len(keys)
+        return len(keys)
+    
+    async def _invalidate_local(self, keys: List[str]):
+        """Drop keys from this process's L1 and indexes and remember when."""
+        now = time.monotonic()
+        for key in keys:
+            self._drop_l1(key)
+            await self._remove_from_indexes(key)
+            self._invalidated_at.pop(key, None)
+            self._invalidated_at[key] = now
+        while len(self._invalidated_at) > self._max_tombstones:
+            self._invalidated_at.popitem(last=False)
+    
+    async def _publish(self, kind: str, names: List[str]):
+        if self.invalidation_bus:
+            await self.invalidation_bus.publish(kind, names)
+    
+    async def _apply_remote_invalidation(self, kind: str, names: List[str]):
+        """Apply an invalidation published by another process to this L1."""
+        if kind == TAGS:
+            keys = [key for name in names for key in self.tag_index.pop(name, ())]
+        elif kind == DEPENDENCIES:
+            keys = [key for name in names for key in self.dependency_graph.pop(name, ())]
+        elif kind == KEYS:
+            keys = list(names)
+        else:
+            # Messages may have been missed; nothing in L1 can be trusted
+            keys = list(self.l1_cache)
+        await self._invalidate_local(list(dict.fromkeys(keys)))
+        self.stats["remote_invalidations"] += 1
+    
     async def exists(self, key: str) -> bool:
         """Check if key exists in any cache level."""
         # Check L1
@@ -253,11 +587,176 @@ class AdvancedCacheManager:
             entry = self.l1_cache[key]
             if not entry.is_expired():
                 return True
-            del self.l1_cache[key]
+            self._drop_l1(key)
         
         # Check L2
         return await cache_manager.exists(key)
     
+    async def _l2(self, config: CacheConfig, operation: Callable[[], Awaitable[Any]], default: Any = None) -> Any:
+        """
+        Run a Redis operation. For CIRCUIT_BREAKER patterns it is skipped while
+        the breaker is open and failures fall back to ``default`` (L1 only);
+        other patterns raise as before but still feed the breaker.
+        """
+        guarded = config.pattern == CachePattern.CIRCUIT_BREAKER
+        if guarded and not self.l2_breaker.allow():
+            self.stats["l2_skipped"] += 1
+            return default
+        try:
+            result = await operation()
+        except Exception as e:
+            self.l2_breaker.record_failure()
+            if not guarded:
+                raise
+            self.stats["l2_errors"] += 1
+            logger.warning("Redis cache unavailable, serving L1 only: %s", e)
+            return default
+        self.l2_breaker.record_success()
+        return result
+    
+    async def _l2_get(self, key: str, config: CacheConfig) -> Any:
+        """
+        Read a key from Redis. A payload that no longer decodes (written in the
+        legacy format, corrupted, or no longer matching ``config.model``) is
+        deleted and treated as a miss.
+        """
+        try:
+            return await cache_manager.get(key, **self._codec_kwargs(config, read=True))
+        except (CodecError, ValidationError) as e:
+            self.stats["l2_decode_errors"] += 1
+            logger.warning("Discarding undecodable cache key '%s': %s", key, e)
+            await cache_manager.delete(key)
+            return None
+    
+    def _codec(self, config: CacheConfig) -> Optional[CacheCodec]:
+        if not config.codec and not config.compression:
+            return None
+        return get_codec(
+            config.codec or settings.CACHE_SERIALIZER,
+            settings.CACHE_COMPRESSOR if config.compression else "none",
+            settings.CACHE_COMPRESSION_THRESHOLD
+        )
+    
+    def _codec_kwargs(self, config: CacheConfig, read: bool = False) -> Dict[str, Any]:
+        """Codec arguments for cache_manager calls; empty for the legacy JSON format."""
+        codec = self._codec(config)
+        if codec is None:
+            return {}
+        return {"codec": codec, "model": config.model} if read else {"codec": codec}
+    
+    def _buffer_write(self, key: str, value: Any, ttl: Optional[int], pattern: Optional[str]):
+        """Queue a write-behind write, replacing any pending write to the same key."""
+        if key in self._write_buffer:
+            self.stats["write_behind_coalesced"] += 1
+            del self._write_buffer[key]
+        self._write_buffer[key] = (value, ttl, pattern)
+        self.stats["write_behind_queued"] += 1
+        
+        if self._flush_task is None or self._flush_task.done():
+            self._schedule_flush()
+        if len(self._write_buffer) >= self.write_behind_batch_size:
+            self._flush_now.set()
+    
+    def _schedule_flush(self):
+        # A fresh event per flush task keeps it bound to the running loop
+        self._flush_now = asyncio.Event()
+        self._flush_task = asyncio.ensure_future(self._flush_after(self.write_behind_interval))
+    
+    async def _flush_after(self, delay: float):
+        """Flush once ``delay`` has passed or a full batch is waiting."""
+        try:
+            await asyncio.wait_for(self._flush_now.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
+        self._flush_now.clear()
+        await self.flush()
+        
+        self._flush_task = None
+        if self._write_buffer:
+            self._schedule_flush()
+    
+    async def flush(self) -> int:
+        """
+        Write buffered write-behind entries to Redis in one pipelined batch and
+        to their pattern's writer. Failed entries are requeued unless a newer
+        write to the same key has arrived. Returns the number written.
+        """
+        if not self._write_buffer:
+            return 0
+        batch, self._write_buffer = self._write_buffer, OrderedDict()
+        self.stats["write_behind_flushes"] += 1
+        failed: List[str] = []
+        
+        # One pipeline per codec, so usually a single round-trip
+        l2_groups: Dict[Optional[CacheCodec], List[Tuple[str, Any, Optional[int]]]] = {}
+        for key, (value, ttl, pattern) in batch.items():
+            config = self.cache_configs.get(pattern, CacheConfig())
+            if CacheLevel.L2_REDIS in config.levels:
+                l2_groups.setdefault(self._codec(config), []).append((key, value, ttl))
+        for codec, l2_items in l2_groups.items():
+            if not self.l2_breaker.allow():
+                self.stats["l2_skipped"] += 1
+                failed.extend(key for key, _, _ in l2_items)
+            else:
+                try:
+                    await cache_manager.set_many(l2_items, **({"codec": codec} if codec else {}))
+                    self.l2_breaker.record_success()
+                    await self._publish(KEYS, [key for key, _, _ in l2_items])
+                except Exception as e:
+                    self.l2_breaker.record_failure()
+                    logger.warning("Error flushing %d write-behind entries to Redis: %s", len(l2_items), e)
+                    failed.extend(key for key, _, _ in l2_items)
+        
+        for key, (value, ttl, pattern) in batch.items():
+            writer = self.cache_configs.get(pattern, CacheConfig()).writer
+            if writer is None or key in failed:
+                continue
+            try:
+                result = writer(key, value)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.warning("Error writing back cache key '%s': %s", key, e)
+                failed.append(key)
+        
+        for key in failed:
+            if key not in self._write_buffer:
+                self._write_buffer[key] = batch[key]
+        self.stats["write_behind_errors"] += len(failed)
+        written = len(batch) - len(failed)
+        self.stats["write_behind_flushed"] += written
+        return written
+    
+    def _partition(self, pattern: Optional[str]) -> L1Partition:
+        partition = self.l1_partitions.get(pattern)
+        if partition is None:
+            partition = self.l1_partitions[pattern] = L1Partition(self.cache_configs.get(pattern, CacheConfig()))
+        return partition
+    
+    def _drop_l1(self, key: str) -> Optional[CacheEntry]:
+        """Remove a key from L1 and its eviction bookkeeping."""
+        entry = self.l1_cache.pop(key, None)
+        if entry is None:
+            return None
+        partition = self._partition(entry.pattern)
+        partition.policy.remove(key)
+        partition.bytes -= entry.size_bytes or 0
+        self.l1_expiry.remove(key)
+        return entry
+    
+    async def _expire_l1(self) -> int:
+        """Drop expired L1 entries, soonest-expiring first, without scanning the rest."""
+        expired = self.l1_expiry.pop_expired(datetime.utcnow())
+        for key in expired:
+            entry = self.l1_cache.get(key)
+            if entry is None:
+                continue
+            self._drop_l1(key)
+            await self._remove_from_indexes(key)
+        if expired:
+            self.stats["invalidations"] += len(expired)
+        return len(expired)
+    
     async def _store_l1(
         self,
         key: str,
@@ -265,12 +764,28 @@ class AdvancedCacheManager:
         config: CacheConfig,
         ttl: Optional[int] = None,
         tags: Optional[List[str]] = None,
-        dependencies: Optional[List[str]] = None
+        dependencies: Optional[List[str]] = None,
+        pattern: Optional[str] = None
     ):
         """Store in L1 cache with size management."""
-        # Check size limits
-        if config.max_size and len(self.l1_cache) >= config.max_size:
-            await self._evict_l1(config.invalidation)
+        self._drop_l1(key)
+        partition = self._partition(pattern)
+        if config.compression:
+            # Kept encoded; decoded again on every hit
+            value = self._codec(config).encode(value)
+            self.stats["compressions"] += 1
+            size_bytes = len(value)
+        else:
+            size_bytes = estimate_size(value) if partition.max_bytes else None
+        if size_bytes and partition.max_bytes and size_bytes > partition.max_bytes:
+            # A single value larger than the whole budget is not kept in L1
+            return
+        
+        # Check size limits, reclaiming expired entries before live ones
+        if partition.needs_room(size_bytes or 0):
+            await self._expire_l1()
+            while len(partition.policy) and partition.needs_room(size_bytes or 0):
+                await self._evict_l1(partition)
         
         # Create cache entry
         entry = CacheEntry(
@@ -282,83 +797,89 @@ class AdvancedCacheManager:
             ttl=ttl or config.ttl,
             tags=tags or [],
             dependencies=dependencies or [],
+            size_bytes=size_bytes,
             compressed=config.compression,
-            encrypted=config.encryption
+            encrypted=config.encryption,
+            pattern=pattern
         )
         
         self.l1_cache[key] = entry
+        partition.policy.add(key)
+        partition.bytes += size_bytes or 0
+        if entry.expires_at is not None:
+            # Entries that may be served stale are kept until their stale window ends
+            self.l1_expiry.push(key, entry.expires_at + timedelta(seconds=config.stale_ttl))
     
-    async def _evict_l1(self, strategy: InvalidationStrategy):
-        """Evict entries from L1 cache based on strategy."""
-        if strategy == InvalidationStrategy.LRU:
-            # Remove least recently used
-            oldest_key = min(self.l1_cache.keys(), key=lambda k: self.l1_cache[k].last_accessed)
-            del self.l1_cache[oldest_key]
-        elif strategy == InvalidationStrategy.LFU:
-            # Remove least frequently used
-            least_used_key = min(self.l1_cache.keys(), key=lambda k: self.l1_cache[k].access_count)
-            del self.l1_cache[least_used_key]
-        else:
-            # Default: remove oldest
-            oldest_key = min(self.l1_cache.keys(), key=lambda k: self.l1_cache[k].created_at)
-            del self.l1_cache[oldest_key]
+    async def _evict_l1(self, partition: L1Partition):
+        """Evict one entry from an L1 partition according to its policy."""
+        key = partition.policy.victim()
+        if key is None:
+            return
+        entry = self._drop_l1(key)
+        config = self.cache_configs.get(entry.pattern if entry else None, CacheConfig())
+        if CacheLevel.L2_REDIS not in config.levels:
+            # Nothing else holds the key, so its index entries are dead too
+            await self._remove_from_indexes(key)
         
         self.stats["evictions"] += 1
     
-    def _deserialize_value(self, value: Any, compressed: bool, encrypted: bool) -> Any:
+    def _deserialize_value(
+        self,
+        value: Any,
+        compressed: bool,
+        encrypted: bool,
+        model: Optional[Type[BaseModel]] = None
+    ) -> Any:
         """Deserialize value with decompression and decryption."""
         if not compressed and not encrypted:
             return value
         
-        # For now, just return the value since we're not doing actual compression/encryption
+        if compressed:
+            # The header byte says how the value was encoded
+            self.stats["decompressions"] += 1
+            value = decode(value, model)
+        
+        # Encryption is not implemented yet, so encrypted values are stored as-is
         return value
     
     async def _update_indexes(self, key: str, tags: List[str], dependencies: List[str]):
         """Update tag and dependency indexes."""
         # Update tag index
         for tag in tags:
-            if tag not in self.tag_index:
-                self.tag_index[tag] = []
-            if key not in self.tag_index[tag]:
-                self.tag_index[tag].append(key)
+            self.tag_index.setdefault(tag, set()).add(key)
+        if tags:
+            self.key_tags.setdefault(key, set()).update(tags)
         
         # Update dependency graph
         for dep in dependencies:
-            if dep not in self.dependency_graph:
-                self.dependency_graph[dep] = []
-            if key not in self.dependency_graph[dep]:
-                self.dependency_graph[dep].append(key)
+            self.dependency_graph.setdefault(dep, set()).add(key)
+        if dependencies:
+            self.key_dependencies.setdefault(key, set()).update(dependencies)
     
     async def _remove_from_indexes(self, key: str):
         """Remove key from all indexes."""
         # Remove from tag index
-        for tag, keys in self.tag_index.items():
-            if key in keys:
-                keys.remove(key)
+        for tag in self.key_tags.pop(key, ()):
+            keys = self.tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.tag_index[tag]
         
         # Remove from dependency graph
-        for dep, keys in self.dependency_graph.items():
-            if key in keys:
-                keys.remove(key)
+        for dep in self.key_dependencies.pop(key, ()):
+            keys = self.dependency_graph.get(dep)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.dependency_graph[dep]
     
     async def _cleanup_loop(self):
         """Background cleanup loop for expired entries."""
         while True:
             try:
-                expired_keys = []
-                
-                # Check L1 cache for expired entries
-                for key, entry in self.l1_cache.items():
-                    if entry.is_expired():
-                        expired_keys.append(key)
-                
-                # Remove expired entries
-                for key in expired_keys:
-                    del self.l1_cache[key]
-                    await self._remove_from_indexes(key)
-                
-                if expired_keys:
-                    self.stats["invalidations"] += len(expired_keys)
+                # Remove expired L1 entries
+                await self._expire_l1()
                 
                 # Sleep for cleanup interval
                 await asyncio.sleep(300)  # 5 minutes
@@ -392,6 +913,11 @@ class AdvancedCacheManager:
             "total_requests": total_requests,
             "hit_rate_percent": hit_rate,
             "l1_size": len(self.l1_cache),
+            "l1_bytes": sum(partition.bytes for partition in self.l1_partitions.values()),
+            "inflight": len(self._inflight),
+            "write_behind_pending": len(self._write_buffer),
+            "l2_circuit": self.l2_breaker.get_stats(),
+            "invalidation_bus": self.invalidation_bus.get_stats() if self.invalidation_bus else None,
             "tag_count": len(self.tag_index),
             "dependency_count": len(self.dependency_graph)
         }
@@ -419,23 +945,15 @@ def cached(
                 key_parts.extend(f"{k}={v}" for k, v in sorted(kwargs.items()))
                 cache_key = hashlib.md5(":".join(key_parts).encode()).hexdigest()
             
-            # Try to get from cache
-            cached_result = await advanced_cache.get(cache_key, pattern=pattern)
-            if cached_result is not None:
-                return cached_result
-            
-            # Execute function and cache result
-            result = await func(*args, **kwargs)
-            await advanced_cache.set(
+            # Concurrent calls with the same key share one execution
+            return await advanced_cache.get(
                 cache_key,
-                result,
                 pattern=pattern,
+                fallback=functools.partial(func, *args, **kwargs),
                 ttl=ttl,
                 tags=tags,
                 dependencies=dependencies
             )
-            
-            return result
         
         def sync_wrapper(*args, **kwargs):
             # For sync functions, return original function
@@ -461,4 +979,7 @@ async def cache_context(pattern: str, config: CacheConfig):
 
 
 # Global advanced cache manager instance
-advanced_cache = AdvancedCacheManager()
\ No newline at end of file
+advanced_cache = AdvancedCacheManager(
+    invalidation_bus=InvalidationBus(channel=settings.CACHE_INVALIDATION_CHANNEL)
+    if settings.CACHE_INVALIDATION_ENABLED else None
+)
\ No newline at end of file
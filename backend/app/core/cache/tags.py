@@ -0,0 +1,14 @@
+"""
+Cache tags for the data sources that cached results are derived from.
+
+Results computed from the service registry or the retrieval indexes are
+stored under these tags, and the code that rebuilds a source invalidates its
+tag so no stale result outlives the rebuild.
+"""
+
+SERVICE_REGISTRY_TAG = "source:service_registry"
+
+
+def index_tag(source: str) -> str:
+    """Tag for results derived from a retrieval index ("api" or "document")."""
+    return f"source:index:{source}"
@@ -4,12 +4,15 @@ Redis caching and session management system.
 import json
 import pickle
 from datetime import datetime, timedelta
-from typing import Any, Optional, Union, Dict
+from typing import TYPE_CHECKING, Any, Optional, Union, Dict, List, Tuple, Type
 import redis.asyncio as redis
 from pydantic import BaseModel
 
 from app.core.config import settings
 
+if TYPE_CHECKING:
+    from app.core.cache.codecs import CacheCodec
+
 
 class CacheManager:
     """Redis-based cache manager for the application."""
@@ -17,6 +20,9 @@ class CacheManager:
     def __init__(self, redis_url: str = None):
         self.redis_url = redis_url or settings.redis_url
         self.redis: Optional[redis.Redis] = None
+        # Codec-encoded values are raw bytes, so they use their own client
+        # without decode_responses
+        self.binary_redis: Optional[redis.Redis] = None
         
     async def connect(self):
         """Connect to Redis."""
@@ -26,51 +32,92 @@ class CacheManager:
                 encoding="utf-8",
                 decode_responses=True
             )
+        if not self.binary_redis:
+            self.binary_redis = redis.from_url(self.redis_url)
             
     async def disconnect(self):
         """Disconnect from Redis."""
         if self.redis:
             await self.redis.close()
+        if self.binary_redis:
+            await self.binary_redis.close()
             
     async def set(
         self,
         key: str,
         value: Any,
         expire: Optional[Union[int, timedelta]] = None,
-        prefix: str = "cache"
+        prefix: str = "cache",
+        codec: Optional["CacheCodec"] = None
     ) -> bool:
-        """Set a value in cache with optional expiration."""
+        """
+        Set a value in cache with optional expiration. With a ``codec`` the
+        value is stored as self-describing binary instead of JSON text.
+        """
         await self.connect()
         
         full_key = f"{prefix}:{key}"
-        
-        # Serialize the value
-        if isinstance(value, (dict, list, BaseModel)):
-            if isinstance(value, BaseModel):
-                serialized_value = value.model_dump_json()
-            else:
-                serialized_value = json.dumps(value)
-        else:
-            serialized_value = str(value)
+        client = self.binary_redis if codec else self.redis
+        serialized_value = codec.encode(value) if codec else self._serialize(value)
             
         # Set the value
         if expire:
             if isinstance(expire, timedelta):
                 expire = int(expire.total_seconds())
-            return await self.redis.setex(full_key, expire, serialized_value)
+            return await client.setex(full_key, expire, serialized_value)
         else:
-            return await self.redis.set(full_key, serialized_value)
+            return await client.set(full_key, serialized_value)
+    
+    @staticmethod
+    def _serialize(value: Any) -> str:
+        """Serialize a value the way set() stores it."""
+        if isinstance(value, BaseModel):
+            return value.model_dump_json()
+        if isinstance(value, (dict, list)):
+            return json.dumps(value)
+        return str(value)
+    
+    async def set_many(
+        self,
+        items: List[Tuple[str, Any, Optional[int]]],
+        prefix: str = "cache",
+        codec: Optional["CacheCodec"] = None
+    ) -> int:
+        """Set several (key, value, expire) items in one pipelined round-trip."""
+        if not items:
+            return 0
+        await self.connect()
+        
+        client = self.binary_redis if codec else self.redis
+        serialize = codec.encode if codec else self._serialize
+        pipeline = client.pipeline(transaction=False)
+        for key, value, expire in items:
+            full_key = f"{prefix}:{key}"
+            if expire:
+                pipeline.setex(full_key, int(expire), serialize(value))
+            else:
+                pipeline.set(full_key, serialize(value))
+        await pipeline.execute()
+        return len(items)
             
     async def get(
         self,
         key: str,
         prefix: str = "cache",
-        default: Any = None
+        default: Any = None,
+        codec: Optional["CacheCodec"] = None,
+        model: Optional[Type[BaseModel]] = None
     ) -> Any:
-        """Get a value from cache."""
+        """
+        Get a value from cache. Values written with a codec must be read with
+        one; ``model`` rebuilds a pydantic model from the decoded value.
+        """
         await self.connect()
         
         full_key = f"{prefix}:{key}"
+        if codec:
+            value = await self.binary_redis.get(full_key)
+            return default if value is None else codec.decode(value, model=model)
         value = await self.redis.get(full_key)
         
         if value is None:
@@ -22,6 +22,16 @@ class Settings(BaseSettings):
     redis_url: str = "redis://localhost:6379"
     redis_password: Optional[str] = None
     
+    # Cross-process L1 cache invalidation over Redis pub/sub
+    CACHE_INVALIDATION_ENABLED: bool = True
+    CACHE_INVALIDATION_CHANNEL: str = "cache:invalidate"
+    
+    # Binary cache codec ("orjson", "msgpack" or "json"; compressor "zstd",
+    # "lz4", "zlib" or "none", applied to payloads above the threshold in bytes)
+    CACHE_SERIALIZER: str = "orjson"
+    CACHE_COMPRESSOR: str = "zstd"
+    CACHE_COMPRESSION_THRESHOLD: int = 1024
+    
     # Authentication
     secret_key: str = "your-secret-key-change-in-production"
     access_token_expire_minutes: int = 60 * 24 * 7  # 7 days
@@ -41,7 +51,44 @@ class Settings(BaseSettings):
     EMBEDDING_MODEL: str = "BAAI/bge-m3"
     CROSS_ENCODER_MODEL: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"
     MODEL_CACHE_DIR: str = os.path.expanduser("~/.cache/huggingface")
+    # Load models at startup. Lazy loading would run the first queries' model
+    # loads inside the RETRIEVAL_*_TIMEOUT_S leg timeouts, so keep this on for
+    # serving workers; turn it off for scripts that never query.
+    WARMUP_MODELS: bool = True
+    EMBEDDING_BATCH_SIZE: int = 32
+    EMBEDDING_WORKERS: int = 1
+
+    # Document Vector Index ("flat", "ivf_flat", "hnsw", "ivf_pq";
+    # quantization "none", "fp16", "int8")
+    DOCUMENT_INDEX_TYPE: str = "flat"
+    DOCUMENT_INDEX_QUANTIZATION: str = "none"
+    DOCUMENT_IVF_NLIST: int = 256
+    DOCUMENT_HNSW_M: int = 32
+    DOCUMENT_PQ_M: int = 64
+    DOCUMENT_SEARCH_NPROBE: int = 16
+    DOCUMENT_SEARCH_EF: int = 64
+    QUERY_EMBEDDING_CACHE_SIZE: int = 1024
+
+    # API First Stage ("bm25" or "bitmap" token-hit counting)
+    API_FIRST_STAGE: str = "bm25"
+    BM25_K1: float = 1.2
+    BM25_B: float = 0.75
+
+    # API Reranking
+    API_RERANK_CANDIDATES: int = 20
+    RERANK_TEXT_MAX_CHARS: int = 512
+    RERANK_CACHE_SIZE: int = 10000
+    RERANK_MAX_BATCH_SIZE: int = 64
+    RERANK_MAX_WAIT_MS: float = 5.0
     
+    # Retrieval Fusion ("rrf" or "weighted"; weights are API, document)
+    FUSION_METHOD: str = "rrf"
+    FUSION_RRF_K: int = 60
+    FUSION_WEIGHTS: list = [1.0, 1.0]
+    FUSION_TOP_K: int = 10
+    RETRIEVAL_API_TIMEOUT_S: float = 5.0
+    RETRIEVAL_DOCUMENT_TIMEOUT_S: float = 5.0
+
     # API Configuration
     api_host: str = "0.0.0.0"
     api_port: int = 8000
@@ -13,6 +13,8 @@ from app.core.events import event_publisher
 from app.core.websocket import websocket_manager
 from app.core.progress import progress_manager
 from app.core.database import create_db_and_tables
+from app.core.config import settings
+from app.core.model_registry import model_registry
 
 
 @asynccontextmanager
@@ -53,6 +55,11 @@ async def lifespan(app: FastAPI):
         
         print(f"✅ Workers started: {worker1_id}, {worker2_id}")
         
+        # Optionally load retrieval models now rather than on the first query
+        if settings.WARMUP_MODELS:
+            print("🧠 Warming up retrieval models...")
+            await model_registry.awarmup()
+        
         # Schedule periodic tasks
         print("⏰ Scheduling periodic maintenance tasks...")
         await tasks.schedule_periodic_tasks()
@@ -211,7 +211,7 @@ Return only the question text.
             return f"Let's continue with the next step for {service_name}."
         
         try:
-            response = await self.llm_service.generate_response(prompt, self.system_prompt)
+            response = await self.llm_service.generate_response(prompt, self.system_prompt, temperature=0.0)
             return response.strip()
         except Exception as e:
             # Fallback to static questions
@@ -233,7 +233,7 @@ Example format: ["incident", "ticket", "issue", "problem", "request"]
 """
         
         try:
-            response = await self.llm_service.generate_response(prompt, self.system_prompt)
+            response = await self.llm_service.generate_response(prompt, self.system_prompt, temperature=0.0)
             # Try to parse as JSON
             keywords = json.loads(response.strip())
             return keywords if isinstance(keywords, list) else []
@@ -294,7 +294,7 @@ Analyze the response and return a JSON object with:
 """
         
         try:
-            response = await self.llm_service.generate_response(prompt, self.system_prompt)
+            response = await self.llm_service.generate_response(prompt, self.system_prompt, temperature=0.0)
             return json.loads(response.strip())
         except Exception:
             # Fallback classification
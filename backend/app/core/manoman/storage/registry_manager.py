@@ -22,6 +22,7 @@ from ..models.service_registry import (
     ConflictReport
 )
 from ..engines.conflict_detector import ConflictDetector
+from ...cache import SERVICE_REGISTRY_TAG, advanced_cache
 
 logger = logging.getLogger(__name__)
 
@@ -144,6 +145,9 @@ class RegistryManager:
             # Cache current registry
             self.current_registry = registry
             
+            # Drop cached results derived from the previous registry
+            await advanced_cache.invalidate_tags([SERVICE_REGISTRY_TAG])
+            
             logger.info(f"Successfully saved registry version {version} with {len(registry.services)} services")
             return version
             
@@ -0,0 +1,19 @@
+"""Shared, lazily loaded ML models for Augment AI Platform."""
+
+from .registry import (
+    CROSS_ENCODER,
+    EMBEDDINGS,
+    LazyModel,
+    ModelRegistry,
+    model_registry,
+    resident_memory_bytes
+)
+
+__all__ = [
+    "CROSS_ENCODER",
+    "EMBEDDINGS",
+    "LazyModel",
+    "ModelRegistry",
+    "model_registry",
+    "resident_memory_bytes"
+]
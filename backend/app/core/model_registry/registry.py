@@ -0,0 +1,160 @@
+"""
+Process-wide registry of the ML models used by retrieval and indexing.
+
+Models are registered as factories and loaded on first use, so importing the
+retrieval endpoints (or building an agent) no longer loads bge-m3 and the
+cross-encoder eagerly, and every retriever, indexer and agent in the process
+shares a single instance of each model. Loads are serialized, which keeps
+the resident-memory delta recorded for each model meaningful.
+"""
+
+import asyncio
+import os
+import resource
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from app.core.config import settings
+
+EMBEDDINGS = "embeddings"
+CROSS_ENCODER = "cross_encoder"
+
+
+def resident_memory_bytes() -> int:
+    """
+    Returns the current resident set size of the process (the peak RSS where
+    /proc is unavailable).
+    """
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class ModelRegistry:
+    """
+    Lazily loads and shares named models across the process.
+    """
+
+    def __init__(self):
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._models: Dict[str, Any] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._load_lock = threading.Lock()
+
+    def register(self, name: str, factory: Callable[[], Any]):
+        """
+        Registers (or replaces) the factory for a model, dropping any
+        instance loaded from the previous factory.
+        """
+        with self._load_lock:
+            self._factories[name] = factory
+            self._models.pop(name, None)
+            self._stats[name] = {"loaded": False, "load_seconds": None, "memory_bytes": None, "error": None}
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._models
+
+    def get(self, name: str) -> Any:
+        """
+        Returns the shared instance of a model, loading it on first use.
+        """
+        model = self._models.get(name)
+        if model is not None:
+            return model
+        if name not in self._factories:
+            raise KeyError(f"No model registered under '{name}'")
+
+        with self._load_lock:
+            model = self._models.get(name)
+            if model is not None:
+                return model
+
+            print(f"Loading model '{name}'...")
+            memory_before = resident_memory_bytes()
+            start = time.perf_counter()
+            try:
+                model = self._factories[name]()
+            except Exception as e:
+                self._stats[name]["error"] = str(e)
+                raise
+            load_seconds = time.perf_counter() - start
+            memory_bytes = max(0, resident_memory_bytes() - memory_before)
+
+            self._models[name] = model
+            self._stats[name] = {
+                "loaded": True,
+                "load_seconds": round(load_seconds, 3),
+                "memory_bytes": memory_bytes,
+                "error": None,
+            }
+            print(f"Loaded model '{name}' in {load_seconds:.2f}s (+{memory_bytes / 2**20:.1f} MiB resident).")
+            return model
+
+    def lazy(self, name: str) -> "LazyModel":
+        """
+        Returns a proxy that resolves to the shared model on first attribute access.
+        """
+        return LazyModel(self, name)
+
+    def warmup(self, names: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Loads the given models (all registered models by default), logging
+        rather than raising on failures. Returns the registry stats.
+        """
+        for name in list(names if names is not None else self._factories):
+            try:
+                self.get(name)
+            except Exception as e:
+                print(f"Warning: could not warm up model '{name}': {e}")
+        return self.get_stats()
+
+    async def awarmup(self, names: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Async variant of ``warmup`` that loads models in a worker thread.
+        """
+        return await asyncio.to_thread(self.warmup, names)
+
+    def unload(self, name: str):
+        with self._load_lock:
+            self._models.pop(name, None)
+            if name in self._stats:
+                self._stats[name]["loaded"] = False
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns per-model load state, load time and resident-memory delta.
+        """
+        return {name: dict(stats) for name, stats in self._stats.items()}
+
+
+class LazyModel:
+    """
+    Attribute-forwarding proxy for a registry model, for call sites that are
+    handed a model object at construction but only use it later.
+    """
+
+    def __init__(self, registry: ModelRegistry, name: str):
+        self._registry = registry
+        self._name = name
+
+    def __getattr__(self, attribute: str):
+        return getattr(self._registry.get(self._name), attribute)
+
+
+def _load_embeddings():
+    from langchain_huggingface import HuggingFaceEmbeddings
+    return HuggingFaceEmbeddings(model_name=settings.EMBEDDING_MODEL)
+
+
+def _load_cross_encoder():
+    from sentence_transformers import CrossEncoder
+    return CrossEncoder(settings.CROSS_ENCODER_MODEL)
+
+
+# Singleton instance
+model_registry = ModelRegistry()
+model_registry.register(EMBEDDINGS, _load_embeddings)
+model_registry.register(CROSS_ENCODER, _load_cross_encoder)
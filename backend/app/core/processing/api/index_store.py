@@ -0,0 +1,457 @@
+"""
+On-disk format for the API retrieval index.
+
+Each build is written to its own directory under ``<index_dir>/builds/`` and
+published by atomically rewriting ``<index_dir>/CURRENT``, so readers in other
+worker processes never see a half-written index. Every artifact is laid out
+so it can be memory-mapped and shared through the OS page cache instead of
+being unpickled into each process:
+
+    manifest.json            format version, document count, build metadata
+    postings.bin             serialized roaring bitmaps, concatenated
+    postings_offsets.json    token -> [offset, length] into postings.bin
+    tfidf_vocabulary.json    TF-IDF term -> column index
+    tfidf_idf.npy            TF-IDF idf weights
+    tfidf_data.npy           CSR data of the TF-IDF matrix
+    tfidf_indices.npy        CSR column indices
+    tfidf_indptr.npy         CSR row pointers
+    docs.jsonl               one endpoint JSON document per line
+    docs_offsets.npy         byte offsets of each docs.jsonl line (n + 1)
+    rerank_texts.jsonl       one cross-encoder text per line
+    rerank_texts_offsets.npy byte offsets of each rerank_texts.jsonl line
+    doc_states.jsonl         endpoint identity, content hash, tokens and token counts per doc
+    doc_states_offsets.npy   byte offsets of each doc_states.jsonl line
+    tf_data.npy              CSR data of the raw term-count matrix
+    tf_indices.npy           CSR column indices
+    tf_indptr.npy            CSR row pointers
+    tfidf_df.npy             document frequency per TF-IDF term
+    stem_table.json          word -> stem table of the build's vocabulary
+    bm25_doc_ids.npy         BM25 postings doc_ids (uint32), each token's run contiguous
+    bm25_tfs.npy             term frequency per posting (uint16)
+    bm25_offsets.json        token -> [start, end] into the BM25 posting arrays
+    doc_lengths.npy          token count per doc (uint32), 0 for tombstones
+
+The doc_states and tf/df group is only read by ApiIndexer, to patch the
+previous build in incremental mode. The stem table warms the query and
+indexing tokenizers so known words are never re-stemmed. doc_ids are stable
+across incremental builds; a removed endpoint leaves a tombstone (``null``
+doc and state, empty rows) that is listed in the manifest under
+``deleted_doc_ids`` and reused by later adds.
+"""
+
+import json
+import mmap
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+from pyroaring import BitMap as Roaring
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+INDEX_FORMAT_VERSION = 3
+CURRENT_FILE = "CURRENT"
+BUILDS_DIR = "builds"
+KEEP_BUILDS = 2
+
+
+class IndexFormatError(Exception):
+    """Raised when an on-disk API index is missing or has an unsupported format."""
+    pass
+
+
+def _map_file(path: str) -> Optional[mmap.mmap]:
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class MappedJsonlStore:
+    """
+    Read-only, offset-indexed JSONL store. Records are decoded on access, so
+    only the documents actually returned by a query are materialized.
+    """
+
+    def __init__(self, data_path: str, offsets_path: str):
+        self._data = _map_file(data_path)
+        self._offsets = np.load(offsets_path, mmap_mode="r")
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __contains__(self, doc_id) -> bool:
+        return 0 <= int(doc_id) < len(self)
+
+    def __getitem__(self, doc_id):
+        doc_id = int(doc_id)
+        if not 0 <= doc_id < len(self):
+            raise KeyError(doc_id)
+        start, end = int(self._offsets[doc_id]), int(self._offsets[doc_id + 1])
+        return json.loads(self._data[start:end])
+
+    def get(self, doc_id, default=None):
+        return self[doc_id] if doc_id in self else default
+
+    def keys(self) -> Iterator[int]:
+        return iter(range(len(self)))
+
+    def items(self) -> Iterator[Tuple[int, object]]:
+        for doc_id in range(len(self)):
+            yield doc_id, self[doc_id]
+
+    @staticmethod
+    def write(data_path: str, offsets_path: str, records: Iterable):
+        offsets = [0]
+        with open(data_path, "wb") as f:
+            for record in records:
+                line = json.dumps(record, separators=(",", ":")).encode("utf-8") + b"\n"
+                f.write(line)
+                offsets.append(offsets[-1] + len(line))
+        np.save(offsets_path, np.asarray(offsets, dtype=np.int64))
+
+
+class MappedInvertedIndex:
+    """
+    Read-only roaring inverted index backed by a memory-mapped postings file.
+
+    Bitmaps are deserialized on first access and kept in a bounded LRU, so
+    each process only holds the posting lists its queries actually touch.
+    """
+
+    def __init__(self, postings_path: str, offsets_path: str, cache_size: int = 4096):
+        self._data = _map_file(postings_path)
+        with open(offsets_path, "r") as f:
+            self._offsets: Dict[str, Tuple[int, int]] = json.load(f)
+        self._cache: "OrderedDict[str, Roaring]" = OrderedDict()
+        self._cache_size = cache_size
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __contains__(self, token: str) -> bool:
+        return token in self._offsets
+
+    def __getitem__(self, token: str) -> Roaring:
+        bitmap = self.get(token)
+        if bitmap is None:
+            raise KeyError(token)
+        return bitmap
+
+    def keys(self):
+        return self._offsets.keys()
+
+    def get(self, token: str, default=None):
+        with self._lock:
+            bitmap = self._cache.get(token)
+            if bitmap is not None:
+                self._cache.move_to_end(token)
+                return bitmap
+
+        location = self._offsets.get(token)
+        if location is None:
+            return default
+        offset, length = location
+        bitmap = Roaring.deserialize(self._data[offset:offset + length])
+
+        with self._lock:
+            self._cache[token] = bitmap
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return bitmap
+
+    @staticmethod
+    def write(postings_path: str, offsets_path: str, inverted_index: Dict[str, Roaring]):
+        offsets = {}
+        position = 0
+        with open(postings_path, "wb") as f:
+            for token in sorted(inverted_index):
+                payload = inverted_index[token].serialize()
+                f.write(payload)
+                offsets[token] = [position, len(payload)]
+                position += len(payload)
+        with open(offsets_path, "w") as f:
+            json.dump(offsets, f)
+
+
+class BM25Postings:
+    """
+    Term frequencies and document lengths for BM25 scoring, as flat arrays.
+
+    Each token's postings are a contiguous, doc_id-sorted run of
+    ``doc_ids`` / ``tfs``; ``offsets`` maps the token to its run.
+    """
+
+    def __init__(self, doc_ids: np.ndarray, tfs: np.ndarray, doc_lengths: np.ndarray, offsets: Dict[str, Tuple[int, int]]):
+        self.doc_ids = doc_ids
+        self.tfs = tfs
+        self.doc_lengths = doc_lengths
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __contains__(self, token: str) -> bool:
+        return token in self.offsets
+
+    def postings(self, token: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Returns the (doc_ids, tfs) run of a token, or None if it is not indexed.
+        """
+        span = self.offsets.get(token)
+        if span is None:
+            return None
+        start, end = span
+        return self.doc_ids[start:end], self.tfs[start:end]
+
+    @classmethod
+    def from_doc_states(cls, doc_states: List[Optional[dict]]) -> "BM25Postings":
+        """
+        Builds the postings from per-doc ``tokens`` and aligned ``counts``
+        (a count of 1 is assumed when a state has no counts).
+        """
+        runs: Dict[str, Tuple[List[int], List[int]]] = {}
+        doc_lengths = np.zeros(len(doc_states), dtype=np.uint32)
+        for doc_id, state in enumerate(doc_states):
+            if state is None:
+                continue
+            counts = state.get("counts") or [1] * len(state["tokens"])
+            for token, count in zip(state["tokens"], counts):
+                ids, tfs = runs.setdefault(token, ([], []))
+                ids.append(doc_id)
+                tfs.append(count)
+            doc_lengths[doc_id] = sum(counts)
+
+        offsets = {}
+        position = 0
+        for token, (ids, _) in runs.items():
+            offsets[token] = (position, position + len(ids))
+            position += len(ids)
+        doc_ids = np.fromiter((doc_id for ids, _ in runs.values() for doc_id in ids), dtype=np.uint32, count=position)
+        tfs = np.fromiter(
+            (min(tf, np.iinfo(np.uint16).max) for _, run_tfs in runs.values() for tf in run_tfs),
+            dtype=np.uint16,
+            count=position,
+        )
+        return cls(doc_ids, tfs, doc_lengths, offsets)
+
+    @classmethod
+    def load(cls, build_dir: str) -> "BM25Postings":
+        with open(os.path.join(build_dir, "bm25_offsets.json"), "r") as f:
+            offsets = {token: tuple(span) for token, span in json.load(f).items()}
+        return cls(
+            np.load(os.path.join(build_dir, "bm25_doc_ids.npy"), mmap_mode="r"),
+            np.load(os.path.join(build_dir, "bm25_tfs.npy"), mmap_mode="r"),
+            np.load(os.path.join(build_dir, "doc_lengths.npy"), mmap_mode="r"),
+            offsets,
+        )
+
+    def save(self, build_dir: str):
+        np.save(os.path.join(build_dir, "bm25_doc_ids.npy"), self.doc_ids)
+        np.save(os.path.join(build_dir, "bm25_tfs.npy"), self.tfs)
+        np.save(os.path.join(build_dir, "doc_lengths.npy"), self.doc_lengths)
+        with open(os.path.join(build_dir, "bm25_offsets.json"), "w") as f:
+            json.dump({token: list(span) for token, span in self.offsets.items()}, f)
+
+
+class ApiIndex:
+    """
+    A loaded, memory-mapped API index build.
+    """
+
+    def __init__(self, build_dir: str):
+        manifest_path = os.path.join(build_dir, "manifest.json")
+        if not os.path.exists(manifest_path):
+            raise IndexFormatError(f"No API index manifest found in {build_dir}")
+        with open(manifest_path, "r") as f:
+            self.manifest = json.load(f)
+        if self.manifest.get("format_version") != INDEX_FORMAT_VERSION:
+            raise IndexFormatError(
+                f"Unsupported API index format {self.manifest.get('format_version')} "
+                f"(expected {INDEX_FORMAT_VERSION})"
+            )
+
+        self.build_dir = build_dir
+        self.build_id = self.manifest["build_id"]
+        self.deleted_doc_ids = self.manifest.get("deleted_doc_ids", [])
+        self.inverted_index = MappedInvertedIndex(
+            os.path.join(build_dir, "postings.bin"),
+            os.path.join(build_dir, "postings_offsets.json"),
+        )
+        self.tfidf_vectorizer = self._load_vectorizer()
+        self.tfidf_matrix = sparse.csr_matrix(
+            (
+                np.load(os.path.join(build_dir, "tfidf_data.npy"), mmap_mode="r"),
+                np.load(os.path.join(build_dir, "tfidf_indices.npy"), mmap_mode="r"),
+                np.load(os.path.join(build_dir, "tfidf_indptr.npy"), mmap_mode="r"),
+            ),
+            shape=tuple(self.manifest["tfidf_shape"]),
+            copy=False,
+        )
+        self.docs = MappedJsonlStore(
+            os.path.join(build_dir, "docs.jsonl"),
+            os.path.join(build_dir, "docs_offsets.npy"),
+        )
+        self.rerank_texts = MappedJsonlStore(
+            os.path.join(build_dir, "rerank_texts.jsonl"),
+            os.path.join(build_dir, "rerank_texts_offsets.npy"),
+        )
+        self.bm25_postings = BM25Postings.load(build_dir)
+
+    @property
+    def stem_table(self) -> Dict[str, str]:
+        """
+        Returns the persisted word -> stem table, or an empty table.
+        """
+        path = os.path.join(self.build_dir, "stem_table.json")
+        if not os.path.exists(path):
+            return {}
+        with open(path, "r") as f:
+            return json.load(f)
+
+    def _load_vectorizer(self) -> TfidfVectorizer:
+        with open(os.path.join(self.build_dir, "tfidf_vocabulary.json"), "r") as f:
+            vocabulary = json.load(f)
+        vectorizer = TfidfVectorizer(vocabulary=vocabulary)
+        vectorizer.idf_ = np.load(os.path.join(self.build_dir, "tfidf_idf.npy"))
+        return vectorizer
+
+    def load_build_state(self):
+        """
+        Returns the per-document states, raw term-count matrix and document
+        frequencies needed to patch this build incrementally.
+        """
+        doc_states = MappedJsonlStore(
+            os.path.join(self.build_dir, "doc_states.jsonl"),
+            os.path.join(self.build_dir, "doc_states_offsets.npy"),
+        )
+        tf_matrix = sparse.csr_matrix(
+            (
+                np.load(os.path.join(self.build_dir, "tf_data.npy")),
+                np.load(os.path.join(self.build_dir, "tf_indices.npy")),
+                np.load(os.path.join(self.build_dir, "tf_indptr.npy")),
+            ),
+            shape=tuple(self.manifest["tfidf_shape"]),
+        )
+        df = np.load(os.path.join(self.build_dir, "tfidf_df.npy"))
+        return [state for _, state in doc_states.items()], tf_matrix, df
+
+
+def read_current_build_id(index_dir: str) -> Optional[str]:
+    """
+    Returns the id of the published build, or None if nothing was published.
+    """
+    try:
+        with open(os.path.join(index_dir, CURRENT_FILE), "r") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def load_api_index(index_dir: str) -> ApiIndex:
+    """
+    Opens the currently published API index build.
+    """
+    build_id = read_current_build_id(index_dir)
+    if build_id is None:
+        raise IndexFormatError(f"No API index has been published in {index_dir}")
+    return ApiIndex(os.path.join(index_dir, BUILDS_DIR, build_id))
+
+
+def write_api_index(
+    index_dir: str,
+    inverted_index: Dict[str, Roaring],
+    tfidf_vectorizer: TfidfVectorizer,
+    tfidf_matrix,
+    docs: Iterable,
+    rerank_texts: Iterable[str],
+    doc_states: List[Optional[dict]],
+    tf_matrix,
+    df: np.ndarray,
+    stem_table: Optional[Dict[str, str]] = None,
+    metadata: Optional[dict] = None,
+) -> str:
+    """
+    Writes a new index build and publishes it as CURRENT. Returns the build id.
+
+    ``doc_states`` holds one entry per doc_id, ``None`` marking a tombstone;
+    the BM25 postings are derived from its tokens and counts.
+    """
+    build_id = datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+    builds_root = os.path.join(index_dir, BUILDS_DIR)
+    build_dir = os.path.join(builds_root, build_id)
+    os.makedirs(build_dir)
+
+    MappedInvertedIndex.write(
+        os.path.join(build_dir, "postings.bin"),
+        os.path.join(build_dir, "postings_offsets.json"),
+        inverted_index,
+    )
+
+    tfidf_matrix = sparse.csr_matrix(tfidf_matrix)
+    np.save(os.path.join(build_dir, "tfidf_data.npy"), tfidf_matrix.data)
+    np.save(os.path.join(build_dir, "tfidf_indices.npy"), tfidf_matrix.indices)
+    np.save(os.path.join(build_dir, "tfidf_indptr.npy"), tfidf_matrix.indptr)
+    np.save(os.path.join(build_dir, "tfidf_idf.npy"), tfidf_vectorizer.idf_)
+    with open(os.path.join(build_dir, "tfidf_vocabulary.json"), "w") as f:
+        json.dump({term: int(column) for term, column in tfidf_vectorizer.vocabulary_.items()}, f)
+
+    tf_matrix = sparse.csr_matrix(tf_matrix)
+    np.save(os.path.join(build_dir, "tf_data.npy"), tf_matrix.data)
+    np.save(os.path.join(build_dir, "tf_indices.npy"), tf_matrix.indices)
+    np.save(os.path.join(build_dir, "tf_indptr.npy"), tf_matrix.indptr)
+    np.save(os.path.join(build_dir, "tfidf_df.npy"), df)
+    MappedJsonlStore.write(
+        os.path.join(build_dir, "doc_states.jsonl"),
+        os.path.join(build_dir, "doc_states_offsets.npy"),
+        doc_states,
+    )
+    BM25Postings.from_doc_states(doc_states).save(build_dir)
+
+    MappedJsonlStore.write(
+        os.path.join(build_dir, "docs.jsonl"),
+        os.path.join(build_dir, "docs_offsets.npy"),
+        docs,
+    )
+    MappedJsonlStore.write(
+        os.path.join(build_dir, "rerank_texts.jsonl"),
+        os.path.join(build_dir, "rerank_texts_offsets.npy"),
+        rerank_texts,
+    )
+
+    if stem_table:
+        with open(os.path.join(build_dir, "stem_table.json"), "w") as f:
+            json.dump(stem_table, f, separators=(",", ":"))
+
+    deleted_doc_ids = [doc_id for doc_id, state in enumerate(doc_states) if state is None]
+    manifest = {
+        "format_version": INDEX_FORMAT_VERSION,
+        "build_id": build_id,
+        "created_at": datetime.utcnow().isoformat(),
+        "num_docs": tfidf_matrix.shape[0] - len(deleted_doc_ids),
+        "num_tokens": len(inverted_index),
+        "tfidf_shape": list(tfidf_matrix.shape),
+        "deleted_doc_ids": deleted_doc_ids,
+        **(metadata or {}),
+    }
+    with open(os.path.join(build_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=4)
+
+    # Publish atomically, then drop builds no reader should still be opening
+    current_tmp = os.path.join(index_dir, CURRENT_FILE + ".tmp")
+    with open(current_tmp, "w") as f:
+        f.write(build_id)
+    os.replace(current_tmp, os.path.join(index_dir, CURRENT_FILE))
+    _prune_builds(builds_root, keep=KEEP_BUILDS)
+    return build_id
+
+
+def _prune_builds(builds_root: str, keep: int):
+    builds = sorted(os.listdir(builds_root))
+    for stale in builds[:-keep]:
+        shutil.rmtree(os.path.join(builds_root, stale), ignore_errors=True)
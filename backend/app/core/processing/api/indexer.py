@@ -1,88 +1,271 @@
+import hashlib
 import json
 import os
-import pickle
-from collections import defaultdict
+from collections import Counter
+import numpy as np
 from pyroaring import BitMap as Roaring
+from scipy import sparse
 from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.preprocessing import normalize
 
 from app.core.config import settings
 from .tokenizers import CanonicalTokenizer
+from .rerank_text import build_rerank_text
+from .index_store import IndexFormatError, load_api_index, write_api_index
 from app.core.state import state_manager, ProcessingStatus
 
+
+def endpoint_identity(endpoint: dict) -> str:
+    """
+    Returns the stable identity of an endpoint across spec re-ingests:
+    "METHOD path" when both are known, otherwise the operationId or path.
+    """
+    method = endpoint.get("method", "")
+    path = endpoint.get("path", "")
+    if method and path:
+        return f"{method.upper()} {path}"
+    return endpoint.get("operationId") or path
+
+
+def endpoint_hash(endpoint: dict) -> str:
+    """
+    Returns a content hash of an endpoint, used to detect changed endpoints.
+    """
+    payload = json.dumps(endpoint, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha1(payload).hexdigest()
+
+
 class ApiIndexer:
     def __init__(self):
         self.api_spec_path = settings.API_SPEC_PATH
         self.output_dir = os.path.join(settings.PROCESSED_DATA_DIR, "api")
         self.tokenizer = CanonicalTokenizer()
+        self.tfidf_analyzer = TfidfVectorizer().build_analyzer()
+
+    @staticmethod
+    def _endpoint_text(endpoint: dict) -> str:
+        path = endpoint.get("path", "")
+        operation_id = endpoint.get("operationId", "")
+        description = endpoint.get("description", "")
+        summary = endpoint.get("summary", "")
+        tags = " ".join(endpoint.get("tags", []))
+        return f"{path} {operation_id} {tags} {summary} {description}"
+
+    @staticmethod
+    def _index_terms(endpoint: dict, tokens):
+        """
+        Returns the sorted index tokens of an endpoint with their counts.
+        """
+        counts = Counter(tokens)
+        operation_id = endpoint.get("operationId", "")
+        if operation_id and operation_id not in counts:
+            counts[operation_id] = 1
+        return {token: counts[token] for token in sorted(counts)}
+
+    def _tokenize_endpoint(self, endpoint: dict):
+        """
+        Returns the sorted index tokens of an endpoint.
+        """
+        return list(self._index_terms(endpoint, self.tokenizer.tokenize(self._endpoint_text(endpoint))))
+
+    def _tokenize_endpoints(self, endpoints):
+        """
+        Returns the sorted index tokens and counts of each endpoint, stemming
+        every distinct word of the batch once.
+        """
+        token_lists = self.tokenizer.tokenize_many(self._endpoint_text(endpoint) for endpoint in endpoints)
+        return [self._index_terms(endpoint, tokens) for endpoint, tokens in zip(endpoints, token_lists)]
+
+    def _load_previous_build(self):
+        """
+        Returns the inverted index, vocabulary and build state of the published
+        build, or None if there is nothing usable to patch.
+        """
+        try:
+            previous = load_api_index(self.output_dir)
+        except IndexFormatError as e:
+            print(f"No previous API index to update incrementally ({e}); doing a full rebuild.")
+            return None
 
-    def index(self):
+        self.tokenizer.load_stem_table(previous.stem_table)
+        inverted_index = {token: Roaring(previous.inverted_index[token]) for token in previous.inverted_index.keys()}
+        vocabulary = dict(previous.tfidf_vectorizer.vocabulary)
+        doc_states, tf_matrix, df = previous.load_build_state()
+        return inverted_index, vocabulary, doc_states, tf_matrix, df
+
+    def index(self, incremental: bool = False, progress_callback=None):
         """
         Loads the API specification, processes it, and builds the
         TF-IDF and Roaring Bitmap indices.
+
+        In incremental mode the published build is patched instead: endpoints
+        are matched on their identity (method+path or operationId), and only
+        added or changed endpoints are re-tokenized. Their postings, term
+        counts and document frequencies are updated in place and IDF is
+        recomputed from the patched frequencies. Unchanged endpoints keep
+        their doc_id; removed ones leave a tombstone slot that later adds reuse.
+
+        ``progress_callback(phase, progress)`` is called as the "load",
+        "tokenize", "build" and "write" phases advance (progress is 0-100
+        within the phase).
         """
+        report = progress_callback or (lambda phase, progress: None)
         try:
             state_manager.set_status("api", ProcessingStatus.PROCESSING)
-            print(f"Indexing API spec from {self.api_spec_path}...")
+            print(f"Indexing API spec from {self.api_spec_path} ({'incremental' if incremental else 'full'})...")
             os.makedirs(self.output_dir, exist_ok=True)
 
             # 1. Load Raw Data
+            report("load", 0)
             with open(self.api_spec_path, 'r') as f:
                 api_spec = json.load(f)
 
-            # Data Processing
-            processed_docs = []
-            for i, endpoint in enumerate(api_spec):
-                path = endpoint.get("path", "")
-                operation_id = endpoint.get("operationId", "")
-                description = endpoint.get("description", "")
-                summary = endpoint.get("summary", "")
-                tags = " ".join(endpoint.get("tags", []))
-                full_text = f"{path} {operation_id} {tags} {summary} {description}"
-                tokens = self.tokenizer.tokenize(full_text)
-                
-                expanded_tokens = set(tokens)
-                if operation_id:
-                    expanded_tokens.add(operation_id)
-
-                processed_docs.append({
-                    "doc_id": i,
-                    "endpoint": endpoint,
-                    "tokens": list(expanded_tokens),
-                    "full_text_for_tfidf": " ".join(expanded_tokens)
-                })
-
-            # Build Inverted Index (Roaring Bitmaps)
-            inverted_index = defaultdict(Roaring)
-            for doc in processed_docs:
-                for token in doc["tokens"]:
-                    inverted_index[token].add(doc["doc_id"])
-
-            bitmap_index_path = os.path.join(self.output_dir, "bitmap_index.bin")
-            with open(bitmap_index_path, 'wb') as f:
-                pickle.dump(inverted_index, f)
-
-            # Build TF-IDF Index
-            tfidf_vectorizer = TfidfVectorizer()
-            tfidf_matrix = tfidf_vectorizer.fit_transform([doc['full_text_for_tfidf'] for doc in processed_docs])
-
-            tfidf_vectorizer_path = os.path.join(self.output_dir, "tfidf_vectorizer.pkl")
-            with open(tfidf_vectorizer_path, 'wb') as f:
-                pickle.dump(tfidf_vectorizer, f)
-            
-            tfidf_matrix_path = os.path.join(self.output_dir, "tfidf_matrix.pkl")
-            with open(tfidf_matrix_path, 'wb') as f:
-                pickle.dump(tfidf_matrix, f)
-
-            # Build Full-Text Cache
-            full_text_cache = {doc['doc_id']: doc['endpoint'] for doc in processed_docs}
-            full_text_cache_path = os.path.join(self.output_dir, "full_text_cache.pkl")
-            with open(full_text_cache_path, 'wb') as f:
-                pickle.dump(full_text_cache, f)
-
-            print("API spec indexing complete.")
+            previous = self._load_previous_build() if incremental else None
+            report("load", 100)
+            if previous is None:
+                inverted_index, vocabulary, old_states, old_tf, df = {}, {}, [], None, np.zeros(0, dtype=np.int64)
+            else:
+                inverted_index, vocabulary, old_states, old_tf, df = previous
+
+            # 2. Diff the spec against the previous doc states
+            report("tokenize", 0)
+            key_to_id = {state["key"]: doc_id for doc_id, state in enumerate(old_states) if state is not None}
+            doc_states = list(old_states)
+            docs = [None] * len(doc_states)
+            entries = []
+            seen_keys = Counter()
+            for endpoint in api_spec:
+                key = endpoint_identity(endpoint)
+                seen_keys[key] += 1
+                if seen_keys[key] > 1:
+                    key = f"{key}#{seen_keys[key]}"
+                entries.append((key, endpoint))
+
+            live_keys = {key for key, _ in entries}
+            removed_ids = sorted(doc_id for key, doc_id in key_to_id.items() if key not in live_keys)
+            free_ids = sorted(removed_ids + [doc_id for doc_id, state in enumerate(old_states) if state is None])
+            for doc_id in removed_ids:
+                doc_states[doc_id] = None
+
+            pending = []
+            added = 0
+            for key, endpoint in entries:
+                content_hash = endpoint_hash(endpoint)
+                doc_id = key_to_id.get(key)
+                if doc_id is None:
+                    added += 1
+                    if free_ids:
+                        doc_id = free_ids.pop(0)
+                    else:
+                        doc_id = len(doc_states)
+                        doc_states.append(None)
+                        docs.append(None)
+                elif old_states[doc_id]["hash"] == content_hash:
+                    docs[doc_id] = endpoint
+                    continue
+
+                docs[doc_id] = endpoint
+                pending.append((doc_id, key, content_hash, endpoint))
+
+            report("tokenize", 50)
+            updates = {}
+            term_counts = self._tokenize_endpoints([endpoint for _, _, _, endpoint in pending])
+            for (doc_id, key, content_hash, _), terms in zip(pending, term_counts):
+                doc_states[doc_id] = {
+                    "key": key,
+                    "hash": content_hash,
+                    "tokens": list(terms),
+                    "counts": list(terms.values()),
+                }
+                updates[doc_id] = doc_states[doc_id]
+
+            print(f"API spec diff: {added} added, {len(updates) - added} changed, {len(removed_ids)} removed, "
+                  f"{len(entries) - len(updates)} unchanged.")
+
+            report("tokenize", 100)
+
+            # 3. Patch the inverted index (Roaring Bitmaps)
+            report("build", 0)
+            touched_ids = set(updates) | set(removed_ids)
+            old_rows = [doc_id for doc_id in touched_ids if doc_id < len(old_states) and old_states[doc_id] is not None]
+            for doc_id in old_rows:
+                for token in old_states[doc_id]["tokens"]:
+                    inverted_index[token].discard(doc_id)
+            for doc_id, state in updates.items():
+                for token in state["tokens"]:
+                    inverted_index.setdefault(token, Roaring()).add(doc_id)
+            inverted_index = {token: bitmap for token, bitmap in inverted_index.items() if bitmap}
+
+            # 4. Patch term counts and document frequencies
+            update_counts = {}
+            for doc_id, state in updates.items():
+                counts = Counter(self.tfidf_analyzer(" ".join(state["tokens"])))
+                for term in counts:
+                    vocabulary.setdefault(term, len(vocabulary))
+                update_counts[doc_id] = counts
+
+            shape = (len(doc_states), len(vocabulary))
+            df = np.pad(df, (0, shape[1] - len(df)))
+            if old_tf is None:
+                tf_matrix = sparse.csr_matrix(shape, dtype=np.int64)
+            else:
+                indptr = np.pad(old_tf.indptr, (0, shape[0] - old_tf.shape[0]), mode="edge")
+                tf_matrix = sparse.csr_matrix((old_tf.data, old_tf.indices, indptr), shape=shape)
+                if old_rows:
+                    df -= np.asarray((tf_matrix[sorted(old_rows)] > 0).sum(axis=0)).ravel()
+                keep = np.ones(shape[0])
+                keep[list(touched_ids)] = 0
+                tf_matrix = sparse.diags(keep) @ tf_matrix
+
+            rows, cols, values = [], [], []
+            for doc_id, counts in update_counts.items():
+                for term, count in counts.items():
+                    rows.append(doc_id)
+                    cols.append(vocabulary[term])
+                    values.append(count)
+            updates_matrix = sparse.csr_matrix((values, (rows, cols)), shape=shape, dtype=np.int64)
+            df += np.asarray((updates_matrix > 0).sum(axis=0)).ravel()
+            tf_matrix = (tf_matrix + updates_matrix).astype(np.int64).tocsr()
+            tf_matrix.eliminate_zeros()
+
+            # 5. Recompute IDF and the TF-IDF matrix (smooth idf, l2 norm,
+            # matching TfidfVectorizer's defaults)
+            num_live_docs = sum(1 for state in doc_states if state is not None)
+            idf = np.log((1 + num_live_docs) / (1 + df)) + 1
+            tfidf_matrix = normalize(tf_matrix.multiply(idf).tocsr())
+            tfidf_vectorizer = TfidfVectorizer(vocabulary=vocabulary)
+            tfidf_vectorizer.idf_ = idf
+
+            report("build", 100)
+
+            # Write the memory-mapped index build, with the endpoint docs and
+            # the compact texts fed to the cross-encoder alongside it
+            report("write", 0)
+            build_id = write_api_index(
+                self.output_dir,
+                inverted_index=inverted_index,
+                tfidf_vectorizer=tfidf_vectorizer,
+                tfidf_matrix=tfidf_matrix,
+                docs=docs,
+                rerank_texts=(
+                    build_rerank_text(endpoint, settings.RERANK_TEXT_MAX_CHARS) if endpoint is not None else ""
+                    for endpoint in docs
+                ),
+                doc_states=doc_states,
+                tf_matrix=tf_matrix,
+                df=df,
+                stem_table=self.tokenizer.export_stem_table(
+                    self._endpoint_text(endpoint) for endpoint in docs if endpoint is not None
+                ),
+                metadata={"source": self.api_spec_path, "incremental": previous is not None},
+            )
+
+            report("write", 100)
+
+            print(f"API spec indexing complete (build {build_id}).")
             state_manager.set_status("api", ProcessingStatus.READY)
             return True
         except Exception as e:
             print(f"Error during API spec indexing: {e}")
             state_manager.set_status("api", ProcessingStatus.ERROR)
-            return False
\ No newline at end of file
+            return False
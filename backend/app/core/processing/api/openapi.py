@@ -0,0 +1,35 @@
+from typing import Dict, List
+
+import yaml
+
+HTTP_METHODS = ("get", "post", "put", "patch", "delete")
+
+
+def flatten_openapi_spec(spec: dict) -> List[Dict]:
+    """
+    Flattens an OpenAPI document into the endpoint list ApiIndexer expects.
+    """
+    endpoints = []
+    for path, operations in spec.get("paths", {}).items():
+        for method, operation in operations.items():
+            if method not in HTTP_METHODS:
+                continue
+            endpoints.append({
+                "path": path,
+                "method": method.upper(),
+                "operationId": operation.get("operationId", ""),
+                "summary": operation.get("summary", ""),
+                "description": operation.get("description", ""),
+                "tags": operation.get("tags", []),
+            })
+    return endpoints
+
+
+def load_openapi_endpoints(spec_path) -> List[Dict]:
+    """
+    Reads a YAML or JSON OpenAPI document and returns its flattened endpoints.
+    """
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with open(spec_path, "r", encoding="utf-8") as f:
+        spec = yaml.load(f, Loader=loader)
+    return flatten_openapi_spec(spec)
@@ -0,0 +1,17 @@
+def build_rerank_text(endpoint: dict, max_chars: int) -> str:
+    """
+    Builds the compact text the cross-encoder sees for an endpoint.
+
+    Only the fields that describe what the endpoint does are kept, in order of
+    importance, and the result is truncated to ``max_chars`` so every pair fits
+    comfortably within the cross-encoder's input window.
+    """
+    parts = [
+        f"{endpoint.get('method', '')} {endpoint.get('path', '')}".strip(),
+        endpoint.get("operationId", ""),
+        " ".join(endpoint.get("tags", [])),
+        endpoint.get("summary", ""),
+        endpoint.get("description", ""),
+    ]
+    text = " | ".join(part.strip() for part in parts if part and part.strip())
+    return text[:max_chars]
@@ -1,15 +1,91 @@
 import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
 from nltk.stem import PorterStemmer
 
+# Split on non-alphanumeric characters and camelCase boundaries
+TOKEN_PATTERN = re.compile(r'[\W_]+|(?<=[a-z])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])')
+
+
 class CanonicalTokenizer:
-    def __init__(self):
+    """
+    Splits text on non-alphanumeric characters and camelCase, lowercases and
+    Porter-stems each token.
+
+    Stemming dominates tokenization cost, and the vocabulary of an API spec is
+    small and repetitive, so stems are memoized per raw token in a bounded LRU
+    cache shared by the indexing and query threads. A precomputed word -> stem
+    table, persisted with the API index, can be loaded so lookups start warm.
+    """
+
+    def __init__(self, cache_size: int = 65536, stem_table: Optional[Dict[str, str]] = None):
         self.stemmer = PorterStemmer()
-        # Improved regex to split on non-alphanumeric characters and camelCase
-        self.pattern = re.compile(r'[\W_]+|(?<=[a-z])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])')
+        self.pattern = TOKEN_PATTERN
+        self.cache_size = cache_size
+        self.stem_table: Dict[str, str] = dict(stem_table or {})
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def stem(self, token: str) -> str:
+        """
+        Returns the stem of a raw (not yet lowercased) token.
+        """
+        with self._cache_lock:
+            stem = self._cache.get(token)
+            if stem is not None:
+                self._cache.move_to_end(token)
+                self.stats["hits"] += 1
+                return stem
+            self.stats["misses"] += 1
+
+        word = token.lower()
+        stem = self.stem_table.get(word)
+        if stem is None:
+            stem = self.stemmer.stem(word)
+        with self._cache_lock:
+            self._cache[token] = stem
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return stem
 
     def tokenize(self, text):
         """
         Splits text by non-alphanumeric characters and camelCase, then stems them.
         """
-        tokens = self.pattern.split(text)
-        return [self.stemmer.stem(token.lower()) for token in tokens if token]
\ No newline at end of file
+        stem = self.stem
+        return [stem(token) for token in self.pattern.split(text) if token]
+
+    def tokenize_many(self, texts: Iterable[str]) -> List[List[str]]:
+        """
+        Tokenizes a batch of texts, stemming each distinct raw token once.
+        """
+        split = self.pattern.split
+        token_lists = [[token for token in split(text) if token] for text in texts]
+        stems = {}
+        for tokens in token_lists:
+            for token in tokens:
+                if token not in stems:
+                    stems[token] = self.stem(token)
+        return [[stems[token] for token in tokens] for tokens in token_lists]
+
+    def load_stem_table(self, stem_table: Dict[str, str]):
+        """
+        Merges a precomputed table of lowercased word -> stem.
+        """
+        self.stem_table.update(stem_table)
+
+    def export_stem_table(self, texts: Iterable[str]) -> Dict[str, str]:
+        """
+        Returns the lowercased word -> stem table of the words in ``texts``
+        (an index build's documents), for persisting alongside the index.
+        """
+        table = {}
+        for text in texts:
+            for token in self.pattern.split(text):
+                if token:
+                    word = token.lower()
+                    if word not in table:
+                        table[word] = self.stem(token)
+        return table
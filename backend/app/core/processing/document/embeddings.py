@@ -0,0 +1,189 @@
+"""
+Batched embedding pipeline with a persistent, content-addressed vector cache.
+
+Chunks are keyed by the SHA-256 of their text, so re-indexing a document after
+a small edit only embeds the chunks whose text actually changed. Vectors live
+in an append-only float32 file that is read through ``np.memmap``; the
+hash -> row table is a small JSON file rewritten atomically after each append.
+"""
+
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from app.core.model_registry import EMBEDDINGS, model_registry
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class SharedEmbeddings(Embeddings):
+    """
+    LangChain Embeddings backed by the process-wide embedding model, which is
+    only loaded when something is first embedded.
+    """
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return model_registry.get(EMBEDDINGS).embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return model_registry.get(EMBEDDINGS).embed_query(text)
+
+
+class EmbeddingCache:
+    """
+    Persistent content-hash -> float32 vector store for one embedding model.
+    """
+
+    def __init__(self, cache_dir: str, model_name: str):
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+        self.cache_dir = os.path.join(cache_dir, slug)
+        self.model_name = model_name
+        self.vectors_path = os.path.join(self.cache_dir, "vectors.f32")
+        self.index_path = os.path.join(self.cache_dir, "index.json")
+        self.dim: Optional[int] = None
+        self.rows: Dict[str, int] = {}
+        self._vectors: Optional[np.memmap] = None
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.index_path):
+            return
+        with open(self.index_path, "r") as f:
+            data = json.load(f)
+        if data.get("model_name") != self.model_name:
+            return
+        self.dim = data["dim"]
+        self.rows = data["rows"]
+        self._map_vectors()
+
+    def _map_vectors(self):
+        row_count = os.path.getsize(self.vectors_path) // (4 * self.dim) if os.path.exists(self.vectors_path) else 0
+        self._vectors = (
+            np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(row_count, self.dim))
+            if row_count else None
+        )
+
+    def _save_index(self):
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"model_name": self.model_name, "dim": self.dim, "rows": self.rows}, f)
+        os.replace(tmp_path, self.index_path)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.rows
+
+    def get_many(self, keys: Sequence[str]) -> np.ndarray:
+        """
+        Returns the cached vectors for keys that are all present in the cache.
+        """
+        return np.asarray(self._vectors[[self.rows[key] for key in keys]])
+
+    def put_many(self, keys: Sequence[str], vectors: np.ndarray):
+        """
+        Appends new vectors and publishes them in the hash -> row table.
+        """
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if not len(keys):
+            return
+        if self.dim is None:
+            self.dim = vectors.shape[1]
+        elif vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected {self.dim}-dimensional vectors, got {vectors.shape[1]}")
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(self.vectors_path, "ab") as f:
+            start_row = f.tell() // (4 * self.dim)
+            f.write(vectors.tobytes())
+        for offset, key in enumerate(keys):
+            self.rows[key] = start_row + offset
+        self._save_index()
+        self._map_vectors()
+
+    def compact(self, keep: Iterable[str], min_stale_fraction: float = 0.5):
+        """
+        Rewrites the store without vectors outside ``keep`` once at least
+        ``min_stale_fraction`` of the stored rows are stale.
+        """
+        if self._vectors is None:
+            return
+        keep = [key for key in dict.fromkeys(keep) if key in self.rows]
+        if len(self._vectors) and 1 - len(keep) / len(self._vectors) < min_stale_fraction:
+            return
+
+        vectors = self.get_many(keep) if keep else np.zeros((0, self.dim), dtype=np.float32)
+        tmp_path = self.vectors_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+        self._vectors = None
+        os.replace(tmp_path, self.vectors_path)
+        self.rows = {key: row for row, key in enumerate(keep)}
+        self._save_index()
+        self._map_vectors()
+
+
+class BatchedEmbedder:
+    """
+    Embeds texts in fixed-size batches on a thread pool, serving unchanged
+    texts from an EmbeddingCache.
+    """
+
+    def __init__(self, embeddings, cache: Optional[EmbeddingCache] = None, batch_size: int = 32, max_workers: int = 1):
+        self.embeddings = embeddings
+        self.cache = cache
+        self.batch_size = max(1, batch_size)
+        self.max_workers = max(1, max_workers)
+        self.stats = {"cache_hits": 0, "embedded": 0, "batches": 0}
+
+    def embed(self, texts: Sequence[str], progress_callback: Optional[Callable[[float], None]] = None) -> np.ndarray:
+        """
+        Returns one float32 vector per text, in input order.
+        """
+        report = progress_callback or (lambda progress: None)
+        keys = [content_hash(text) for text in texts]
+        missing = {}
+        for key, text in zip(keys, texts):
+            if (self.cache is None or key not in self.cache) and key not in missing:
+                missing[key] = text
+        self.stats["cache_hits"] += len(keys) - len(missing)
+
+        computed: Dict[str, np.ndarray] = {}
+        if missing:
+            missing_keys = list(missing)
+            batches = [
+                missing_keys[start:start + self.batch_size]
+                for start in range(0, len(missing_keys), self.batch_size)
+            ]
+            done = 0
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                results = executor.map(
+                    lambda batch: self.embeddings.embed_documents([missing[key] for key in batch]),
+                    batches,
+                )
+                for batch, vectors in zip(batches, results):
+                    vectors = np.asarray(vectors, dtype=np.float32)
+                    if self.cache is not None:
+                        self.cache.put_many(batch, vectors)
+                    else:
+                        computed.update(zip(batch, vectors))
+                    done += len(batch)
+                    report(100 * done / len(missing_keys))
+            self.stats["embedded"] += len(missing_keys)
+            self.stats["batches"] += len(batches)
+
+        report(100)
+        if not keys:
+            return np.zeros((0, 0), dtype=np.float32)
+        if self.cache is None:
+            return np.stack([computed[key] for key in keys])
+        return self.cache.get_many(keys)
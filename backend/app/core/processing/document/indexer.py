@@ -1,37 +1,78 @@
 import os
+import uuid
+from langchain_community.docstore.in_memory import InMemoryDocstore
 from langchain_community.vectorstores import FAISS
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_community.embeddings import HuggingFaceEmbeddings
 from langchain_core.documents import Document
+from langchain.text_splitter import RecursiveCharacterTextSplitter
 
 from app.core.config import settings
 from app.core.state import state_manager, ProcessingStatus
+from .embeddings import BatchedEmbedder, EmbeddingCache, SharedEmbeddings, content_hash
+from .faiss_index import build_faiss_index
 
 class DocumentIndexer:
     def __init__(self):
         self.doc_path = settings.USER_GUIDE_PATH
         self.output_dir = os.path.join(settings.PROCESSED_DATA_DIR, "document")
-        self.embeddings = HuggingFaceEmbeddings(model_name=settings.EMBEDDING_MODEL)
+        self.embeddings = SharedEmbeddings()
+        self.embedder = BatchedEmbedder(
+            self.embeddings,
+            cache=EmbeddingCache(os.path.join(self.output_dir, "embedding_cache"), settings.EMBEDDING_MODEL),
+            batch_size=settings.EMBEDDING_BATCH_SIZE,
+            max_workers=settings.EMBEDDING_WORKERS,
+        )
+
+    def _build_vector_store(self, chunks, vectors):
+        """
+        Wraps the configured FAISS index type around the chunk vectors.
+        """
+        index = build_faiss_index(
+            vectors,
+            index_type=settings.DOCUMENT_INDEX_TYPE,
+            quantization=settings.DOCUMENT_INDEX_QUANTIZATION,
+            nlist=settings.DOCUMENT_IVF_NLIST,
+            hnsw_m=settings.DOCUMENT_HNSW_M,
+            pq_m=settings.DOCUMENT_PQ_M,
+        )
+        ids = [str(uuid.uuid4()) for _ in chunks]
+        docstore = InMemoryDocstore({doc_id: Document(page_content=chunk) for doc_id, chunk in zip(ids, chunks)})
+        return FAISS(self.embeddings, index, docstore, dict(enumerate(ids)))
 
-    def index(self):
+    def index(self, progress_callback=None):
         """
         Loads, processes, and indexes the document content into a FAISS vector store.
+
+        ``progress_callback(phase, progress)`` is called as the "load",
+        "split", "embed" and "write" phases advance (progress is 0-100 within
+        the phase).
         """
+        report = progress_callback or (lambda phase, progress: None)
         try:
             state_manager.set_status("document", ProcessingStatus.PROCESSING)
             print(f"Indexing document at {self.doc_path}...")
             os.makedirs(self.output_dir, exist_ok=True)
 
+            report("load", 0)
             with open(self.doc_path, 'r') as f:
                 text = f.read()
+            report("load", 100)
             
+            report("split", 0)
             text_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=100)
-            docs = [Document(page_content=x) for x in text_splitter.split_text(text)]
+            chunks = text_splitter.split_text(text)
+            report("split", 100)
             
-            vector_store = FAISS.from_documents(docs, self.embeddings)
+            # Only chunks whose text is not in the embedding cache are encoded
+            report("embed", 0)
+            vectors = self.embedder.embed(chunks, progress_callback=lambda progress: report("embed", progress))
+            vector_store = self._build_vector_store(chunks, vectors)
+            self.embedder.cache.compact(content_hash(chunk) for chunk in chunks)
+            print(f"Embedded {len(chunks)} chunks ({self.embedder.stats['cache_hits']} from cache).")
             
+            report("write", 0)
             index_path = os.path.join(self.output_dir, "faiss_index.bin")
             vector_store.save_local(index_path)
+            report("write", 100)
             
             print(f"Built and saved FAISS index with {vector_store.index.ntotal} documents to {index_path}.")
             state_manager.set_status("document", ProcessingStatus.READY)
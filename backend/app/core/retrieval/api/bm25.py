@@ -0,0 +1,164 @@
+import math
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class BM25Scorer:
+    """
+    BM25 first-stage scorer over the API index's BM25 postings.
+
+    ``top_k`` uses MaxScore early termination. Query terms are processed in
+    decreasing order of their maximum possible contribution. Once the sum of
+    the remaining terms' maxima can no longer lift an unseen doc past the
+    current k-th best score, the remaining (low-idf, long) posting lists are
+    only probed for the surviving candidates instead of being traversed.
+    Candidates whose score plus the remaining maxima falls below the k-th best
+    are dropped as each term is applied.
+
+    Queries touching at most ``exhaustive_max_postings`` postings are scored
+    exhaustively: below a few thousand postings the per-term bookkeeping of
+    MaxScore costs more than it skips.
+    """
+
+    def __init__(self, postings, k1: float = 1.2, b: float = 0.75, cache_size: int = 4096, exhaustive_max_postings: int = 4096):
+        self.postings = postings
+        self.k1 = k1
+        self.b = b
+        self.cache_size = cache_size
+        self.exhaustive_max_postings = exhaustive_max_postings
+
+        doc_lengths = np.asarray(postings.doc_lengths, dtype=np.float64)
+        live = doc_lengths > 0
+        self.num_docs = int(live.sum())
+        avgdl = doc_lengths[live].mean() if self.num_docs else 1.0
+        # Per-doc length normalization, k1 * (1 - b + b * dl / avgdl)
+        self._norms = k1 * (1 - b + b * doc_lengths / avgdl)
+
+        self._impacts: "OrderedDict[str, Optional[Tuple[np.ndarray, np.ndarray, float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"postings_scored": 0, "postings_skipped": 0}
+
+    def idf(self, df: int) -> float:
+        return math.log(1 + (self.num_docs - df + 0.5) / (df + 0.5))
+
+    def _term_impacts(self, token: str):
+        """
+        Returns the cached ``(doc_ids, scores, max_score)`` of a token's
+        postings, or None if the token is not indexed.
+        """
+        with self._lock:
+            if token in self._impacts:
+                self._impacts.move_to_end(token)
+                return self._impacts[token]
+
+        run = self.postings.postings(token)
+        impacts = None
+        if run is not None and len(run[0]):
+            doc_ids = np.asarray(run[0], dtype=np.int64)
+            tfs = np.asarray(run[1], dtype=np.float64)
+            scores = self.idf(len(doc_ids)) * tfs * (self.k1 + 1) / (tfs + self._norms[doc_ids])
+            impacts = (doc_ids, scores, float(scores.max()))
+
+        with self._lock:
+            self._impacts[token] = impacts
+            while len(self._impacts) > self.cache_size:
+                self._impacts.popitem(last=False)
+        return impacts
+
+    def _query_terms(self, tokens: Sequence[str]):
+        terms = [self._term_impacts(token) for token in dict.fromkeys(tokens)]
+        return [term for term in terms if term is not None]
+
+    def score(self, tokens: Sequence[str]) -> np.ndarray:
+        """
+        Returns the exhaustive BM25 score of every doc_id for the query tokens.
+        """
+        scores = np.zeros(len(self._norms), dtype=np.float64)
+        for doc_ids, term_scores, _ in self._query_terms(tokens):
+            scores[doc_ids] += term_scores
+        return scores
+
+    def top_k(self, tokens: Sequence[str], k: int) -> List[int]:
+        """
+        Returns the k best doc_ids by BM25 score (ties by ascending doc_id).
+        """
+        terms = sorted(self._query_terms(tokens), key=lambda term: term[2], reverse=True)
+        if not terms or k <= 0:
+            return []
+        if sum(len(term[0]) for term in terms) <= self.exhaustive_max_postings:
+            return self._exhaustive_top_k(terms, k)
+        # remaining[i] is the most the terms from i onwards can still add
+        remaining = np.append(np.cumsum([term[2] for term in terms][::-1])[::-1], 0.0)
+
+        # Essential phase: traverse postings until unseen docs are ruled out
+        scores = np.zeros(len(self._norms), dtype=np.float64)
+        threshold = 0.0
+        position = 0
+        scored = 0
+        while position < len(terms):
+            doc_ids, term_scores, _ = terms[position]
+            scores[doc_ids] += term_scores
+            scored += len(doc_ids)
+            position += 1
+            threshold = self._kth_best(scores[scores > 0], k)
+            if threshold > 0 and remaining[position] < threshold:
+                break
+
+        candidates = np.flatnonzero(scores)
+        candidate_scores = scores[candidates]
+
+        # Non-essential phase: probe the remaining postings for candidates only
+        skipped = 0
+        while position < len(terms):
+            keep = candidate_scores + remaining[position] >= threshold
+            candidates, candidate_scores = candidates[keep], candidate_scores[keep]
+            doc_ids, term_scores, _ = terms[position]
+            slots = np.searchsorted(doc_ids, candidates)
+            found = slots < len(doc_ids)
+            found[found] = doc_ids[slots[found]] == candidates[found]
+            candidate_scores[found] += term_scores[slots[found]]
+            skipped += len(doc_ids) - int(found.sum())
+            position += 1
+            threshold = max(threshold, self._kth_best(candidate_scores, k))
+
+        with self._lock:
+            self.stats["postings_scored"] += scored
+            self.stats["postings_skipped"] += skipped
+
+        order = np.lexsort((candidates, -candidate_scores))[:k]
+        return [int(doc_id) for doc_id in candidates[order]]
+
+    def _exhaustive_top_k(self, terms, k: int) -> List[int]:
+        scores = np.zeros(len(self._norms), dtype=np.float64)
+        scored = 0
+        for doc_ids, term_scores, _ in terms:
+            scores[doc_ids] += term_scores
+            scored += len(doc_ids)
+        with self._lock:
+            self.stats["postings_scored"] += scored
+
+        candidates = np.flatnonzero(scores)
+        candidate_scores = scores[candidates]
+        order = np.lexsort((candidates, -candidate_scores))[:k]
+        return [int(doc_id) for doc_id in candidates[order]]
+
+    @staticmethod
+    def _kth_best(scores: np.ndarray, k: int) -> float:
+        if len(scores) < k:
+            return 0.0
+        return float(np.partition(scores, len(scores) - k)[len(scores) - k])
+
+    def clear_cache(self):
+        with self._lock:
+            self._impacts.clear()
+
+    def get_stats(self) -> Dict[str, float]:
+        with self._lock:
+            total = self.stats["postings_scored"] + self.stats["postings_skipped"]
+            return {
+                **self.stats,
+                "skip_rate": self.stats["postings_skipped"] / total if total else 0.0,
+            }
@@ -0,0 +1,62 @@
+import heapq
+from typing import Dict, List, Sequence
+
+import numpy as np
+from pyroaring import BitMap as Roaring
+
+# Bonus given to documents that contain every query token, so full matches
+# always outrank partial ones.
+INTERSECTION_BONUS = 100
+
+
+class BitmapCandidateScorer:
+    """
+    Scores candidate documents from the roaring inverted index in a single
+    vectorized pass.
+
+    Each query token's posting list is viewed as a uint32 NumPy array and all
+    of them are counted together with ``np.bincount``, giving the number of
+    matched query tokens per document without walking the union bitmap in
+    Python. The top-k documents are then selected with a heap.
+    """
+
+    def __init__(self, inverted_index: Dict[str, Roaring]):
+        self.inverted_index = inverted_index
+
+    def _postings(self, token: str) -> np.ndarray:
+        """
+        Returns the posting list for a token as a uint32 array. Nothing is
+        cached here; hot bitmaps are kept by the index's own bounded LRU.
+        """
+        bitmap = self.inverted_index.get(token)
+        if bitmap is None:
+            return np.empty(0, dtype=np.uint32)
+        return np.frombuffer(bitmap.to_array(), dtype=np.uint32)
+
+    def score(self, query_tokens: Sequence[str]) -> np.ndarray:
+        """
+        Returns a dense array of candidate scores indexed by doc_id.
+
+        A document scores one point per query token it contains, plus
+        ``INTERSECTION_BONUS`` when it contains all of them. Repeated query
+        tokens count once per occurrence.
+        """
+        if not query_tokens:
+            return np.zeros(0, dtype=np.int64)
+
+        postings = [self._postings(token) for token in query_tokens]
+        matched = np.bincount(np.concatenate(postings).astype(np.int64, copy=False))
+        scores = matched.astype(np.int64, copy=False)
+        scores[matched == len(postings)] += INTERSECTION_BONUS
+        return scores
+
+    def top_k(self, query_tokens: Sequence[str], top_k: int = 20) -> List[int]:
+        """
+        Returns up to ``top_k`` doc_ids ordered by descending score. Ties are
+        broken by ascending doc_id.
+        """
+        scores = self.score(query_tokens)
+        candidates = np.flatnonzero(scores)
+        if candidates.size == 0:
+            return []
+        return heapq.nlargest(top_k, candidates.tolist(), key=scores.__getitem__)
@@ -0,0 +1,175 @@
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, List, Sequence, Tuple
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalizes a query for cache lookups so trivially different spellings of
+    the same question ("List  incidents" vs "list incidents") share entries.
+    """
+    return " ".join(query.lower().split())
+
+
+class CrossEncoderReranker:
+    """
+    Cross-encoder reranking stage for the API retriever.
+
+    - Scores ``(query, doc_text)`` pairs using precomputed, truncated texts
+      per doc_id instead of stringifying the full endpoint on every call.
+    - Memoizes ``(normalized query, doc_id)`` scores in a bounded LRU.
+    - Micro-batches the cache misses of concurrent callers into a single
+      ``predict`` call on a background worker thread.
+    """
+
+    def __init__(
+        self,
+        cross_encoder,
+        doc_texts: Dict[int, str] = None,
+        cache_size: int = 10000,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+    ):
+        self.cross_encoder = cross_encoder
+        self.doc_texts = doc_texts or {}
+        self.cache_size = cache_size
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+
+        self._cache: "OrderedDict[Tuple[str, int], float]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._queue: "queue.Queue[Tuple[List[Tuple[str, int]], Future]]" = queue.Queue()
+        self._worker = None
+        self._worker_lock = threading.Lock()
+
+        self.stats = {
+            "cache_hits": 0,
+            "cache_misses": 0,
+            "batches": 0,
+            "batched_requests": 0,
+            "scored_pairs": 0,
+        }
+
+    def set_documents(self, doc_texts: Dict[int, str]):
+        """
+        Replaces the per-document texts, dropping every cached score since
+        doc_ids are only meaningful within one index build.
+        """
+        self.doc_texts = doc_texts
+        self.clear_cache()
+
+    def clear_cache(self):
+        """
+        Drops every cached score, e.g. between benchmark runs.
+        """
+        with self._cache_lock:
+            self._cache.clear()
+
+    def rerank(self, query: str, candidates: Sequence[int]) -> List[int]:
+        """
+        Returns the candidates ordered by descending cross-encoder score.
+        """
+        return [candidate for candidate, score in self.rerank_with_scores(query, candidates)]
+
+    def rerank_with_scores(self, query: str, candidates: Sequence[int]) -> List[Tuple[int, float]]:
+        """
+        Returns ``(candidate, score)`` pairs ordered by descending cross-encoder score.
+        """
+        if not candidates:
+            return []
+        scores = self.score(query, candidates)
+        ranked_candidates = sorted(zip(scores, candidates), key=lambda x: x[0], reverse=True)
+        return [(candidate, score) for score, candidate in ranked_candidates]
+
+    def score(self, query: str, candidates: Sequence[int]) -> List[float]:
+        """
+        Returns a cross-encoder score for each candidate, in input order.
+        """
+        normalized = normalize_query(query)
+        keys = [(normalized, doc_id) for doc_id in candidates]
+
+        scores = {}
+        with self._cache_lock:
+            for key in keys:
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    scores[key] = self._cache[key]
+            misses = [key for key in dict.fromkeys(keys) if key not in scores]
+            self.stats["cache_hits"] += len(keys) - len(misses)
+            self.stats["cache_misses"] += len(misses)
+
+        if misses:
+            future = Future()
+            self._ensure_worker()
+            self._queue.put((misses, future))
+            scores.update(future.result())
+
+        return [scores[key] for key in keys]
+
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="cross-encoder-batcher", daemon=True)
+                self._worker.start()
+
+    def _collect_batch(self):
+        """
+        Blocks for the first request, then keeps draining the queue until the
+        batch is full or ``max_wait`` has elapsed.
+        """
+        batch = [self._queue.get()]
+        pair_count = len(batch[0][0])
+        deadline = time.monotonic() + self.max_wait
+        while pair_count < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            batch.append(item)
+            pair_count += len(item[0])
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect_batch()
+            unique_keys = list(dict.fromkeys(key for keys, _ in batch for key in keys))
+            try:
+                pairs = [[query, self.doc_texts.get(doc_id, "")] for query, doc_id in unique_keys]
+                predicted = self.cross_encoder.predict(pairs)
+                results = {key: float(score) for key, score in zip(unique_keys, predicted)}
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            with self._cache_lock:
+                for key, score in results.items():
+                    self._cache[key] = score
+                    self._cache.move_to_end(key)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+                self.stats["batches"] += 1
+                self.stats["batched_requests"] += len(batch)
+                self.stats["scored_pairs"] += len(unique_keys)
+
+            for keys, future in batch:
+                future.set_result({key: results[key] for key in keys})
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Returns cache and batching counters.
+        """
+        lookups = self.stats["cache_hits"] + self.stats["cache_misses"]
+        batches = self.stats["batches"]
+        return {
+            **self.stats,
+            "cache_size": len(self._cache),
+            "hit_rate": self.stats["cache_hits"] / lookups if lookups else 0.0,
+            "avg_requests_per_batch": self.stats["batched_requests"] / batches if batches else 0.0,
+        }
@@ -1,11 +1,15 @@
 import os
-import pickle
-from collections import defaultdict
-from pyroaring import BitMap as Roaring
-from sentence_transformers import CrossEncoder
+from typing import Optional
+import numpy as np
 
 from app.core.config import settings
+from app.core.model_registry import CROSS_ENCODER, model_registry
 from app.core.processing.api.tokenizers import CanonicalTokenizer
+from app.core.processing.api.index_store import IndexFormatError, load_api_index, read_current_build_id
+from app.core.retrieval.api.bm25 import BM25Scorer
+from app.core.retrieval.api.candidates import BitmapCandidateScorer
+from app.core.retrieval.api.reranker import CrossEncoderReranker
+from app.core.retrieval.timing import timed_stage
 
 class ApiRetriever:
     """
@@ -13,92 +17,114 @@ class ApiRetriever:
     """
     def __init__(self):
         self.index_dir = os.path.join(settings.PROCESSED_DATA_DIR, "api")
+        self.build_id = None
         self.tokenizer = CanonicalTokenizer()
         self.inverted_index = None
         self.tfidf_vectorizer = None
         self.tfidf_matrix = None
         self.full_text_cache = None
+        self.deleted_doc_ids = []
+        self.candidate_scorer = None
+        self.bm25_scorer = None
+        # Shared across retrievers; loaded on the first rerank
+        self.cross_encoder = model_registry.lazy(CROSS_ENCODER)
+        self.reranker = CrossEncoderReranker(
+            self.cross_encoder,
+            cache_size=settings.RERANK_CACHE_SIZE,
+            max_batch_size=settings.RERANK_MAX_BATCH_SIZE,
+            max_wait_ms=settings.RERANK_MAX_WAIT_MS,
+        )
         self._load_indices()
-        self.cross_encoder = CrossEncoder(settings.CROSS_ENCODER_MODEL)
 
     def _load_indices(self):
         """
-        Loads the retrieval indices from disk if they exist.
+        Opens the published, memory-mapped index build from disk if it exists.
         """
         print(f"Attempting to load API indices from {self.index_dir}...")
         try:
-            # Load bitmap index
-            with open(os.path.join(self.index_dir, "bitmap_index.bin"), "rb") as f:
-                self.inverted_index = pickle.load(f)
+            index = load_api_index(self.index_dir)
+        except (IndexFormatError, FileNotFoundError) as e:
+            print(f"API index files not found ({e}). Please run the API processing endpoint first.")
+            return
 
-            # Load TF-IDF vectorizer and matrix
-            with open(os.path.join(self.index_dir, "tfidf_vectorizer.pkl"), "rb") as f:
-                self.tfidf_vectorizer = pickle.load(f)
-            with open(os.path.join(self.index_dir, "tfidf_matrix.pkl"), "rb") as f:
-                self.tfidf_matrix = pickle.load(f)
+        self.build_id = index.build_id
+        self.inverted_index = index.inverted_index
+        self.tfidf_vectorizer = index.tfidf_vectorizer
+        self.tfidf_matrix = index.tfidf_matrix
+        self.full_text_cache = index.docs
+        self.deleted_doc_ids = index.deleted_doc_ids
+        self.reranker.set_documents(index.rerank_texts)
+        self.tokenizer.load_stem_table(index.stem_table)
+        self.candidate_scorer = BitmapCandidateScorer(self.inverted_index)
+        self.bm25_scorer = BM25Scorer(index.bm25_postings, k1=settings.BM25_K1, b=settings.BM25_B)
+        print(f"API indices loaded successfully (build {self.build_id}).")
 
-            # Load full-text cache
-            with open(os.path.join(self.index_dir, "full_text_cache.pkl"), "rb") as f:
-                self.full_text_cache = pickle.load(f)
-            print("API indices loaded successfully.")
-        except FileNotFoundError:
-            print("API index files not found. Please run the API processing endpoint first.")
+    def _reload_if_stale(self):
+        """
+        Reopens the index when another process has published a newer build.
+        """
+        current_build_id = read_current_build_id(self.index_dir)
+        if current_build_id is not None and current_build_id != self.build_id:
+            self._load_indices()
 
-    def _get_candidates(self, query: str, top_k: int = 20):
+    def _get_candidates(self, query: str, top_k: int = 20, trace: Optional[dict] = None):
         """
-        Gets a set of candidate documents from the inverted index.
+        Gets a set of candidate documents from the inverted index, ranked by
+        BM25 or by token-hit counts (API_FIRST_STAGE).
         """
-        query_tokens = self.tokenizer.tokenize(query)
+        with timed_stage(trace, "tokenize"):
+            query_tokens = self.tokenizer.tokenize(query)
         if not query_tokens:
             return []
 
-        token_bitmaps = [self.inverted_index.get(token, Roaring()) for token in query_tokens]
-        
-        candidate_scores = defaultdict(int)
-        intersection_bitmap = Roaring.intersection(*token_bitmaps)
-        for doc_id in intersection_bitmap:
-            candidate_scores[doc_id] += 100
+        with timed_stage(trace, "candidates"):
+            if settings.API_FIRST_STAGE == "bm25":
+                candidates = self.bm25_scorer.top_k(query_tokens, top_k)
+            else:
+                candidates = self.candidate_scorer.top_k(query_tokens, top_k)
 
-        union_bitmap = Roaring.union(*token_bitmaps)
-        for doc_id in union_bitmap:
-            for token_bitmap in token_bitmaps:
-                if doc_id in token_bitmap:
-                    candidate_scores[doc_id] += 1
+            if not candidates:
+                query_vec = self.tfidf_vectorizer.transform([query])
+                scores = (query_vec * self.tfidf_matrix.T).toarray()[0]
+                # Tombstoned slots left by incremental updates must never surface
+                scores[self.deleted_doc_ids] = -np.inf
+                top_tfidf_candidates = scores.argsort()[-top_k:][::-1]
+                return [doc_id for doc_id in top_tfidf_candidates if np.isfinite(scores[doc_id])]
 
-        if not candidate_scores:
-            query_vec = self.tfidf_vectorizer.transform([query])
-            scores = (query_vec * self.tfidf_matrix.T).toarray()[0]
-            top_tfidf_candidates = scores.argsort()[-top_k:][::-1]
-            return list(top_tfidf_candidates)
+        return candidates
 
-        sorted_candidates = sorted(candidate_scores.items(), key=lambda item: item[1], reverse=True)
-        return [doc_id for doc_id, score in sorted_candidates[:top_k]]
-
-    def _rerank_candidates(self, query: str, candidates: list):
+    def retrieve(self, query: str, top_k: int = 5, num_candidates: Optional[int] = None):
         """
-        Reranks the candidates using a more powerful model.
+        Performs a multi-stage search for the given query.
         """
-        if not candidates:
-            return []
-
-        candidate_docs = [self.full_text_cache[doc_id] for doc_id in candidates]
-        cross_encoder_inputs = [[query, str(doc)] for doc in candidate_docs]
-        scores = self.cross_encoder.predict(cross_encoder_inputs)
-        ranked_candidates = sorted(zip(scores, candidates), key=lambda x: x[0], reverse=True)
-        return [candidate for score, candidate in ranked_candidates]
+        results = self.retrieve_scored(query, top_k=top_k, num_candidates=num_candidates)
+        if not isinstance(results, list):
+            return results
+        return [doc for doc, score in results]
 
-    def retrieve(self, query: str, top_k: int = 5):
+    def retrieve_scored(self, query: str, top_k: int = 5, num_candidates: Optional[int] = None, trace: Optional[dict] = None):
         """
-        Performs a multi-stage search for the given query.
+        Performs a multi-stage search and returns ``(endpoint, score)`` pairs,
+        best first. Only ``num_candidates`` candidates (API_RERANK_CANDIDATES
+        by default) go to the cross-encoder.
+
+        When a ``trace`` dict is given, per-stage timings (tokenize,
+        candidates, rerank) and the first-stage candidate doc_ids are recorded
+        in it.
         """
         print(f"Retrieving API specs for query: '{query}'")
+        self._reload_if_stale()
         if self.inverted_index is None or self.tfidf_vectorizer is None or self.tfidf_matrix is None or self.full_text_cache is None:
             # Attempt to load the index on-the-fly if it wasn't available at startup
             self._load_indices()
             if self.inverted_index is None or self.tfidf_vectorizer is None or self.tfidf_matrix is None or self.full_text_cache is None:
                 return {"error": "API index is not available. Please process the API spec first."}
 
-        candidates = self._get_candidates(query)
-        reranked_candidates = self._rerank_candidates(query, candidates)
-        
-        return [self.full_text_cache[doc_id] for doc_id in reranked_candidates[:top_k]]
\ No newline at end of file
+        num_candidates = num_candidates or settings.API_RERANK_CANDIDATES
+        candidates = [int(doc_id) for doc_id in self._get_candidates(query, top_k=max(top_k, num_candidates), trace=trace)]
+        if trace is not None:
+            trace["candidates"] = candidates
+        with timed_stage(trace, "rerank"):
+            reranked_candidates = self.reranker.rerank_with_scores(query, candidates)
+
+        return [(self.full_text_cache[doc_id], score) for doc_id, score in reranked_candidates[:top_k]]
\ No newline at end of file
@@ -0,0 +1,325 @@
+"""
+Offline latency and relevance benchmark for ApiRetriever and DocumentRetriever.
+
+A benchmark run takes a set of labeled queries and runs each one through the
+retrievers with a trace attached. It reports p50/p95/p99 latency for every
+stage (tokenize, candidates, rerank for the API leg; embed, faiss for the
+document leg) and recall@k / MRR against the labels. Results are plain JSON
+so runs made with different ``top_k``, index types or reranker settings can
+be saved and compared.
+"""
+
+import json
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Collection, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from app.core.config import settings
+
+API = "api"
+DOCUMENT = "document"
+PERCENTILES = (50, 95, 99)
+
+
+@dataclass
+class LabeledQuery:
+    """
+    A query with its relevance labels: the operationIds of the relevant API
+    endpoints and phrases that identify relevant user-guide passages.
+    """
+    query: str
+    relevant_operations: List[str] = field(default_factory=list)
+    relevant_passages: List[str] = field(default_factory=list)
+    source: str = "manual"
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LabeledQuery":
+        return cls(
+            query=data["query"],
+            relevant_operations=list(data.get("relevant_operations", [])),
+            relevant_passages=list(data.get("relevant_passages", [])),
+            source=data.get("source", "manual"),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def labeled_queries_from_test_suite(test_suite, registry) -> List[LabeledQuery]:
+    """
+    Seeds labeled queries from a TestingAgent ``TestSuite``.
+
+    A test case that targets an operation is labeled with that operation's
+    endpoint; one that only targets a service is labeled with every endpoint
+    of the service. Test cases whose labels cannot be resolved against the
+    registry are skipped.
+    """
+    labeled = []
+    for category, test_cases in test_suite.test_categories.items():
+        for test_case in test_cases:
+            service = registry.services.get(test_case.expected_service)
+            if service is None:
+                continue
+            operations = {**service.tier1_operations, **service.tier2_operations}
+            if test_case.expected_operation:
+                operation = operations.get(test_case.expected_operation)
+                targets = [operation] if operation is not None else []
+            else:
+                targets = list(operations.values())
+
+            operation_ids = list(dict.fromkeys(
+                target.endpoint.operation_id for target in targets if target.endpoint is not None
+            ))
+            if operation_ids:
+                labeled.append(LabeledQuery(
+                    query=test_case.query,
+                    relevant_operations=operation_ids,
+                    source=f"{category}:{test_case.test_id}",
+                ))
+    return labeled
+
+
+def load_labeled_queries(path: str) -> List[LabeledQuery]:
+    with open(path, "r", encoding="utf-8") as f:
+        return [LabeledQuery.from_dict(item) for item in json.load(f)]
+
+
+def recall_at_k(ranked: Sequence[Collection[str]], relevant: Collection[str], k: int) -> float:
+    """
+    Fraction of the relevant labels found in the first k results. Each result
+    is given as the set of labels it matches.
+    """
+    if not relevant:
+        return 0.0
+    found = set().union(*ranked[:k]) if ranked[:k] else set()
+    return len(found & set(relevant)) / len(set(relevant))
+
+
+def reciprocal_rank(ranked: Sequence[Collection[str]], relevant: Collection[str]) -> float:
+    """
+    1 / rank of the first result matching a relevant label, or 0.
+    """
+    relevant = set(relevant)
+    for rank, labels in enumerate(ranked, start=1):
+        if relevant & set(labels):
+            return 1.0 / rank
+    return 0.0
+
+
+def latency_summary(samples: Iterable[float]) -> Dict[str, float]:
+    """
+    Returns the count, mean and p50/p95/p99 of latency samples in milliseconds.
+    """
+    samples = np.asarray(list(samples), dtype=np.float64)
+    if not len(samples):
+        return {"count": 0}
+    summary = {"count": int(len(samples)), "mean": round(float(samples.mean()), 3)}
+    for percentile in PERCENTILES:
+        summary[f"p{percentile}"] = round(float(np.percentile(samples, percentile)), 3)
+    return summary
+
+
+def endpoint_labels(endpoint: Dict[str, Any]) -> List[str]:
+    return [endpoint.get("operationId") or f"{endpoint.get('method', '').upper()} {endpoint.get('path', '')}"]
+
+
+def passage_labels(document, phrases: Sequence[str]) -> List[str]:
+    """
+    Returns the labeled phrases a retrieved chunk contains (case-insensitive),
+    so passage labels survive re-chunking of the user guide.
+    """
+    content = " ".join(document.page_content.lower().split())
+    return [phrase for phrase in phrases if " ".join(phrase.lower().split()) in content]
+
+
+class RetrievalBenchmark:
+    """
+    Runs labeled queries through the API and/or document retriever and
+    collects per-stage latency and relevance metrics.
+
+    Each query is run ``warmup`` times untimed (loading models and faulting
+    in index pages) and then ``repeat`` times with a trace. With ``cold`` the
+    query embedding and rerank caches are cleared before every timed run, so
+    embed and rerank timings reflect model inference rather than cache hits.
+    """
+
+    def __init__(
+        self,
+        api_retriever=None,
+        document_retriever=None,
+        k_values: Sequence[int] = (1, 5, 10),
+        num_candidates: Optional[int] = None,
+        nprobe: Optional[int] = None,
+        ef_search: Optional[int] = None,
+        repeat: int = 3,
+        warmup: int = 1,
+        cold: bool = False,
+    ):
+        self.api_retriever = api_retriever
+        self.document_retriever = document_retriever
+        self.k_values = sorted(set(k_values))
+        self.top_k = self.k_values[-1]
+        self.num_candidates = num_candidates
+        self.nprobe = nprobe
+        self.ef_search = ef_search
+        self.repeat = max(1, repeat)
+        self.warmup = max(0, warmup)
+        self.cold = cold
+
+    def config(self) -> Dict[str, Any]:
+        """
+        Returns the knobs a run was made with, saved alongside its results.
+        """
+        return {
+            "k_values": self.k_values,
+            "repeat": self.repeat,
+            "warmup": self.warmup,
+            "cold": self.cold,
+            "num_candidates": self.num_candidates or settings.API_RERANK_CANDIDATES,
+            "api_first_stage": settings.API_FIRST_STAGE,
+            "rerank_max_batch_size": settings.RERANK_MAX_BATCH_SIZE,
+            "document_index_type": settings.DOCUMENT_INDEX_TYPE,
+            "document_index_quantization": settings.DOCUMENT_INDEX_QUANTIZATION,
+            "nprobe": self.nprobe or settings.DOCUMENT_SEARCH_NPROBE,
+            "ef_search": self.ef_search or settings.DOCUMENT_SEARCH_EF,
+        }
+
+    def _search(self, leg: str, query: str, trace: Optional[dict]):
+        """
+        Runs one query, returning the scored results or an ``{"error": ...}``
+        dict when the retriever or its model is unavailable.
+        """
+        try:
+            return self._retrieve(leg, query, trace)
+        except Exception as e:
+            return {"error": f"{type(e).__name__}: {e}"}
+
+    def _retrieve(self, leg: str, query: str, trace: Optional[dict]):
+        if leg == API:
+            return self.api_retriever.retrieve_scored(query, top_k=self.top_k, num_candidates=self.num_candidates, trace=trace)
+        return self.document_retriever.retrieve_scored(query, top_k=self.top_k, nprobe=self.nprobe, ef_search=self.ef_search, trace=trace)
+
+    def _clear_caches(self, leg: str):
+        if leg == API:
+            self.api_retriever.reranker.clear_cache()
+        else:
+            self.document_retriever.query_cache.clear()
+
+    def _labels(self, leg: str, results, labeled_query: LabeledQuery) -> List[List[str]]:
+        if leg == API:
+            return [endpoint_labels(endpoint) for endpoint, _ in results]
+        return [passage_labels(document, labeled_query.relevant_passages) for document, _ in results]
+
+    def _candidate_labels(self, trace: dict) -> List[List[str]]:
+        docs = self.api_retriever.full_text_cache
+        return [endpoint_labels(docs[doc_id]) for doc_id in trace.get("candidates", []) if docs.get(doc_id)]
+
+    def run_leg(self, leg: str, queries: Sequence[LabeledQuery]) -> Dict[str, Any]:
+        """
+        Benchmarks one retriever ("api" or "document") over the queries.
+        """
+        stage_samples: Dict[str, List[float]] = {}
+        per_query = []
+        for labeled_query in queries:
+            relevant = labeled_query.relevant_operations if leg == API else labeled_query.relevant_passages
+            for _ in range(self.warmup):
+                results = self._search(leg, labeled_query.query, None)
+                if not isinstance(results, list):
+                    return {"error": results.get("error")}
+
+            totals = []
+            for _ in range(self.repeat):
+                if self.cold:
+                    self._clear_caches(leg)
+                trace = {}
+                start = time.perf_counter()
+                results = self._search(leg, labeled_query.query, trace)
+                totals.append((time.perf_counter() - start) * 1000)
+                if not isinstance(results, list):
+                    return {"error": results.get("error")}
+                for stage, elapsed_ms in trace.get("timings_ms", {}).items():
+                    stage_samples.setdefault(stage, []).append(elapsed_ms)
+            stage_samples.setdefault("total", []).extend(totals)
+
+            report = {"query": labeled_query.query, "source": labeled_query.source, "total_ms": round(float(np.median(totals)), 3)}
+            if relevant:
+                ranked = self._labels(leg, results, labeled_query)
+                for k in self.k_values:
+                    report[f"recall@{k}"] = recall_at_k(ranked, relevant, k)
+                report["rr"] = reciprocal_rank(ranked, relevant)
+                if leg == API:
+                    candidates = self._candidate_labels(trace)
+                    report["candidate_recall"] = recall_at_k(candidates, relevant, len(candidates))
+            per_query.append(report)
+
+        evaluated = [report for report in per_query if "rr" in report]
+        quality: Dict[str, Any] = {"evaluated": len(evaluated)}
+        if evaluated:
+            metrics = [f"recall@{k}" for k in self.k_values] + (["candidate_recall"] if leg == API else [])
+            for metric in metrics:
+                quality[metric] = round(float(np.mean([report[metric] for report in evaluated])), 4)
+            quality["mrr"] = round(float(np.mean([report["rr"] for report in evaluated])), 4)
+
+        return {
+            "latency_ms": {stage: latency_summary(samples) for stage, samples in stage_samples.items()},
+            "quality": quality,
+            "per_query": per_query,
+        }
+
+    def run(self, queries: Sequence[LabeledQuery]) -> Dict[str, Any]:
+        """
+        Benchmarks every configured retriever and returns the JSON-serializable results.
+        """
+        results = {
+            "created_at": datetime.utcnow().isoformat(),
+            "config": self.config(),
+            "num_queries": len(queries),
+        }
+        if self.api_retriever is not None:
+            results[API] = self.run_leg(API, queries)
+        if self.document_retriever is not None:
+            results[DOCUMENT] = self.run_leg(DOCUMENT, queries)
+        return results
+
+
+def save_results(results: Dict[str, Any], path: str):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Returns ``current - baseline`` for every latency percentile and quality
+    metric the two runs have in common, per leg.
+    """
+    comparison = {}
+    for leg in (API, DOCUMENT):
+        if "latency_ms" not in baseline.get(leg, {}) or "latency_ms" not in current.get(leg, {}):
+            continue
+        latency = {}
+        for stage, summary in current[leg]["latency_ms"].items():
+            before = baseline[leg]["latency_ms"].get(stage, {})
+            latency[stage] = {
+                f"p{percentile}": round(summary[f"p{percentile}"] - before[f"p{percentile}"], 3)
+                for percentile in PERCENTILES
+                if f"p{percentile}" in summary and f"p{percentile}" in before
+            }
+        quality = {
+            metric: round(value - baseline[leg]["quality"][metric], 4)
+            for metric, value in current[leg]["quality"].items()
+            if metric != "evaluated" and metric in baseline[leg]["quality"]
+        }
+        comparison[leg] = {"latency_ms": latency, "quality": quality}
+    return comparison
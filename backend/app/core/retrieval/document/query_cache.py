@@ -0,0 +1,66 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict
+
+import numpy as np
+
+from app.core.retrieval.api.reranker import normalize_query
+
+
+class QueryEmbeddingCache:
+    """
+    Bounded LRU of normalized query -> float32 query embedding.
+
+    Agent strategies re-issue the same search on every reasoning step, so
+    repeated queries skip the embedding model entirely. Misses are computed
+    outside the lock; two threads racing on the same new query both embed it
+    and the second result simply overwrites the first.
+    """
+
+    def __init__(self, embed_fn: Callable[[str], list], max_size: int = 1024):
+        self.embed_fn = embed_fn
+        self.max_size = max_size
+        self._cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, query: str) -> np.ndarray:
+        """
+        Returns the embedding of the normalized ``query``, computing it on a miss.
+        """
+        key = normalize_query(query)
+        with self._lock:
+            vector = self._cache.get(key)
+            if vector is not None:
+                self._cache.move_to_end(key)
+                self.stats["hits"] += 1
+                return vector
+            self.stats["misses"] += 1
+
+        vector = np.asarray(self.embed_fn(key), dtype=np.float32)
+        vector.setflags(write=False)
+        if self.max_size <= 0:
+            return vector
+        with self._lock:
+            self._cache[key] = vector
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+                self.stats["evictions"] += 1
+        return vector
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Returns hit/miss counters and the current cache size.
+        """
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "size": len(self._cache),
+                "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+            }
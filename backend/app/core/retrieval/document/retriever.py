@@ -1,16 +1,23 @@
+import asyncio
 import os
+from typing import Optional
 from langchain_community.vectorstores import FAISS
-from langchain_huggingface import HuggingFaceEmbeddings
 
 from app.core.config import settings
+from app.core.processing.document.embeddings import SharedEmbeddings
+from app.core.processing.document.faiss_index import search_parameters
+from app.core.retrieval.timing import timed_stage
+from .query_cache import QueryEmbeddingCache
 
 class DocumentRetriever:
     def __init__(self):
         """
-        Initializes the retriever, loading the FAISS index and embedding model.
+        Initializes the retriever, loading the FAISS index. The shared
+        embedding model is loaded on the first query.
         """
         self.index_dir = os.path.join(settings.PROCESSED_DATA_DIR, "document")
-        self.embeddings = HuggingFaceEmbeddings(model_name=settings.EMBEDDING_MODEL)
+        self.embeddings = SharedEmbeddings()
+        self.query_cache = QueryEmbeddingCache(self.embeddings.embed_query, settings.QUERY_EMBEDDING_CACHE_SIZE)
         self._load_index()
 
     def _load_index(self):
@@ -25,9 +32,26 @@ class DocumentRetriever:
             self.vector_store = None
             print(f"Warning: Could not load FAISS index from {index_path}. Error: {e}. Please run the document processing endpoint first.")
 
-    def retrieve(self, query: str, top_k: int = 5):
+    def retrieve(self, query: str, top_k: int = 5, nprobe: Optional[int] = None, ef_search: Optional[int] = None):
         """
         Performs a similarity search on the vector store.
+
+        ``nprobe`` (IVF indexes) and ``ef_search`` (HNSW indexes) override the
+        configured search breadth for this query; they are ignored by index
+        types that do not use them.
+        """
+        results = self.retrieve_scored(query, top_k=top_k, nprobe=nprobe, ef_search=ef_search)
+        if not isinstance(results, list):
+            return results
+        return [doc for doc, score in results]
+
+    def retrieve_scored(self, query: str, top_k: int = 5, nprobe: Optional[int] = None, ef_search: Optional[int] = None, trace: Optional[dict] = None):
+        """
+        Performs a similarity search and returns ``(document, score)`` pairs,
+        best first. The score is the negated L2 distance, so higher is better.
+
+        When a ``trace`` dict is given, the embed and FAISS search timings are
+        recorded in it.
         """
         if not self.vector_store:
             # Attempt to load the index on-the-fly if it wasn't available at startup
@@ -36,5 +60,25 @@ class DocumentRetriever:
                 return {"error": "FAISS index is not available. Please process the documents first."}
             
         print(f"Retrieving documents for query: '{query}'")
-        results = self.vector_store.similarity_search(query, k=top_k)
+        with timed_stage(trace, "embed"):
+            query_vector = self.query_cache.get(query)[None, :]
+        params = search_parameters(
+            self.vector_store.index,
+            nprobe=nprobe or settings.DOCUMENT_SEARCH_NPROBE,
+            ef_search=ef_search or settings.DOCUMENT_SEARCH_EF,
+        )
+        with timed_stage(trace, "faiss"):
+            distances, indices = self.vector_store.index.search(query_vector, top_k, params=params)
+        results = [
+            (self.vector_store.docstore.search(self.vector_store.index_to_docstore_id[i]), -float(distance))
+            for distance, i in zip(distances[0], indices[0])
+            if i != -1
+        ]
         return results
+
+    async def aretrieve(self, query: str, top_k: int = 5, nprobe: Optional[int] = None, ef_search: Optional[int] = None):
+        """
+        Async variant of ``retrieve`` that runs query embedding and the FAISS
+        search in a worker thread, keeping the event loop free.
+        """
+        return await asyncio.to_thread(self.retrieve, query, top_k, nprobe, ef_search)
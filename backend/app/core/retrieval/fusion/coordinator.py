@@ -0,0 +1,112 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .fuser import Fuser
+
+# A leg is a zero-argument callable returning ``(item, score)`` pairs, best
+# first, or an ``{"error": ...}`` dict when its index is unavailable.
+Leg = Callable[[], Any]
+
+
+class RetrievalCoordinator:
+    """
+    Runs the retrieval legs (API, document) concurrently and fuses whatever
+    finished in time.
+
+    Each leg runs on a worker thread under its own timeout, measured from the
+    start of the request. A leg that times out, raises or reports an error is
+    left out of the fusion and the other legs' results are returned as a
+    partial result. Timed-out legs cannot be interrupted; they finish in the
+    background and their results are dropped.
+    """
+
+    def __init__(self, fuser: Fuser, timeouts: Optional[Dict[str, float]] = None, default_timeout: float = 5.0, max_workers: int = 8):
+        self.fuser = fuser
+        self.timeouts = dict(timeouts or {})
+        self.default_timeout = default_timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="retrieval-leg")
+
+    def _timeout(self, name: str) -> float:
+        return self.timeouts.get(name, self.default_timeout)
+
+    @staticmethod
+    def _timed(leg: Leg) -> Tuple[Any, float]:
+        start = time.perf_counter()
+        result = leg()
+        return result, (time.perf_counter() - start) * 1000
+
+    @staticmethod
+    def _leg_report(status: str, elapsed_ms: float, count: int = 0, error: Optional[str] = None) -> Dict[str, Any]:
+        report = {"status": status, "elapsed_ms": round(elapsed_ms, 2), "count": count}
+        if error is not None:
+            report["error"] = error
+        return report
+
+    def _settle(self, name: str, outcome, started: float):
+        """
+        Turns one leg's outcome (a ``(result, elapsed_ms)`` pair or an
+        exception) into its scored results and timing report.
+        """
+        if isinstance(outcome, (asyncio.TimeoutError, FutureTimeoutError)):
+            print(f"Retrieval leg '{name}' timed out after {self._timeout(name)}s; returning partial results.")
+            return [], self._leg_report("timeout", (time.perf_counter() - started) * 1000)
+        if isinstance(outcome, Exception):
+            print(f"Retrieval leg '{name}' failed: {outcome}")
+            return [], self._leg_report("error", (time.perf_counter() - started) * 1000, error=str(outcome))
+
+        result, elapsed_ms = outcome
+        if not isinstance(result, list):
+            error = result.get("error") if isinstance(result, dict) else str(result)
+            return [], self._leg_report("error", elapsed_ms, error=error)
+        return result, self._leg_report("ok", elapsed_ms, count=len(result))
+
+    def _fuse(self, names: List[str], settled, top_k: int, started: float) -> Dict[str, Any]:
+        legs = {name: report for name, (_, report) in zip(names, settled)}
+        fuse_start = time.perf_counter()
+        results = self.fuser.fuse_scored([scored for scored, _ in settled], top_k=top_k)
+        return {
+            "results": results,
+            "partial": any(report["status"] != "ok" for report in legs.values()),
+            "timings": {
+                "legs": legs,
+                "fusion_ms": round((time.perf_counter() - fuse_start) * 1000, 2),
+                "total_ms": round((time.perf_counter() - started) * 1000, 2),
+            },
+        }
+
+    def run(self, legs: Dict[str, Leg], top_k: int) -> Dict[str, Any]:
+        """
+        Runs the legs concurrently and returns the fused results together with
+        per-leg status and timings. Leg order sets the fuser weight order.
+        """
+        started = time.perf_counter()
+        futures = {name: self._executor.submit(self._timed, leg) for name, leg in legs.items()}
+        settled = []
+        for name, future in futures.items():
+            remaining = self._timeout(name) - (time.perf_counter() - started)
+            try:
+                outcome = future.result(timeout=max(0.0, remaining))
+            except Exception as e:
+                outcome = e
+            settled.append(self._settle(name, outcome, started))
+        return self._fuse(list(futures), settled, top_k, started)
+
+    async def arun(self, legs: Dict[str, Leg], top_k: int) -> Dict[str, Any]:
+        """
+        Async variant of ``run``; the event loop is never blocked by a leg.
+        """
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+
+        async def run_leg(name: str, leg: Leg):
+            future = loop.run_in_executor(self._executor, self._timed, leg)
+            try:
+                return await asyncio.wait_for(future, timeout=self._timeout(name))
+            except Exception as e:
+                return e
+
+        outcomes = await asyncio.gather(*(run_leg(name, leg) for name, leg in legs.items()))
+        settled = [self._settle(name, outcome, started) for name, outcome in zip(legs, outcomes)]
+        return self._fuse(list(legs), settled, top_k, started)
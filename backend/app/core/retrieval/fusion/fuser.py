@@ -1,22 +1,117 @@
-from typing import List, Dict, Any
+import hashlib
+import json
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+
+from app.core.config import settings
+
+FUSION_METHODS = ("rrf", "weighted")
+
+
+def content_key(item: Any) -> str:
+    """
+    Returns a content hash used to recognise the same result coming back from
+    several retrievers (or twice from one).
+    """
+    if hasattr(item, "page_content"):
+        payload = item.page_content
+    elif isinstance(item, dict):
+        payload = json.dumps(item, sort_keys=True, default=str)
+    else:
+        payload = str(item)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
 
 class Fuser:
-    def __init__(self):
-        print("Fuser initialized.")
+    """
+    Merges ranked result lists from several retrievers into one ranking.
+
+    - "rrf": reciprocal-rank fusion, ``sum(w_i / (rrf_k + rank_i))``. Needs
+      only ranks, so scores on different scales (cross-encoder logits vs.
+      FAISS distances) never have to be compared.
+    - "weighted": min-max normalizes each list's scores to [0, 1] and sums
+      them with per-retriever weights. Lists without scores fall back to a
+      linear rank score.
 
-    def fuse(self, results: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    Results with the same content are merged, accumulating their scores.
+    ``weights`` are aligned with the order of the lists passed to ``fuse``.
+    """
+
+    def __init__(self, method: Optional[str] = None, rrf_k: Optional[int] = None, weights: Optional[Sequence[float]] = None):
+        self.method = method or settings.FUSION_METHOD
+        if self.method not in FUSION_METHODS:
+            raise ValueError(f"Unknown fusion method '{self.method}'. Expected one of {FUSION_METHODS}")
+        self.rrf_k = rrf_k if rrf_k is not None else settings.FUSION_RRF_K
+        self.weights = list(weights) if weights is not None else list(settings.FUSION_WEIGHTS)
+        print(f"Fuser initialized ({self.method}).")
+
+    def candidate_depth(self, top_k: int) -> int:
+        """
+        Returns how many results each retriever needs to return for a fused
+        top_k. No list can place more than top_k items in the fused top_k,
+        so anything deeper is cut off rather than retrieved and reranked.
         """
-        Merges results from multiple retrievers.
-        
-        For now, this is a simple concatenation. In the future, this could involve
-        re-ranking, de-duplication, etc.
+        return max(1, top_k)
+
+    def _weight(self, position: int) -> float:
+        return self.weights[position] if position < len(self.weights) else 1.0
+
+    def fuse(self, results: List[List[Any]], top_k: Optional[int] = None) -> List[Any]:
         """
-        print(f"Fusing {len(results)} sets of results...")
-        
-        fused_results = []
+        Fuses plain ranked result lists (best first).
+        """
+        return self._fuse([(res_list, None) for res_list in results], top_k)
+
+    def fuse_scored(self, results: List[List[Tuple[Any, float]]], top_k: Optional[int] = None) -> List[Any]:
+        """
+        Fuses ranked ``(item, score)`` lists (best first, higher score is better).
+        """
+        lists = []
         for res_list in results:
-            # Ensure we are extending with a list, even if the retriever had an error
             if isinstance(res_list, list):
-                fused_results.extend(res_list)
-        
-        return fused_results
\ No newline at end of file
+                lists.append(([item for item, _ in res_list], [float(score) for _, score in res_list]))
+            else:
+                lists.append((res_list, None))
+        return self._fuse(lists, top_k)
+
+    def _fuse(self, lists, top_k: Optional[int]) -> List[Any]:
+        print(f"Fusing {len(lists)} sets of results ({self.method})...")
+        depth = self.candidate_depth(top_k) if top_k else None
+
+        fused_scores: Dict[str, float] = {}
+        first_seen: Dict[str, Tuple[int, int]] = {}
+        items: Dict[str, Any] = {}
+        for position, (res_list, scores) in enumerate(lists):
+            # Retrievers report failures as an error dict instead of a list
+            if not isinstance(res_list, list):
+                continue
+            res_list = res_list[:depth]
+            contributions = self._contributions(res_list, scores[:depth] if scores is not None else None)
+            weight = self._weight(position)
+            seen_in_list = set()
+            for rank, (item, contribution) in enumerate(zip(res_list, contributions)):
+                key = content_key(item)
+                if key in seen_in_list:
+                    continue
+                seen_in_list.add(key)
+                fused_scores[key] = fused_scores.get(key, 0.0) + weight * contribution
+                if key not in items:
+                    items[key] = item
+                    first_seen[key] = (rank, position)
+
+        ranked = sorted(fused_scores, key=lambda key: (-fused_scores[key], first_seen[key]))
+        if top_k:
+            ranked = ranked[:top_k]
+        return [items[key] for key in ranked]
+
+    def _contributions(self, res_list: List[Any], scores: Optional[List[float]]) -> List[float]:
+        """
+        Returns the per-rank contribution of one list before weighting.
+        """
+        if self.method == "rrf":
+            return [1.0 / (self.rrf_k + rank + 1) for rank in range(len(res_list))]
+        if scores is None:
+            return [1.0 - rank / len(res_list) for rank in range(len(res_list))]
+        low, high = min(scores, default=0.0), max(scores, default=0.0)
+        if high == low:
+            return [1.0] * len(scores)
+        return [(score - low) / (high - low) for score in scores]
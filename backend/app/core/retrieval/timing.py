@@ -0,0 +1,21 @@
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+
+@contextmanager
+def timed_stage(trace: Optional[dict], stage: str):
+    """
+    Adds the wall time of the block, in milliseconds, to
+    ``trace["timings_ms"][stage]``. A no-op when ``trace`` is None, so
+    retrievers can be instrumented without cost on the serving path.
+    """
+    if trace is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings = trace.setdefault("timings_ms", {})
+        timings[stage] = timings.get(stage, 0.0) + (time.perf_counter() - start) * 1000
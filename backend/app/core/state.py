@@ -1,6 +1,8 @@
 from enum import Enum
+import fcntl
 import json
 import os
+from contextlib import contextmanager
 from threading import Lock
 from app.core.config import settings
 
@@ -11,6 +13,14 @@ class ProcessingStatus(str, Enum):
     ERROR = "ERROR"
 
 class ProcessingStateManager:
+    """
+    Tracks the indexing status of each source.
+
+    The state file is the source of truth shared by every worker process:
+    reads pick up changes made by other processes (detected through the file's
+    mtime), and writes are read-modify-write cycles under an exclusive file
+    lock, replacing the file atomically.
+    """
     _instance = None
     _lock = Lock()
 
@@ -19,26 +29,63 @@ class ProcessingStateManager:
             if cls._instance is None:
                 cls._instance = super().__new__(cls)
                 cls._instance.states = {}
+                cls._instance._mtime = None
                 cls._instance._load_state_from_disk()
         return cls._instance
 
+    @contextmanager
+    def _file_lock(self):
+        """
+        Holds an exclusive, cross-process lock on the state file.
+        """
+        os.makedirs(os.path.dirname(settings.STATE_FILE), exist_ok=True)
+        with self._lock, open(settings.STATE_FILE + ".lock", "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
     def _load_state_from_disk(self):
         if os.path.exists(settings.STATE_FILE):
             with open(settings.STATE_FILE, 'r') as f:
                 try:
                     data = json.load(f)
                     self.states = {k: ProcessingStatus(v) for k, v in data.items()}
-                except (json.JSONDecodeError, TypeError):
+                    self._mtime = os.fstat(f.fileno()).st_mtime_ns
+                except (json.JSONDecodeError, TypeError, ValueError):
                     self._initialize_default_state()
         else:
             self._initialize_default_state()
         print(f"Initial state loaded: {self.states}")
 
+    def _refresh_from_disk(self):
+        """
+        Reloads the state if another process has written it since our last read.
+        """
+        try:
+            mtime = os.stat(settings.STATE_FILE).st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime == self._mtime:
+            return
+        with open(settings.STATE_FILE, 'r') as f:
+            try:
+                data = json.load(f)
+            except json.JSONDecodeError:
+                # A writer replaced the file mid-read; keep the last good state
+                return
+        self.states = {k: ProcessingStatus(v) for k, v in data.items()}
+        self._mtime = mtime
+
     def _save_state_to_disk(self):
-        with open(settings.STATE_FILE, 'w') as f:
+        tmp_path = settings.STATE_FILE + ".tmp"
+        with open(tmp_path, 'w') as f:
             # Convert Enum members to their string values for JSON serialization
             data_to_save = {k: v.value for k, v in self.states.items()}
             json.dump(data_to_save, f, indent=4)
+        os.replace(tmp_path, settings.STATE_FILE)
+        self._mtime = os.stat(settings.STATE_FILE).st_mtime_ns
 
     def _initialize_default_state(self):
         self.states = {
@@ -48,13 +95,31 @@ class ProcessingStateManager:
         self._save_state_to_disk()
 
     def get_status(self, source: str) -> ProcessingStatus:
+        self._refresh_from_disk()
         return self.states.get(source, ProcessingStatus.UNPROCESSED)
 
     def set_status(self, source: str, status: ProcessingStatus):
-        if source in self.states:
-            print(f"Updating status for '{source}' to '{status.value}'")
-            self.states[source] = status
+        with self._file_lock():
+            self._refresh_from_disk()
+            if source in self.states:
+                print(f"Updating status for '{source}' to '{status.value}'")
+                self.states[source] = status
+                self._save_state_to_disk()
+
+    def begin_processing(self, source: str):
+        """
+        Atomically moves a source to PROCESSING unless another process already
+        did. Returns the previous status, or None if processing is in progress.
+        """
+        with self._file_lock():
+            self._refresh_from_disk()
+            previous = self.states.get(source, ProcessingStatus.UNPROCESSED)
+            if previous == ProcessingStatus.PROCESSING or source not in self.states:
+                return None
+            print(f"Updating status for '{source}' to '{ProcessingStatus.PROCESSING.value}'")
+            self.states[source] = ProcessingStatus.PROCESSING
             self._save_state_to_disk()
+            return previous
 
 # Singleton instance
-state_manager = ProcessingStateManager()
\ No newline at end of file
+state_manager = ProcessingStateManager()
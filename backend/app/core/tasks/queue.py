@@ -3,6 +3,7 @@ Modern task queue system using Redis and asyncio.
 Lightweight alternative to Celery for our use case.
 """
 import asyncio
+import inspect
 import json
 import uuid
 from datetime import datetime, timedelta
@@ -246,6 +247,11 @@ class TaskQueue:
             args = task_data["args"]
             kwargs = task_data["kwargs"]
             
+            # Tasks that declare a task_id parameter get their own id, e.g. to
+            # report progress against it
+            if "task_id" in inspect.signature(task_func).parameters:
+                kwargs = {**kwargs, "task_id": task_id}
+            
             if asyncio.iscoroutinefunction(task_func):
                 result = await task_func(*args, **kwargs)
             else:
@@ -7,8 +7,11 @@ from datetime import datetime, timedelta
 from typing import Dict, Any, List
 import httpx
 
-from app.core.tasks.queue import task_queue
+from app.core.tasks.queue import task_queue, TaskStatus
+from app.core.cache import advanced_cache, index_tag
 from app.core.config import settings
+from app.core.progress import progress_manager, ProgressStatus
+from app.core.state import state_manager, ProcessingStatus
 
 
 @task_queue.register_task("test_task")
@@ -18,6 +21,104 @@ async def test_task(message: str, delay: int = 1) -> str:
     return f"Task completed: {message} at {datetime.utcnow()}"
 
 
+DOCUMENT_INDEXING_STEPS = [
+    {"step_id": "load", "name": "Load document"},
+    {"step_id": "split", "name": "Split into chunks"},
+    {"step_id": "embed", "name": "Embed chunks", "weight": 8.0},
+    {"step_id": "write", "name": "Write FAISS index"},
+]
+
+API_INDEXING_STEPS = [
+    {"step_id": "load", "name": "Load API specification"},
+    {"step_id": "tokenize", "name": "Tokenize endpoints", "weight": 4.0},
+    {"step_id": "build", "name": "Build bitmap and TF-IDF indices", "weight": 2.0},
+    {"step_id": "write", "name": "Write index build"},
+]
+
+
+async def _run_indexing_job(task_id: str, source: str, operation_name: str, steps: List[Dict[str, Any]], run_indexer):
+    """
+    Runs a blocking indexer in a worker thread, mirroring its phases onto a
+    ProgressTracker (whose operation id is the task id) and the task's progress.
+    """
+    loop = asyncio.get_running_loop()
+    tracker = progress_manager.create_tracker(operation_name, "indexing", operation_id=task_id)
+    tracker.add_steps(steps)
+    tracker.metadata["source"] = source
+
+    async def report_task_progress(metrics):
+        await task_queue.update_task_status(task_id, TaskStatus.RUNNING, progress=int(metrics.total_progress))
+
+    tracker.add_progress_callback(report_task_progress)
+    current_phase = None
+
+    async def on_phase(phase: str, progress: float):
+        nonlocal current_phase
+        if phase != current_phase:
+            if current_phase is not None:
+                await tracker.complete_step(current_phase)
+            current_phase = phase
+        await tracker.update_step_progress(phase, progress, status=ProgressStatus.RUNNING)
+
+    def progress_callback(phase: str, progress: float):
+        # Called from the indexer thread; wait so phases are reported in order
+        try:
+            asyncio.run_coroutine_threadsafe(on_phase(phase, progress), loop).result()
+        except Exception as e:
+            print(f"Error reporting {source} indexing progress: {e}")
+
+    try:
+        await tracker.start()
+        succeeded = await asyncio.to_thread(run_indexer, progress_callback)
+    except Exception as e:
+        state_manager.set_status(source, ProcessingStatus.ERROR)
+        await tracker.fail(str(e))
+        raise
+
+    if not succeeded:
+        await tracker.fail(f"{operation_name} failed")
+        raise Exception(f"{operation_name} failed")
+
+    # Results retrieved from the previous index build are now stale
+    await advanced_cache.invalidate_tags([index_tag(source)])
+
+    result = {
+        "source": source,
+        "status": state_manager.get_status(source).value,
+        "completed_at": datetime.utcnow().isoformat(),
+    }
+    await tracker.complete(result)
+    return result
+
+
+@task_queue.register_task("index_document")
+async def index_document(task_id: str) -> Dict[str, Any]:
+    """Build the FAISS index for the user guide."""
+    from app.core.processing.document.indexer import DocumentIndexer
+
+    return await _run_indexing_job(
+        task_id,
+        "document",
+        "Document indexing",
+        DOCUMENT_INDEXING_STEPS,
+        lambda progress_callback: DocumentIndexer().index(progress_callback=progress_callback),
+    )
+
+
+@task_queue.register_task("index_api_spec")
+async def index_api_spec(task_id: str, incremental: bool = True) -> Dict[str, Any]:
+    """Build or incrementally update the API specification index."""
+    from app.core.processing.api.indexer import ApiIndexer
+
+    return await _run_indexing_job(
+        task_id,
+        "api",
+        "API spec indexing",
+        API_INDEXING_STEPS,
+        lambda progress_callback: ApiIndexer().index(incremental=incremental, progress_callback=progress_callback),
+    )
+
+
 @task_queue.register_task("process_document")
 async def process_document(file_path: str, user_id: str) -> Dict[str, Any]:
     """Process a document upload."""
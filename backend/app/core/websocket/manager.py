@@ -39,6 +39,7 @@ class MessageType(Enum):
     # Agent communication
     AGENT_QUERY = "agent_query"
     AGENT_RESPONSE = "agent_response"
+    AGENT_RESPONSE_CHUNK = "agent_response_chunk"
     AGENT_THINKING = "agent_thinking"
     AGENT_ERROR = "agent_error"
     
@@ -402,11 +403,9 @@ class WebSocketManager:
             await connection.send_message(error_message)
             return
         
-        # Forward to agent system (would integrate with actual agent)
         query = message.data.get("query", "")
         agent_type = message.data.get("agent_type", "augment")
         
-        # Simulate agent processing
         thinking_message = WebSocketMessage(
             type=MessageType.AGENT_THINKING,
             data={
@@ -419,24 +418,68 @@ class WebSocketManager:
         )
         await connection.send_message(thinking_message)
         
-        # This would integrate with your actual agent system
-        # For now, send a mock response
-        await asyncio.sleep(2)  # Simulate processing time
+        try:
+            agent = self._get_agent(agent_type)
+            from app.core.agents.base.response import AgentRequest
+            request = AgentRequest(
+                query=query,
+                context=message.data.get("context"),
+                session_id=message.data.get("session_id"),
+                options=message.data.get("options")
+            )
+            
+            # Each answer chunk goes out as soon as the agent produces it; the
+            # final AGENT_RESPONSE carries the complete answer and replaces them
+            chunk_count = 0
+            
+            async def send_chunk(delta: str) -> None:
+                nonlocal chunk_count
+                chunk_message = WebSocketMessage(
+                    type=MessageType.AGENT_RESPONSE_CHUNK,
+                    data={"delta": delta, "index": chunk_count},
+                    correlation_id=message.correlation_id,
+                    user_id=connection.user_id
+                )
+                chunk_count += 1
+                await connection.send_message(chunk_message)
+                self.stats["messages_sent"] += 1
+            
+            stream = message.data.get("stream", True)
+            response = await agent.process(request, on_token=send_chunk if stream else None)
+        except Exception as e:
+            error_message = WebSocketMessage(
+                type=MessageType.AGENT_ERROR,
+                data={"query": query, "agent_type": agent_type, "error": str(e)},
+                correlation_id=message.correlation_id,
+                user_id=connection.user_id
+            )
+            await connection.send_message(error_message)
+            return
         
         response_message = WebSocketMessage(
             type=MessageType.AGENT_RESPONSE,
             data={
                 "query": query,
                 "agent_type": agent_type,
-                "response": f"Mock response to: {query}",
-                "reasoning": ["Step 1: Analyzed query", "Step 2: Generated response"],
-                "sources": []
+                "response": response.answer,
+                "reasoning": [step.content for step in response.reasoning_chain],
+                "sources": [source.model_dump(mode="json") for source in response.sources],
+                "confidence": response.confidence,
+                "metadata": response.model_dump(mode="json")["metadata"],
+                "chunks": chunk_count
             },
             correlation_id=message.correlation_id,
             user_id=connection.user_id
         )
         await connection.send_message(response_message)
     
+    def _get_agent(self, agent_type: str) -> Any:
+        """Resolve the agent that serves queries of the given type."""
+        if agent_type == "augment":
+            from app.api.v1.endpoints.agents import get_augment_agent
+            return get_augment_agent()
+        raise ValueError(f"Unknown agent type: {agent_type}")
+    
     async def _handle_custom_message(self, connection: WebSocketConnection, message: WebSocketMessage):
         """Handle custom message types."""
         # Log or process custom messages as needed
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark the API candidate scorer against the original per-document loop.
+
+Builds an in-memory roaring inverted index from the Infraon OpenAPI spec
+(user_docs/infraon-openapi.yaml) the same way ApiIndexer does, then times
+both candidate-scoring implementations over a set of representative queries
+and checks that they return the same candidates.
+
+Usage:
+    python benchmarks/api_candidates_benchmark.py [--repeat N] [--top-k K]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from pyroaring import BitMap as Roaring
+
+# Add backend to sys.path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core.processing.api.openapi import load_openapi_endpoints
+from app.core.processing.api.tokenizers import CanonicalTokenizer
+from app.core.retrieval.api.candidates import BitmapCandidateScorer
+
+SPEC_PATH = Path(__file__).resolve().parents[2] / "user_docs" / "infraon-openapi.yaml"
+
+QUERIES = [
+    "get incident by id",
+    "list all open incidents",
+    "create a new change request",
+    "update asset details",
+    "delete user group",
+    "get id",
+    "search service catalogue items",
+    "problem ticket attachments",
+    "retrieve sla policy for a request",
+    "export report as csv",
+]
+
+
+def build_inverted_index(endpoints, tokenizer):
+    inverted_index = defaultdict(Roaring)
+    for doc_id, endpoint in enumerate(endpoints):
+        full_text = " ".join([
+            endpoint["path"],
+            endpoint["operationId"],
+            " ".join(endpoint["tags"]),
+            endpoint["summary"],
+            endpoint["description"],
+        ])
+        tokens = set(tokenizer.tokenize(full_text))
+        if endpoint["operationId"]:
+            tokens.add(endpoint["operationId"])
+        for token in tokens:
+            inverted_index[token].add(doc_id)
+    return dict(inverted_index)
+
+
+def loop_candidates(inverted_index, query_tokens, top_k):
+    """
+    The original ApiRetriever._get_candidates scoring loop.
+    """
+    token_bitmaps = [inverted_index.get(token, Roaring()) for token in query_tokens]
+
+    candidate_scores = defaultdict(int)
+    intersection_bitmap = Roaring.intersection(*token_bitmaps)
+    for doc_id in intersection_bitmap:
+        candidate_scores[doc_id] += 100
+
+    union_bitmap = Roaring.union(*token_bitmaps)
+    for doc_id in union_bitmap:
+        for token_bitmap in token_bitmaps:
+            if doc_id in token_bitmap:
+                candidate_scores[doc_id] += 1
+
+    sorted_candidates = sorted(candidate_scores.items(), key=lambda item: item[1], reverse=True)
+    return [doc_id for doc_id, score in sorted_candidates[:top_k]]
+
+
+def time_calls(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=200, help="Timed runs per query")
+    parser.add_argument("--top-k", type=int, default=20, help="Candidates returned per query")
+    args = parser.parse_args()
+
+    tokenizer = CanonicalTokenizer()
+    endpoints = load_openapi_endpoints(SPEC_PATH)
+    inverted_index = build_inverted_index(endpoints, tokenizer)
+    scorer = BitmapCandidateScorer(inverted_index)
+    print(f"Indexed {len(endpoints)} endpoints, {len(inverted_index)} tokens from {SPEC_PATH.name}\n")
+
+    print(f"{'query':<40} {'union':>6} {'loop ms':>9} {'scorer ms':>10} {'speedup':>8}")
+    print("-" * 77)
+    loop_total = scorer_total = 0.0
+    for query in QUERIES:
+        query_tokens = tokenizer.tokenize(query)
+        union = Roaring.union(*[inverted_index.get(t, Roaring()) for t in query_tokens])
+
+        expected = loop_candidates(inverted_index, query_tokens, args.top_k)
+        actual = scorer.top_k(query_tokens, args.top_k)
+        if expected != actual:
+            print(f"MISMATCH for '{query}': loop={expected} scorer={actual}")
+            return 1
+
+        loop_ms = statistics.median(time_calls(lambda: loop_candidates(inverted_index, query_tokens, args.top_k), args.repeat))
+        scorer_ms = statistics.median(time_calls(lambda: scorer.top_k(query_tokens, args.top_k), args.repeat))
+        loop_total += loop_ms
+        scorer_total += scorer_ms
+        print(f"{query:<40} {len(union):>6} {loop_ms:>9.3f} {scorer_ms:>10.3f} {loop_ms / scorer_ms:>7.1f}x")
+
+    print("-" * 77)
+    print(f"{'total (median per query)':<40} {'':>6} {loop_total:>9.3f} {scorer_total:>10.3f} {loop_total / scorer_total:>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark cache value encodings: payload size and encode/decode time.
+
+Compares the legacy CacheManager JSON text format (model_dump_json on write,
+json.loads on read) against every CacheCodec combination available in this
+environment, on the service registry (processed_data/service_registry/
+current_registry.json, with its services varied and replicated to --services entries)
+and on a typical AgentResponse.
+
+Usage:
+    python benchmarks/cache_codec_benchmark.py [--services N] [--repeat N]
+"""
+
+import argparse
+import copy
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add backend to sys.path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core.agents.base.response import AgentResponse, ReasoningStep, ReasoningStepType, Source
+from app.core.cache.codecs import COMPRESSORS, SERIALIZERS, CacheCodec
+from app.core.cache_manager import CacheManager
+from app.core.manoman.models.service_registry import ServiceRegistry
+
+REGISTRY_PATH = Path(__file__).resolve().parents[1] / "processed_data" / "service_registry" / "current_registry.json"
+
+
+def load_registry(services):
+    data = json.loads(REGISTRY_PATH.read_text())
+    templates = list(data["services"].values())
+    data["services"] = {}
+    for i in range(services):
+        # Shuffle text per copy so compression is not flattered by identical services
+        rng = random.Random(i)
+        service = copy.deepcopy(templates[i % len(templates)])
+        service["service_name"] = f"{service['service_name']}_{i}"
+        for field in ("service_description", "business_context"):
+            words = service[field].split()
+            rng.shuffle(words)
+            service[field] = " ".join(words)
+        service["keywords"] = [f"{keyword} {rng.randrange(10000)}" for keyword in service["keywords"]]
+        for tier in ("tier1_operations", "tier2_operations"):
+            service[tier] = {f"{name}_{i}": operation for name, operation in service[tier].items()}
+        data["services"][service["service_name"]] = service
+    data["total_services"] = services
+    return ServiceRegistry.model_validate(data)
+
+
+def sample_response():
+    return AgentResponse(
+        answer=(
+            "To raise a new incident, open the Service Desk, choose Incidents and click New. "
+            "Fill in the requester, impact and urgency; the priority is derived from the matrix. "
+        ) * 6,
+        sources=[
+            Source(type="document", content="Incident management guide, section 3.2 " * 20,
+                   reference=f"user_docs/incident_management_{i}.md", confidence=0.82)
+            for i in range(5)
+        ],
+        reasoning_chain=[
+            ReasoningStep(step_type=step_type, content=f"{step_type.value}: matched the incident guide", confidence=0.8)
+            for step_type in ReasoningStepType
+        ],
+        confidence=0.87,
+        metadata={"model": "default", "tokens": 812, "latency_ms": 1432.5}
+    )
+
+
+def time_calls(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def bench(name, value, model, repeat):
+    print(f"{name}")
+    print(f"{'encoding':<16} {'bytes':>10} {'ratio':>7} {'encode ms':>10} {'decode ms':>10}")
+    print("-" * 57)
+
+    legacy = CacheManager._serialize(value)
+    legacy_size = len(legacy.encode("utf-8"))
+    encode_ms = time_calls(lambda: CacheManager._serialize(value), repeat)
+    decode_ms = time_calls(lambda: model.model_validate(json.loads(legacy)), repeat)
+    print(f"{'legacy json':<16} {legacy_size:>10} {1.0:>6.2f}x {encode_ms:>10.3f} {decode_ms:>10.3f}")
+
+    for serializer in SERIALIZERS:
+        for compressor in COMPRESSORS:
+            codec = CacheCodec(serializer, compressor)
+            payload = codec.encode(value)
+            if codec.decode(payload, model=model) != model.model_validate(json.loads(legacy)):
+                print(f"MISMATCH for {codec.name}")
+                return 1
+            encode_ms = time_calls(lambda: codec.encode(value), repeat)
+            decode_ms = time_calls(lambda: codec.decode(payload, model=model), repeat)
+            print(f"{codec.name:<16} {len(payload):>10} {legacy_size / len(payload):>6.2f}x "
+                  f"{encode_ms:>10.3f} {decode_ms:>10.3f}")
+    print()
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--services", type=int, default=200, help="Services in the benchmarked registry")
+    parser.add_argument("--repeat", type=int, default=50, help="Timed runs per encoding")
+    args = parser.parse_args()
+
+    missing = [name for name in ("orjson", "msgpack") if name not in SERIALIZERS]
+    missing += [name for name in ("zstd", "lz4") if name not in COMPRESSORS]
+    if missing:
+        print(f"Not installed, skipped: {', '.join(missing)}\n")
+
+    status = bench(f"ServiceRegistry ({args.services} services)", load_registry(args.services), ServiceRegistry,
+                   args.repeat)
+    status |= bench("AgentResponse", sample_response(), AgentResponse, args.repeat * 10)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
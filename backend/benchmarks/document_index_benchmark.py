@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Benchmark recall and latency of the document FAISS index types against flat.
+
+Uses the chunk vectors in the document embedding cache
+(processed_data/document/embedding_cache) when the user guide has been
+indexed, otherwise clustered random vectors with the bge-m3 dimension. Query
+vectors are perturbed copies of random base vectors. Every index type and
+quantization is compared with exact flat search for recall@k, median and p95
+query latency and serialized index size, sweeping nprobe / efSearch.
+
+Usage:
+    python benchmarks/document_index_benchmark.py [--synthetic N] [--queries Q] [--top-k K]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import faiss
+import numpy as np
+
+# Add backend to sys.path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core.config import settings
+from app.core.processing.document.embeddings import EmbeddingCache
+from app.core.processing.document.faiss_index import build_faiss_index, search_parameters
+
+CONFIGS = [
+    ("flat", "fp16"),
+    ("flat", "int8"),
+    ("ivf_flat", "none"),
+    ("ivf_flat", "int8"),
+    ("hnsw", "none"),
+    ("hnsw", "fp16"),
+    ("ivf_pq", "none"),
+]
+NPROBES = (1, 4, 16, 64)
+EF_SEARCHES = (16, 64, 256)
+
+
+def load_vectors(synthetic: int, dim: int, seed: int):
+    """
+    Returns (vectors, description): cached document vectors, or synthetic
+    clustered vectors when the cache is empty or synthetic data was requested.
+    """
+    if not synthetic:
+        cache = EmbeddingCache(str(Path(settings.PROCESSED_DATA_DIR) / "document" / "embedding_cache"), settings.EMBEDDING_MODEL)
+        if len(cache):
+            return cache.get_many(list(cache.rows)), f"{len(cache)} cached {settings.EMBEDDING_MODEL} chunk vectors"
+        print("Embedding cache is empty; falling back to synthetic vectors.")
+        synthetic = 20000
+
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((max(1, synthetic // 100), dim)).astype(np.float32)
+    vectors = centers[rng.integers(len(centers), size=synthetic)] + 0.5 * rng.standard_normal((synthetic, dim)).astype(np.float32)
+    return vectors, f"{synthetic} synthetic {dim}-d vectors"
+
+
+def make_queries(vectors: np.ndarray, count: int, seed: int):
+    rng = np.random.default_rng(seed + 1)
+    picks = vectors[rng.integers(len(vectors), size=count)]
+    noise = rng.standard_normal(picks.shape).astype(np.float32) * float(np.std(vectors)) * 0.1
+    return np.ascontiguousarray(picks + noise, dtype=np.float32)
+
+
+def run_queries(index, queries, top_k, params):
+    """
+    Searches one query at a time, as the retrieve endpoint does, and returns
+    (result ids, per-query latencies in ms).
+    """
+    ids = np.empty((len(queries), top_k), dtype=np.int64)
+    timings = []
+    for row, query in enumerate(queries):
+        start = time.perf_counter()
+        _, found = index.search(query[None, :], top_k, params=params)
+        timings.append((time.perf_counter() - start) * 1000)
+        ids[row] = found[0]
+    return ids, timings
+
+
+def recall_at_k(found: np.ndarray, truth: np.ndarray):
+    hits = sum(len(set(f) & set(t)) for f, t in zip(found, truth))
+    return hits / truth.size
+
+
+def report_row(label, knob, found, truth, timings, size_mb):
+    p95 = np.percentile(timings, 95)
+    print(f"{label:<18} {knob:>10} {recall_at_k(found, truth):>8.3f} {statistics.median(timings):>8.3f} {p95:>8.3f} {size_mb:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--synthetic", type=int, default=0, help="Use N synthetic vectors instead of the embedding cache")
+    parser.add_argument("--dim", type=int, default=1024, help="Dimension of synthetic vectors")
+    parser.add_argument("--queries", type=int, default=200, help="Number of queries")
+    parser.add_argument("--top-k", type=int, default=10, help="Neighbours retrieved per query")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    vectors, description = load_vectors(args.synthetic, args.dim, args.seed)
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    queries = make_queries(vectors, args.queries, args.seed)
+    top_k = min(args.top_k, len(vectors))
+    print(f"Benchmarking {description}, {len(queries)} queries, recall@{top_k} against flat\n")
+
+    header = f"{'index':<18} {'knob':>10} {'recall':>8} {'p50 ms':>8} {'p95 ms':>8} {'size MB':>9}"
+    print(header)
+    print("-" * len(header))
+
+    flat = build_faiss_index(vectors, "flat", "none")
+    truth, timings = run_queries(flat, queries, top_k, None)
+    report_row("flat", "-", truth, truth, timings, faiss.serialize_index(flat).nbytes / 2**20)
+
+    for index_type, quantization in CONFIGS:
+        index = build_faiss_index(
+            vectors, index_type, quantization,
+            nlist=settings.DOCUMENT_IVF_NLIST, hnsw_m=settings.DOCUMENT_HNSW_M, pq_m=settings.DOCUMENT_PQ_M,
+        )
+        size_mb = faiss.serialize_index(index).nbytes / 2**20
+        label = index_type if quantization == "none" else f"{index_type}/{quantization}"
+        if index_type in ("ivf_flat", "ivf_pq"):
+            sweep = [(f"nprobe={n}", search_parameters(index, nprobe=n)) for n in NPROBES]
+        elif index_type == "hnsw":
+            sweep = [(f"ef={ef}", search_parameters(index, ef_search=ef)) for ef in EF_SEARCHES]
+        else:
+            sweep = [("-", None)]
+        for knob, params in sweep:
+            found, timings = run_queries(index, queries, top_k, params)
+            report_row(label, knob, found, truth, timings, size_mb)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
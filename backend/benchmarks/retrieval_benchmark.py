@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Offline latency and relevance benchmark for the API and document retrievers.
+
+Runs a labeled query set through ApiRetriever and DocumentRetriever using the
+published indexes under PROCESSED_DATA_DIR. Reports p50/p95/p99 latency per
+stage (tokenize, candidates, rerank / embed, faiss) and recall@k, MRR and
+first-stage candidate recall. Results are written as JSON; pass a previous
+results file with --compare to print the difference between the two runs.
+
+The query set defaults to benchmarks/retrieval_queries.json. --registry adds
+queries seeded from the TestSuite that TestingAgent generates for a service
+registry, labeled with the endpoints of the expected operation or service.
+
+Usage:
+    python benchmarks/retrieval_benchmark.py [--legs api document] [--k 1 5 10]
+        [--num-candidates N] [--nprobe N] [--ef-search N] [--repeat N] [--cold]
+        [--queries FILE] [--registry FILE] [--output FILE] [--compare FILE]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add backend to sys.path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core.retrieval.benchmark import (
+    API,
+    DOCUMENT,
+    PERCENTILES,
+    RetrievalBenchmark,
+    compare_results,
+    labeled_queries_from_test_suite,
+    load_labeled_queries,
+    load_results,
+    save_results,
+)
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+DEFAULT_QUERIES = BENCHMARK_DIR / "retrieval_queries.json"
+
+
+def registry_queries(registry_path: Path):
+    """
+    Seeds labeled queries from the TestSuite generated for a service registry.
+    """
+    from app.core.manoman.agents.testing_agent import TestingAgent
+    from app.core.manoman.models.service_registry import ServiceRegistry
+
+    with open(registry_path, "r", encoding="utf-8") as f:
+        registry = ServiceRegistry(**json.load(f))
+    agent = TestingAgent(llm_service=None, query_classifier=None, api_client=None)
+    test_suite = asyncio.run(agent.generate_test_suite(registry))
+    return labeled_queries_from_test_suite(test_suite, registry)
+
+
+def print_leg(leg: str, report: dict, comparison: dict = None):
+    print(f"\n[{leg}]")
+    if "error" in report:
+        print(f"  error: {report['error']}")
+        return
+    deltas = (comparison or {}).get(leg, {})
+    width = 22 if deltas else 12
+    header = "".join(f"{f'p{p} ms':>{width}}" for p in PERCENTILES)
+    print(f"  {'stage':<12}{header}")
+    for stage, summary in report["latency_ms"].items():
+        row = ""
+        for percentile in PERCENTILES:
+            cell = f"{summary[f'p{percentile}']:.3f}"
+            delta = deltas.get("latency_ms", {}).get(stage, {}).get(f"p{percentile}")
+            if delta is not None:
+                cell += f" ({delta:+.3f})"
+            row += f"{cell:>{width}}"
+        print(f"  {stage:<12}{row}")
+
+    print(f"  evaluated queries: {report['quality']['evaluated']}")
+    for metric, value in report["quality"].items():
+        if metric == "evaluated":
+            continue
+        delta = deltas.get("quality", {}).get(metric)
+        suffix = f" ({delta:+.4f})" if delta is not None else ""
+        print(f"  {metric:<18}{value:.4f}{suffix}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--legs", nargs="+", choices=(API, DOCUMENT), default=[API, DOCUMENT], help="Retrievers to benchmark")
+    parser.add_argument("--k", nargs="+", type=int, default=[1, 5, 10], help="Cutoffs for recall@k")
+    parser.add_argument("--num-candidates", type=int, default=None, help="First-stage candidates sent to the reranker")
+    parser.add_argument("--nprobe", type=int, default=None, help="IVF lists probed per document query")
+    parser.add_argument("--ef-search", type=int, default=None, help="HNSW search breadth per document query")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per query")
+    parser.add_argument("--cold", action="store_true", help="Clear the rerank and query embedding caches before every timed run")
+    parser.add_argument("--queries", type=Path, default=DEFAULT_QUERIES, help="Labeled query set (JSON list)")
+    parser.add_argument("--registry", type=Path, default=None, help="Also seed queries from this service registry JSON")
+    parser.add_argument("--output", type=Path, default=None, help="Results file (default: benchmarks/results/retrieval-<timestamp>.json)")
+    parser.add_argument("--compare", type=Path, default=None, help="Previous results file to compare against")
+    args = parser.parse_args()
+
+    queries = load_labeled_queries(str(args.queries)) if args.queries else []
+    if args.registry:
+        seeded = registry_queries(args.registry)
+        print(f"Seeded {len(seeded)} queries from the test suite for {args.registry}.")
+        queries.extend(seeded)
+    if not queries:
+        print("No labeled queries to run.")
+        return 1
+
+    api_retriever = document_retriever = None
+    if API in args.legs:
+        from app.core.retrieval.api.retriever import ApiRetriever
+        api_retriever = ApiRetriever()
+    if DOCUMENT in args.legs:
+        from app.core.retrieval.document.retriever import DocumentRetriever
+        document_retriever = DocumentRetriever()
+
+    benchmark = RetrievalBenchmark(
+        api_retriever=api_retriever,
+        document_retriever=document_retriever,
+        k_values=args.k,
+        num_candidates=args.num_candidates,
+        nprobe=args.nprobe,
+        ef_search=args.ef_search,
+        repeat=args.repeat,
+        cold=args.cold,
+    )
+    results = benchmark.run(queries)
+
+    output = args.output or BENCHMARK_DIR / "results" / f"retrieval-{datetime.utcnow():%Y%m%dT%H%M%S}.json"
+    save_results(results, str(output))
+
+    comparison = None
+    if args.compare:
+        comparison = compare_results(load_results(str(args.compare)), results)
+        results["comparison"] = {"baseline": str(args.compare), **comparison}
+        save_results(results, str(output))
+
+    print(f"\n{len(queries)} queries, config: {json.dumps(results['config'])}")
+    for leg in (API, DOCUMENT):
+        if leg in results:
+            print_leg(leg, results[leg], comparison)
+    print(f"\nResults written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+"""
+Tests for incremental token accounting, summarization and shared storage in
+AgentMemory.
+"""
+
+import pytest
+
+from app.core.agents.base.memory import AgentMemory
+from app.core.agents.base.memory_store import RedisMemoryStore
+from app.core.agents.base.response import AgentRequest, AgentResponse
+
+
+class CountingTokenizer:
+    """Counts whitespace-separated words and records every text it encodes"""
+
+    def __init__(self):
+        self.texts = []
+
+    def __call__(self, text):
+        self.texts.append(text)
+        return len(text.split())
+
+
+class FakeCacheManager:
+    """Dict-backed stand-in for the Redis CacheManager"""
+
+    def __init__(self):
+        self.data = {}
+        self.expiry = {}
+
+    async def get(self, key, prefix="cache", default=None):
+        return self.data.get(f"{prefix}:{key}", default)
+
+    async def set(self, key, value, expire=None, prefix="cache"):
+        self.data[f"{prefix}:{key}"] = value
+        self.expiry[f"{prefix}:{key}"] = expire
+        return True
+
+    async def delete(self, key, prefix="cache"):
+        return self.data.pop(f"{prefix}:{key}", None) is not None
+
+
+def add(memory, query, answer):
+    memory.add_exchange(AgentRequest(query=query), AgentResponse(answer=answer))
+
+
+class TestTokenAccounting:
+    """Test cases for AgentMemory token accounting"""
+
+    def test_running_total_matches_context(self):
+        tokenizer = CountingTokenizer()
+        memory = AgentMemory(max_tokens=1000, token_counter=tokenizer)
+
+        for i in range(20):
+            add(memory, f"question {i}", f"answer number {i}")
+
+        assert memory.total_tokens == tokenizer(memory.get_context_string())
+
+    def test_each_exchange_is_encoded_once(self):
+        tokenizer = CountingTokenizer()
+        memory = AgentMemory(max_tokens=30, token_counter=tokenizer)
+        tokenizer.texts.clear()
+
+        for i in range(50):
+            add(memory, f"question {i}", f"answer number {i}")
+
+        # Trimming evicts old exchanges without encoding the history again
+        assert len(tokenizer.texts) == 50
+        assert memory.total_tokens <= 30
+
+    def test_trims_oldest_first(self):
+        memory = AgentMemory(max_tokens=14, token_counter=CountingTokenizer())
+
+        for i in range(4):
+            add(memory, f"q {i}", f"a {i}")
+
+        # Each exchange is "Human: q i Assistant: a i", six words
+        assert [e.request.query for e in memory.conversation_history] == ["q 2", "q 3"]
+        assert [e.request.query for e in memory.get_recent_exchanges(1)] == ["q 3"]
+
+    def test_clear_resets_total(self):
+        memory = AgentMemory(max_tokens=100, token_counter=CountingTokenizer())
+        add(memory, "q", "a")
+        memory.clear()
+        assert memory.total_tokens == 0
+        assert memory.get_context_string() == ""
+
+
+class TestSummarization:
+    """Test cases for summarizing evicted exchanges"""
+
+    def test_evicted_exchanges_are_summarized(self):
+        seen = []
+
+        def summarizer(evicted, summary):
+            seen.append([e.request.query for e in evicted])
+            return " ".join(filter(None, [summary, *(e.request.query.replace(" ", "") for e in evicted)]))
+
+        memory = AgentMemory(max_tokens=20, summarizer=summarizer, token_counter=CountingTokenizer())
+        for i in range(4):
+            add(memory, f"q {i}", f"a {i}")
+
+        assert seen[0] == ["q 0"]
+        assert memory.get_context_string().startswith("Summary of earlier conversation: q0")
+        assert memory._get_total_tokens() <= 20
+
+    def test_failing_summarizer_is_ignored(self):
+        def summarizer(evicted, summary):
+            raise RuntimeError("LLM unavailable")
+
+        memory = AgentMemory(max_tokens=6, summarizer=summarizer, token_counter=CountingTokenizer())
+        add(memory, "q 0", "a 0")
+        add(memory, "q 1", "a 1")
+
+        assert memory.summary == ""
+        assert len(memory.conversation_history) == 1
+
+
+class TestRedisMemoryStore:
+    """Test cases for sharing memory across workers through Redis"""
+
+    @pytest.mark.asyncio
+    async def test_sessions_survive_across_workers(self):
+        cache = FakeCacheManager()
+        first = AgentMemory(max_tokens=100, store=RedisMemoryStore(cache, ttl=60), token_counter=CountingTokenizer())
+
+        session = await first.for_session("s1")
+        add(session, "what is an incident", "an unplanned interruption")
+        session.set_session_data("role", "agent")
+        await session.save()
+
+        tokenizer = CountingTokenizer()
+        second = AgentMemory(max_tokens=100, store=RedisMemoryStore(cache, ttl=60), token_counter=tokenizer)
+        tokenizer.texts.clear()
+        restored = await second.for_session("s1")
+
+        assert restored.get_context_string() == session.get_context_string()
+        assert restored.total_tokens == session.total_tokens
+        assert restored.get_session_data("role") == "agent"
+        # Stored token counts are reused instead of re-encoding the history
+        assert not any("Human:" in text for text in tokenizer.texts)
+        assert cache.expiry["agent_memory:s1"] == 60
+
+        other = await second.for_session("s2")
+        assert other.get_context_string() == ""
+
+    @pytest.mark.asyncio
+    async def test_without_store_memory_is_shared(self):
+        memory = AgentMemory(max_tokens=100, token_counter=CountingTokenizer())
+        assert await memory.for_session("s1") is memory
@@ -0,0 +1,96 @@
+"""
+Tests for the BM25 first-stage scorer and its postings.
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+from app.core.processing.api.index_store import BM25Postings
+from app.core.retrieval.api.bm25 import BM25Scorer
+
+
+def make_states(token_lists):
+    states = []
+    for tokens in token_lists:
+        if tokens is None:
+            states.append(None)
+            continue
+        terms = {token: tokens.count(token) for token in sorted(set(tokens))}
+        states.append({"key": "", "hash": "", "tokens": list(terms), "counts": list(terms.values())})
+    return states
+
+
+@pytest.fixture
+def corpus():
+    """A Zipf-distributed synthetic corpus with a tombstone."""
+    rng = np.random.default_rng(7)
+    vocabulary = [f"t{i}" for i in range(300)]
+    token_lists = [
+        [vocabulary[min(int(rank) - 1, 299)] for rank in rng.zipf(1.3, size=rng.integers(5, 40))]
+        for _ in range(800)
+    ]
+    token_lists[10] = None
+    return token_lists
+
+
+class TestBM25Postings:
+    """Test cases for BM25Postings"""
+
+    def test_from_doc_states(self):
+        postings = BM25Postings.from_doc_states(make_states([["get", "incid", "incid"], None, ["incid", "user"]]))
+
+        doc_ids, tfs = postings.postings("incid")
+        assert doc_ids.tolist() == [0, 2] and tfs.tolist() == [2, 1]
+        assert postings.doc_lengths.tolist() == [3, 0, 2]
+        assert postings.postings("missing") is None
+
+    def test_save_and_load(self, tmp_path, corpus):
+        postings = BM25Postings.from_doc_states(make_states(corpus))
+        postings.save(str(tmp_path))
+        loaded = BM25Postings.load(str(tmp_path))
+
+        assert len(loaded) == len(postings)
+        for token in ("t0", "t5", "t100"):
+            if token in postings:
+                assert [a.tolist() for a in loaded.postings(token)] == [a.tolist() for a in postings.postings(token)]
+
+
+class TestBM25Scorer:
+    """Test cases for BM25Scorer"""
+
+    def test_scores_match_formula(self):
+        postings = BM25Postings.from_doc_states(make_states([["get", "incid", "incid"], ["incid", "user"], ["user"]]))
+        scorer = BM25Scorer(postings, k1=1.2, b=0.75)
+
+        avgdl = 2.0
+        idf = math.log(1 + (3 - 2 + 0.5) / (2 + 0.5))
+        expected = idf * 2 * 2.2 / (2 + 1.2 * (1 - 0.75 + 0.75 * 3 / avgdl))
+        assert scorer.score(["incid"])[0] == pytest.approx(expected)
+
+    @pytest.mark.parametrize("exhaustive_max_postings", [0, 10 ** 9])
+    def test_top_k_matches_exhaustive_scoring(self, corpus, exhaustive_max_postings):
+        scorer = BM25Scorer(
+            BM25Postings.from_doc_states(make_states(corpus)),
+            exhaustive_max_postings=exhaustive_max_postings,
+        )
+        rng = np.random.default_rng(3)
+        for _ in range(50):
+            query = [f"t{i}" for i in rng.integers(0, 60, size=rng.integers(1, 6))]
+            for k in (1, 5, 20):
+                exhaustive = scorer.score(query)
+                expected = sorted(np.flatnonzero(exhaustive), key=lambda d: (-exhaustive[d], d))[:k]
+                actual = scorer.top_k(query, k)
+                assert np.allclose(exhaustive[actual], exhaustive[expected])
+                assert 10 not in actual
+
+    def test_common_terms_are_skipped(self, corpus):
+        scorer = BM25Scorer(BM25Postings.from_doc_states(make_states(corpus)), exhaustive_max_postings=0)
+        scorer.top_k(["t0", "t1", "t120"], 5)
+        assert scorer.get_stats()["postings_skipped"] > 0
+
+    def test_unknown_tokens(self, corpus):
+        scorer = BM25Scorer(BM25Postings.from_doc_states(make_states(corpus)))
+        assert scorer.top_k(["nope"], 5) == []
+        assert scorer.top_k([], 5) == []
@@ -0,0 +1,64 @@
+"""
+Tests for the bitmap candidate scorer used by ApiRetriever.
+"""
+
+import pytest
+from collections import defaultdict
+from pyroaring import BitMap as Roaring
+
+from app.core.retrieval.api.candidates import BitmapCandidateScorer, INTERSECTION_BONUS
+
+
+def loop_scores(inverted_index, query_tokens):
+    """Reference implementation of the original per-document scoring loop."""
+    token_bitmaps = [inverted_index.get(token, Roaring()) for token in query_tokens]
+    scores = defaultdict(int)
+    for doc_id in Roaring.intersection(*token_bitmaps):
+        scores[doc_id] += INTERSECTION_BONUS
+    for doc_id in Roaring.union(*token_bitmaps):
+        for bitmap in token_bitmaps:
+            if doc_id in bitmap:
+                scores[doc_id] += 1
+    return scores
+
+
+class TestBitmapCandidateScorer:
+    """Test cases for BitmapCandidateScorer"""
+
+    @pytest.fixture
+    def inverted_index(self):
+        return {
+            "get": Roaring([0, 1, 2, 3, 5]),
+            "incid": Roaring([1, 2, 7]),
+            "id": Roaring([2, 3, 7]),
+            "user": Roaring([4]),
+        }
+
+    @pytest.fixture
+    def scorer(self, inverted_index):
+        return BitmapCandidateScorer(inverted_index)
+
+    def test_scores_match_loop(self, scorer, inverted_index):
+        """Vectorized scores match the per-document loop"""
+        for query_tokens in (["get", "incid", "id"], ["get"], ["user", "id"], ["get", "get"]):
+            expected = loop_scores(inverted_index, query_tokens)
+            scores = scorer.score(query_tokens)
+            actual = {doc_id: int(scores[doc_id]) for doc_id in range(len(scores)) if scores[doc_id]}
+            assert actual == dict(expected)
+
+    def test_top_k_orders_by_score_then_doc_id(self, scorer):
+        """Full matches come first, ties keep ascending doc_id order"""
+        assert scorer.top_k(["get", "incid", "id"], top_k=3) == [2, 1, 3]
+        assert scorer.top_k(["get", "incid", "id"], top_k=10) == [2, 1, 3, 7, 0, 5]
+
+    def test_unknown_tokens(self, scorer):
+        """Unknown tokens contribute nothing and never produce a full match"""
+        assert scorer.top_k(["nonexistent"]) == []
+        assert scorer.top_k(["user", "nonexistent"]) == [4]
+        assert scorer.top_k([]) == []
+
+    def test_sees_index_updates(self, scorer, inverted_index):
+        """Postings are read from the index on every query, never kept stale"""
+        assert scorer.top_k(["user"]) == [4]
+        inverted_index["user"].add(6)
+        assert scorer.top_k(["user"]) == [4, 6]
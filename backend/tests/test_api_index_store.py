@@ -0,0 +1,97 @@
+"""
+Tests for the memory-mapped API index format.
+"""
+
+import os
+import numpy as np
+import pytest
+from pyroaring import BitMap as Roaring
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from app.core.processing.api.index_store import (
+    INDEX_FORMAT_VERSION,
+    IndexFormatError,
+    load_api_index,
+    read_current_build_id,
+    write_api_index,
+)
+
+
+ENDPOINTS = [
+    {"path": "/incidents/", "method": "GET", "operationId": "incidents_list"},
+    {"path": "/incidents/{id}/", "method": "GET", "operationId": "incidents_retrieve"},
+    {"path": "/users/{id}/", "method": "DELETE", "operationId": "users_destroy", "description": "Deletes a user ✓"},
+]
+
+
+def write_index(index_dir, stem_table=None):
+    inverted_index = {
+        "incid": Roaring([0, 1]),
+        "id": Roaring([1, 2]),
+        "user": Roaring([2]),
+    }
+    vectorizer = TfidfVectorizer()
+    matrix = vectorizer.fit_transform(["incid list", "incid id retriev", "user id destroy"])
+    build_id = write_api_index(
+        str(index_dir),
+        inverted_index=inverted_index,
+        tfidf_vectorizer=vectorizer,
+        tfidf_matrix=matrix,
+        docs=ENDPOINTS,
+        rerank_texts=[endpoint["path"] for endpoint in ENDPOINTS],
+        doc_states=[{"key": endpoint["operationId"], "hash": "", "tokens": []} for endpoint in ENDPOINTS],
+        tf_matrix=matrix,
+        df=np.ones(matrix.shape[1], dtype=np.int64),
+        stem_table=stem_table,
+    )
+    return build_id, vectorizer, matrix
+
+
+class TestApiIndexStore:
+    """Test cases for writing and loading API index builds"""
+
+    def test_round_trip(self, tmp_path):
+        build_id, vectorizer, matrix = write_index(tmp_path)
+        index = load_api_index(str(tmp_path))
+
+        assert index.build_id == build_id
+        assert index.manifest["format_version"] == INDEX_FORMAT_VERSION
+        assert index.manifest["num_docs"] == 3
+
+        assert list(index.inverted_index.get("id")) == [1, 2]
+        assert index.inverted_index.get("missing") is None
+        assert "user" in index.inverted_index
+
+        assert (index.tfidf_matrix != matrix).nnz == 0
+        query = ["incid id"]
+        assert (index.tfidf_vectorizer.transform(query) != vectorizer.transform(query)).nnz == 0
+
+        assert len(index.docs) == 3
+        assert index.docs[2] == ENDPOINTS[2]
+        assert dict(index.docs.items())[0] == ENDPOINTS[0]
+        assert index.rerank_texts.get(1) == "/incidents/{id}/"
+        with pytest.raises(KeyError):
+            index.docs[3]
+
+        doc_states, tf_matrix, df = index.load_build_state()
+        assert [state["key"] for state in doc_states] == [e["operationId"] for e in ENDPOINTS]
+        assert tf_matrix.shape == matrix.shape
+        assert index.deleted_doc_ids == []
+
+    def test_publish_and_prune(self, tmp_path):
+        build_ids = [write_index(tmp_path)[0] for _ in range(3)]
+
+        assert read_current_build_id(str(tmp_path)) == build_ids[-1]
+        assert sorted(os.listdir(tmp_path / "builds")) == build_ids[-2:]
+
+    def test_stem_table(self, tmp_path):
+        write_index(tmp_path / "plain")
+        assert load_api_index(str(tmp_path / "plain")).stem_table == {}
+
+        write_index(tmp_path / "stemmed", stem_table={"incidents": "incid"})
+        assert load_api_index(str(tmp_path / "stemmed")).stem_table == {"incidents": "incid"}
+
+    def test_missing_index(self, tmp_path):
+        assert read_current_build_id(str(tmp_path)) is None
+        with pytest.raises(IndexFormatError):
+            load_api_index(str(tmp_path))
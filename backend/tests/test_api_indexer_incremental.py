@@ -0,0 +1,93 @@
+"""
+Tests for incremental API index updates in ApiIndexer.
+"""
+
+import json
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from app.core.config import settings
+from app.core.processing.api.indexer import ApiIndexer, endpoint_identity
+from app.core.processing.api.index_store import load_api_index
+
+
+ENDPOINTS = [
+    {"path": "/incidents/", "method": "get", "operationId": "incidents_list", "summary": "List incidents"},
+    {"path": "/incidents/{id}/", "method": "get", "operationId": "incidents_retrieve", "summary": "Get an incident"},
+    {"path": "/users/", "method": "post", "operationId": "users_create", "summary": "Create a user"},
+    {"path": "/users/{id}/", "method": "delete", "operationId": "users_destroy", "summary": "Delete a user"},
+]
+
+
+class TestApiIndexerIncremental:
+    """Test cases for ApiIndexer.index(incremental=True)"""
+
+    @pytest.fixture
+    def indexer(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "PROCESSED_DATA_DIR", str(tmp_path))
+        monkeypatch.setattr(settings, "STATE_FILE", str(tmp_path / "processing_state.json"))
+        monkeypatch.setattr(settings, "API_SPEC_PATH", str(tmp_path / "spec.json"))
+        return tmp_path
+
+    def build(self, tmp_path, endpoints, incremental):
+        (tmp_path / "spec.json").write_text(json.dumps(endpoints))
+        indexer = ApiIndexer()
+        assert indexer.index(incremental=incremental)
+        return indexer, load_api_index(str(tmp_path / "api"))
+
+    def assert_matches_full_fit(self, indexer, index, endpoints):
+        live = [(doc_id, doc) for doc_id, doc in index.docs.items() if doc is not None]
+        assert sorted(endpoint_identity(doc) for _, doc in live) == sorted(endpoint_identity(e) for e in endpoints)
+
+        texts = [" ".join(indexer._tokenize_endpoint(doc)) for _, doc in live]
+        vectorizer = TfidfVectorizer()
+        matrix = vectorizer.fit_transform(texts)
+        queries = ["get incident", "delete user", "list widgets"]
+        expected = (vectorizer.transform(queries) @ matrix.T).toarray()
+        actual = (index.tfidf_vectorizer.transform(queries) @ index.tfidf_matrix.T).toarray()
+        assert np.allclose(actual[:, [doc_id for doc_id, _ in live]], expected)
+
+        for token in ("incid", "user", "widget"):
+            postings = index.inverted_index.get(token)
+            expected_ids = {doc_id for doc_id, doc in live if token in indexer._tokenize_endpoint(doc)}
+            assert set(postings or []) == expected_ids
+            bm25_run = index.bm25_postings.postings(token)
+            assert set(bm25_run[0].tolist() if bm25_run else []) == expected_ids
+
+    def test_endpoint_identity(self):
+        assert endpoint_identity(ENDPOINTS[0]) == "GET /incidents/"
+        assert endpoint_identity({"operationId": "op"}) == "op"
+
+    def test_incremental_update(self, indexer):
+        self.build(indexer, ENDPOINTS, incremental=False)
+
+        updated = [dict(e) for e in ENDPOINTS]
+        updated[1]["summary"] = "Get an incident widget"
+        del updated[2]
+        updated.append({"path": "/widgets/", "method": "get", "operationId": "widgets_list"})
+        api_indexer, index = self.build(indexer, updated, incremental=True)
+
+        assert index.manifest["incremental"] is True
+        assert index.manifest["num_docs"] == 4
+        assert index.deleted_doc_ids == []
+        assert index.docs[0] == ENDPOINTS[0]
+        assert index.docs[2]["operationId"] == "widgets_list"
+        self.assert_matches_full_fit(api_indexer, index, updated)
+
+    def test_removal_leaves_tombstone(self, indexer):
+        self.build(indexer, ENDPOINTS, incremental=False)
+        api_indexer, index = self.build(indexer, ENDPOINTS[:2] + ENDPOINTS[3:], incremental=True)
+
+        assert index.deleted_doc_ids == [2]
+        assert index.docs[2] is None
+        assert index.docs[3] == ENDPOINTS[3]
+        # Words only the removed endpoint used drop out of the stem table
+        assert "create" not in index.stem_table and index.stem_table["delete"] == "delet"
+        self.assert_matches_full_fit(api_indexer, index, ENDPOINTS[:2] + ENDPOINTS[3:])
+
+    def test_incremental_without_previous_build(self, indexer):
+        api_indexer, index = self.build(indexer, ENDPOINTS, incremental=True)
+
+        assert index.manifest["incremental"] is False
+        self.assert_matches_full_fit(api_indexer, index, ENDPOINTS)
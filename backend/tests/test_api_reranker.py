@@ -0,0 +1,93 @@
+"""
+Tests for the batched, cached cross-encoder reranking stage.
+"""
+
+import threading
+import pytest
+
+from app.core.retrieval.api.reranker import CrossEncoderReranker, normalize_query
+
+
+class FakeCrossEncoder:
+    """Scores a pair by the number of query words found in the doc text."""
+
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def predict(self, pairs):
+        with self.lock:
+            self.calls.append(list(pairs))
+        return [float(sum(word in text for word in query.split())) for query, text in pairs]
+
+
+class TestCrossEncoderReranker:
+    """Test cases for CrossEncoderReranker"""
+
+    @pytest.fixture
+    def encoder(self):
+        return FakeCrossEncoder()
+
+    @pytest.fixture
+    def reranker(self, encoder):
+        doc_texts = {
+            0: "GET /incidents/ | list incidents",
+            1: "GET /incidents/{id}/ | get incident",
+            2: "DELETE /users/{id}/ | delete user",
+        }
+        return CrossEncoderReranker(encoder, doc_texts, cache_size=100, max_wait_ms=1)
+
+    def test_normalize_query(self):
+        assert normalize_query("  List   Open Incidents ") == "list open incidents"
+
+    def test_rerank_orders_by_score(self, reranker):
+        assert reranker.rerank("get incident", [2, 0, 1]) == [1, 0, 2]
+        assert reranker.rerank("get incident", []) == []
+
+    def test_scores_are_memoized(self, reranker, encoder):
+        reranker.rerank("get incident", [0, 1])
+        reranker.rerank("GET  incident", [0, 1, 2])
+
+        assert len(encoder.calls) == 2
+        assert encoder.calls[1] == [["get incident", "DELETE /users/{id}/ | delete user"]]
+        stats = reranker.get_stats()
+        assert stats["cache_hits"] == 2
+        assert stats["cache_misses"] == 3
+
+    def test_cache_is_bounded(self, encoder):
+        reranker = CrossEncoderReranker(encoder, {i: str(i) for i in range(10)}, cache_size=3, max_wait_ms=0)
+        reranker.score("q", list(range(10)))
+        assert reranker.get_stats()["cache_size"] == 3
+
+    def test_set_documents_clears_cache(self, reranker, encoder):
+        reranker.rerank("get incident", [0])
+        reranker.set_documents({0: "get incident"})
+        assert reranker.score("get incident", [0]) == [2.0]
+        assert len(encoder.calls) == 2
+
+    def test_concurrent_queries_are_batched(self, encoder):
+        reranker = CrossEncoderReranker(encoder, {i: f"doc {i}" for i in range(8)}, max_wait_ms=200)
+        barrier = threading.Barrier(4)
+        results = {}
+
+        def worker(n):
+            barrier.wait()
+            results[n] = reranker.score(f"doc {n}", [n, n + 4])
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(encoder.calls) < 4
+        assert sum(len(call) for call in encoder.calls) == 8
+        assert results[0] == [2.0, 1.0]
+
+    def test_predict_errors_propagate(self, reranker, encoder):
+        def fail(pairs):
+            raise RuntimeError("model unavailable")
+
+        encoder.predict = fail
+        with pytest.raises(RuntimeError):
+            reranker.rerank("get incident", [0])
@@ -0,0 +1,204 @@
+"""
+Tests for the binary cache codecs and their use by the cache managers.
+"""
+
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+
+from app.core.agents.base.response import AgentResponse, ReasoningStep, ReasoningStepType, Source
+from app.core.cache import AdvancedCacheManager, CacheConfig, CacheLevel, CacheManager
+from app.core.cache import codecs, strategy
+from app.core.cache.codecs import COMPRESSORS, SERIALIZERS, CacheCodec, CodecError, decode, get_codec
+
+
+def agent_response(answer_words=5):
+    return AgentResponse(
+        answer=" ".join(["incident"] * answer_words),
+        sources=[Source(type="document", content="How to raise an incident", reference="docs/incidents.md")],
+        reasoning_chain=[ReasoningStep(step_type=ReasoningStepType.OBSERVATION, content="matched the incident guide")],
+        confidence=0.9,
+        metadata={"request_id": uuid4(), "tags": {"itsm"}}
+    )
+
+
+class TestCacheCodec:
+    """Test cases for CacheCodec"""
+
+    @pytest.mark.parametrize("serializer", sorted(SERIALIZERS))
+    @pytest.mark.parametrize("compressor", sorted(COMPRESSORS))
+    def test_round_trip(self, serializer, compressor):
+        codec = CacheCodec(serializer, compressor, compress_threshold=16)
+        value = {"name": "incident", "ids": list(range(100)), "nested": {"ok": True, "ratio": 0.5}, "none": None}
+
+        assert codec.decode(codec.encode(value)) == value
+
+    def test_header_is_self_describing(self):
+        value = {"text": "x" * 5000}
+        payloads = [CacheCodec(serializer, compressor, 0).encode(value)
+                    for serializer in SERIALIZERS for compressor in COMPRESSORS]
+
+        # Any reader decodes any writer's output regardless of its own settings
+        for payload in payloads:
+            assert decode(payload) == value
+            assert get_codec("json", "none").decode(payload) == value
+
+    def test_compression_threshold(self):
+        codec = CacheCodec("json", "zlib", compress_threshold=1024)
+
+        small = codec.encode({"text": "x" * 100})
+        large = codec.encode({"text": "x" * 5000})
+
+        assert small[0] & 0x0F == COMPRESSORS["none"].id
+        assert large[0] & 0x0F == COMPRESSORS["zlib"].id
+        assert len(large) < 200
+
+    def test_incompressible_payload_stored_raw(self):
+        codec = CacheCodec("json", "zlib", compress_threshold=0)
+        assert codec.encode("a")[0] & 0x0F == COMPRESSORS["none"].id
+
+    def test_rebuilds_pydantic_models(self):
+        codec = get_codec("orjson", "zstd", 64)
+        response = agent_response(answer_words=200)
+
+        restored = codec.decode(codec.encode(response), model=AgentResponse)
+
+        assert isinstance(restored, AgentResponse)
+        assert restored.answer == response.answer
+        assert restored.reasoning_chain[0].step_type == ReasoningStepType.OBSERVATION
+        assert isinstance(restored.reasoning_chain[0].timestamp, datetime)
+        assert restored.metadata["request_id"] == str(response.metadata["request_id"])
+
+    def test_missing_library_falls_back(self, monkeypatch):
+        monkeypatch.delitem(codecs.SERIALIZERS, "orjson", raising=False)
+        codec = CacheCodec("orjson", "brotli")
+
+        assert codec.serializer.name in ("msgpack", "json")
+        assert codec.compressor.name in ("zstd", "lz4", "zlib")
+
+    def test_corrupt_payloads_raise(self):
+        with pytest.raises(CodecError):
+            decode(b"")
+        with pytest.raises(CodecError):
+            decode(b"\xff{}")
+        with pytest.raises(CodecError):
+            decode(bytes((SERIALIZERS["json"].id << 4 | COMPRESSORS["zlib"].id,)) + b"not zlib")
+
+    def test_get_codec_is_shared(self):
+        assert get_codec("json", "zlib", 10) is get_codec("json", "zlib", 10)
+
+
+class BinaryRedis:
+    """Dict-backed stand-in for the Redis CacheManager that keeps codec bytes"""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key, codec=None, model=None):
+        value = self.data.get(key)
+        if codec is None or value is None:
+            return value
+        return codec.decode(value, model=model)
+
+    async def set(self, key, value, expire=None, codec=None):
+        self.data[key] = codec.encode(value) if codec else value
+        return True
+
+    async def delete(self, key):
+        return self.data.pop(key, None) is not None
+
+
+class TestAdvancedCacheCodecs:
+    """Test cases for codec-backed patterns in AdvancedCacheManager"""
+
+    @pytest.mark.asyncio
+    async def test_l2_values_are_encoded_and_rebuilt(self, monkeypatch):
+        redis = BinaryRedis()
+        monkeypatch.setattr(strategy, "cache_manager", redis)
+        cache = AdvancedCacheManager()
+        cache.configure_cache("responses", CacheConfig(
+            levels=[CacheLevel.L2_REDIS], codec="json", compression=True, model=AgentResponse))
+        response = agent_response(answer_words=500)
+
+        await cache.set("answer:1", response, pattern="responses")
+
+        assert isinstance(redis.data["answer:1"], bytes)
+        assert len(redis.data["answer:1"]) < len(response.model_dump_json())
+        restored = await cache.get("answer:1", pattern="responses")
+        assert isinstance(restored, AgentResponse) and restored.answer == response.answer
+
+    @pytest.mark.asyncio
+    async def test_undecodable_l2_values_are_misses(self, monkeypatch):
+        redis = BinaryRedis()
+        monkeypatch.setattr(strategy, "cache_manager", redis)
+        cache = AdvancedCacheManager()
+        cache.configure_cache("responses", CacheConfig(
+            levels=[CacheLevel.L2_REDIS], codec="json", compression=True, model=AgentResponse))
+        redis.data["legacy"] = agent_response().model_dump_json().encode()
+        redis.data["corrupt"] = bytes((SERIALIZERS["json"].id << 4 | COMPRESSORS["zlib"].id,)) + b"not zlib"
+        redis.data["stale_schema"] = get_codec("json", "none").encode({"answer": 1})
+
+        for key in ("legacy", "corrupt", "stale_schema"):
+            assert await cache.get(key, pattern="responses") is None
+            assert await cache.get(key, pattern="responses", fallback=lambda: agent_response()) is not None
+
+        assert cache.stats["l2_decode_errors"] == 3
+        assert all(isinstance(redis.data[key], bytes) and redis.data[key][0] >> 4 == SERIALIZERS["json"].id
+                   for key in ("legacy", "corrupt", "stale_schema"))
+
+    @pytest.mark.asyncio
+    async def test_l1_compression(self, monkeypatch):
+        monkeypatch.setattr(strategy, "cache_manager", BinaryRedis())
+        cache = AdvancedCacheManager()
+        cache.configure_cache("docs", CacheConfig(levels=[CacheLevel.L1_MEMORY], compression=True))
+        value = {"chunks": ["the incident was resolved by restarting the service"] * 200}
+
+        await cache.set("doc:1", value, pattern="docs")
+
+        entry = cache.l1_cache["doc:1"]
+        assert entry.compressed and isinstance(entry.value, bytes)
+        assert entry.size_bytes == len(entry.value) < len(str(value))
+        assert await cache.get("doc:1", pattern="docs") == value
+        assert cache.stats["compressions"] == 1 and cache.stats["decompressions"] == 1
+
+    @pytest.mark.asyncio
+    async def test_default_patterns_keep_json_text(self, monkeypatch):
+        redis = BinaryRedis()
+        monkeypatch.setattr(strategy, "cache_manager", redis)
+        cache = AdvancedCacheManager()
+
+        await cache.set("plain", {"a": 1})
+
+        assert redis.data["plain"] == {"a": 1}
+        assert await cache.get("plain") == {"a": 1}
+
+
+class FakeClient:
+    def __init__(self):
+        self.data = {}
+
+    async def set(self, key, value):
+        self.data[key] = value
+        return True
+
+    async def get(self, key):
+        return self.data.get(key)
+
+
+class TestCacheManagerCodecs:
+    """Test cases for codec reads and writes in CacheManager"""
+
+    @pytest.mark.asyncio
+    async def test_codec_values_use_the_binary_client(self):
+        manager = CacheManager()
+        manager.redis, manager.binary_redis = FakeClient(), FakeClient()
+        codec = get_codec("json", "zlib", 0)
+
+        await manager.set("registry", {"services": ["incident"] * 100}, codec=codec)
+        await manager.set("plain", {"a": 1})
+
+        assert isinstance(manager.binary_redis.data["cache:registry"], bytes)
+        assert manager.redis.data == {"cache:plain": '{"a": 1}'}
+        assert await manager.get("registry", codec=codec) == {"services": ["incident"] * 100}
+        assert await manager.get("missing", codec=codec, default=0) == 0
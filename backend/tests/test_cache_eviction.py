@@ -0,0 +1,147 @@
+"""
+Tests for the L1 eviction structures behind AdvancedCacheManager.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.cache import AdvancedCacheManager, CacheConfig, CacheLevel, InvalidationStrategy
+from app.core.cache.eviction import ExpiryHeap, FIFOPolicy, LFUPolicy, LRUPolicy
+
+
+def l1_config(invalidation, **kwargs):
+    return CacheConfig(levels=[CacheLevel.L1_MEMORY], invalidation=invalidation, **kwargs)
+
+
+class TestEvictionPolicies:
+    """Test cases for the eviction policies"""
+
+    def test_lru(self):
+        policy = LRUPolicy()
+        for key in "abc":
+            policy.add(key)
+        policy.touch("a")
+        assert policy.victim() == "b"
+        policy.remove("b")
+        assert policy.victim() == "c"
+        assert len(policy) == 2
+
+    def test_fifo_ignores_access(self):
+        policy = FIFOPolicy()
+        for key in "abc":
+            policy.add(key)
+        policy.touch("a")
+        assert policy.victim() == "a"
+
+    def test_lfu_prefers_least_frequent_then_oldest(self):
+        policy = LFUPolicy()
+        for key in "abc":
+            policy.add(key)
+        policy.touch("a")
+        policy.touch("a")
+        policy.touch("b")
+        assert policy.victim() == "c"
+        policy.remove("c")
+        assert policy.victim() == "b"
+        policy.remove("b")
+        assert policy.victim() == "a"
+        assert policy.frequency("a") == 3
+
+    def test_expiry_heap_skips_replaced_keys(self):
+        heap = ExpiryHeap()
+        now = datetime.utcnow()
+        heap.push("a", now - timedelta(seconds=1))
+        heap.push("b", now + timedelta(seconds=60))
+        heap.push("a", now + timedelta(seconds=60))
+        heap.push("c", now - timedelta(seconds=2))
+        heap.remove("c")
+
+        assert heap.pop_expired(now) == []
+        assert sorted(heap.pop_expired(now + timedelta(seconds=61))) == ["a", "b"]
+
+
+class TestAdvancedCacheEviction:
+    """Test cases for L1 eviction in AdvancedCacheManager"""
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self):
+        cache = AdvancedCacheManager()
+        cache.configure_cache("p", l1_config(InvalidationStrategy.LRU, max_size=2))
+
+        await cache.set("a", 1, pattern="p")
+        await cache.set("b", 2, pattern="p")
+        await cache.get("a", pattern="p")
+        await cache.set("c", 3, pattern="p")
+
+        assert set(cache.l1_cache) == {"a", "c"}
+        assert cache.stats["evictions"] == 1
+
+    @pytest.mark.asyncio
+    async def test_lfu_keeps_new_entry(self):
+        cache = AdvancedCacheManager()
+        cache.configure_cache("p", l1_config(InvalidationStrategy.LFU, max_size=2))
+
+        await cache.set("a", 1, pattern="p")
+        await cache.set("b", 2, pattern="p")
+        for _ in range(3):
+            await cache.get("a", pattern="p")
+            await cache.get("b", pattern="p")
+        await cache.get("b", pattern="p")
+        await cache.set("c", 3, pattern="p")
+
+        assert set(cache.l1_cache) == {"b", "c"}
+
+    @pytest.mark.asyncio
+    async def test_patterns_have_separate_budgets(self):
+        cache = AdvancedCacheManager()
+        cache.configure_cache("small", l1_config(InvalidationStrategy.LRU, max_size=1))
+        cache.configure_cache("large", l1_config(InvalidationStrategy.LRU, max_size=10))
+
+        for i in range(5):
+            await cache.set(f"large:{i}", i, pattern="large")
+        await cache.set("small:1", 1, pattern="small")
+        await cache.set("small:2", 2, pattern="small")
+
+        assert len(cache.l1_cache) == 6
+        assert "small:1" not in cache.l1_cache
+
+    @pytest.mark.asyncio
+    async def test_byte_budget(self):
+        cache = AdvancedCacheManager()
+        cache.configure_cache("p", l1_config(InvalidationStrategy.LRU, max_bytes=2500))
+
+        for i in range(4):
+            await cache.set(f"k{i}", "x" * 1000, pattern="p")
+        await cache.set("huge", "x" * 5000, pattern="p")
+
+        assert list(cache.l1_cache) == ["k2", "k3"]
+        assert cache.get_stats()["l1_bytes"] <= 2500
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_are_reclaimed_first(self):
+        cache = AdvancedCacheManager()
+        cache.configure_cache("p", l1_config(InvalidationStrategy.LRU, max_size=2))
+
+        await cache.set("old", 1, pattern="p")
+        await cache.set("live", 2, pattern="p")
+        cache.l1_cache["old"].created_at -= timedelta(hours=2)
+        cache.l1_expiry.push("old", cache.l1_cache["old"].expires_at)
+        await cache.set("new", 3, pattern="p")
+
+        assert set(cache.l1_cache) == {"live", "new"}
+        assert cache.stats["evictions"] == 0
+
+    @pytest.mark.asyncio
+    async def test_reverse_indexes(self):
+        cache = AdvancedCacheManager()
+        cache.configure_cache("p", l1_config(InvalidationStrategy.LRU, max_size=1))
+
+        await cache.set("a", 1, pattern="p", tags=["t1", "t2"], dependencies=["d"])
+        assert cache.tag_index == {"t1": {"a"}, "t2": {"a"}}
+
+        # Evicting an L1-only entry drops it from the indexes too
+        await cache.set("b", 2, pattern="p", tags=["t1"])
+        assert cache.tag_index == {"t1": {"b"}}
+        assert cache.dependency_graph == {}
+        assert cache.key_tags == {"b": {"t1"}}
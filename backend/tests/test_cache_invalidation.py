@@ -0,0 +1,232 @@
+"""
+Tests for cross-process L1 invalidation over Redis pub/sub.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from app.core.cache import AdvancedCacheManager, CacheConfig, CacheLevel
+from app.core.cache import strategy
+from app.core.cache.invalidation import InvalidationBus
+
+
+class Hub:
+    """In-memory stand-in for a Redis pub/sub server"""
+
+    def __init__(self):
+        self.subscribers = []
+        self.published = []
+
+
+class FakePubSub:
+    def __init__(self, hub):
+        self.hub = hub
+        self.queue = asyncio.Queue()
+
+    async def subscribe(self, channel):
+        self.hub.subscribers.append(self)
+
+    async def unsubscribe(self, channel):
+        self.hub.subscribers.remove(self)
+
+    async def aclose(self):
+        pass
+
+    async def listen(self):
+        yield {"type": "subscribe", "data": 1}
+        while True:
+            message = await self.queue.get()
+            if isinstance(message, Exception):
+                raise message
+            yield message
+
+
+class FakeRedisClient:
+    def __init__(self, hub):
+        self.hub = hub
+
+    async def publish(self, channel, message):
+        self.hub.published.append(json.loads(message))
+        for subscriber in list(self.hub.subscribers):
+            subscriber.queue.put_nowait({"type": "message", "data": message})
+        return len(self.hub.subscribers)
+
+    def pubsub(self):
+        return FakePubSub(self.hub)
+
+
+class FakeConnection:
+    """What InvalidationBus needs from the CacheManager"""
+
+    def __init__(self, hub):
+        self.redis = FakeRedisClient(hub)
+
+    async def connect(self):
+        pass
+
+
+class SharedL2:
+    """Dict-backed stand-in for the Redis CacheManager, shared by both workers"""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, expire=None):
+        self.data[key] = value
+
+    async def delete(self, key):
+        return self.data.pop(key, None) is not None
+
+
+@pytest.fixture
+def l2(monkeypatch):
+    shared = SharedL2()
+    monkeypatch.setattr(strategy, "cache_manager", shared)
+    return shared
+
+
+CONFIG = CacheConfig(levels=[CacheLevel.L1_MEMORY, CacheLevel.L2_REDIS], tags=["services"], dependencies=["registry"])
+
+
+async def worker(hub, name):
+    cache = AdvancedCacheManager(invalidation_bus=InvalidationBus(cache=FakeConnection(hub), origin=name))
+    cache.configure_cache("services", CONFIG)
+    await cache.invalidation_bus.start(cache._apply_remote_invalidation)
+    await asyncio.wait_for(cache.invalidation_bus.subscribed.wait(), 1)
+    return cache
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestInvalidationBus:
+    """Test cases for broadcasting L1 invalidations between workers"""
+
+    @pytest.mark.asyncio
+    async def test_update_drops_peer_l1_copy(self, l2):
+        hub = Hub()
+        a, b = await worker(hub, "a"), await worker(hub, "b")
+
+        await a.set("service:1", {"name": "old"}, pattern="services")
+        assert await b.get("service:1", pattern="services") == {"name": "old"}
+        assert "service:1" in b.l1_cache
+
+        await a.set("service:1", {"name": "new"}, pattern="services")
+        await settle()
+
+        assert "service:1" not in b.l1_cache
+        assert await b.get("service:1", pattern="services") == {"name": "new"}
+        # The sender ignores its own message
+        assert a.stats["remote_invalidations"] == 0
+        await a.invalidation_bus.stop()
+        await b.invalidation_bus.stop()
+
+    @pytest.mark.asyncio
+    async def test_delete_tag_and_dependency_invalidation(self, l2):
+        hub = Hub()
+        a, b = await worker(hub, "a"), await worker(hub, "b")
+        for i in range(3):
+            await a.set(f"service:{i}", i, pattern="services")
+            await b.get(f"service:{i}", pattern="services")
+
+        await a.delete("service:0")
+        await settle()
+        assert "service:0" not in b.l1_cache
+
+        # L1 copies filled from L2 were indexed under the pattern's tags
+        await a.invalidate_tags(["services"])
+        await settle()
+        assert b.l1_cache == {}
+        assert b.tag_index == {}
+
+        await a.set("service:5", 5, pattern="services")
+        await b.get("service:5", pattern="services")
+        await a.invalidate_dependencies(["registry"])
+        await settle()
+        assert "service:5" not in b.l1_cache
+        assert [m["kind"] for m in hub.published][-2:] == ["keys", "dependencies"]
+        await a.invalidation_bus.stop()
+        await b.invalidation_bus.stop()
+
+    @pytest.mark.asyncio
+    async def test_fills_are_not_broadcast(self, l2):
+        hub = Hub()
+        a = await worker(hub, "a")
+
+        await a.get("service:9", pattern="services", fallback=lambda: {"name": "svc"})
+
+        assert hub.published == []
+        await a.invalidation_bus.stop()
+
+    @pytest.mark.asyncio
+    async def test_sequence_gap_clears_l1(self, l2):
+        hub = Hub()
+        b = await worker(hub, "b")
+        await b.set("local", 1, pattern="services", broadcast=False)
+        client = FakeRedisClient(hub)
+
+        await client.publish("cache:invalidate", json.dumps({"origin": "a", "seq": 1, "kind": "keys", "names": ["x"]}))
+        await client.publish("cache:invalidate", json.dumps({"origin": "a", "seq": 1, "kind": "keys", "names": ["x"]}))
+        await settle()
+        assert "local" in b.l1_cache
+
+        await client.publish("cache:invalidate", json.dumps({"origin": "a", "seq": 4, "kind": "keys", "names": ["y"]}))
+        await settle()
+
+        assert b.l1_cache == {}
+        stats = b.invalidation_bus.get_stats()
+        assert stats["gaps"] == 1 and stats["applied"] == 2
+        await b.invalidation_bus.stop()
+
+    @pytest.mark.asyncio
+    async def test_resubscribe_clears_l1(self, l2, monkeypatch):
+        monkeypatch.setattr(asyncio, "sleep", _fast_sleep)
+        hub = Hub()
+        b = await worker(hub, "b")
+        await b.set("local", 1, pattern="services", broadcast=False)
+
+        hub.subscribers[0].queue.put_nowait(ConnectionError("connection lost"))
+        for _ in range(20):
+            await _real_sleep(0)
+
+        assert b.l1_cache == {}
+        assert b.invalidation_bus.stats["resyncs"] == 1
+        await b.invalidation_bus.stop()
+
+    @pytest.mark.asyncio
+    async def test_load_invalidated_midway_is_not_cached(self, l2):
+        cache = AdvancedCacheManager()
+        cache.configure_cache("services", CONFIG)
+
+        async def slow_fallback():
+            await _real_sleep(0.02)
+            return {"name": "read before the update"}
+
+        task = asyncio.create_task(cache.get("service:1", pattern="services", fallback=slow_fallback))
+        await _real_sleep(0.005)
+        await cache._apply_remote_invalidation("keys", ["service:1"])
+
+        assert await task == {"name": "read before the update"}
+        assert "service:1" not in cache.l1_cache
+        assert cache.stats["stale_loads_discarded"] == 1
+
+    @pytest.mark.asyncio
+    async def test_publish_is_noop_until_started(self):
+        hub = Hub()
+        bus = InvalidationBus(cache=FakeConnection(hub))
+        assert await bus.publish("keys", ["k"]) is False
+        assert hub.published == []
+
+
+_real_sleep = asyncio.sleep
+
+
+async def _fast_sleep(delay, *args, **kwargs):
+    await _real_sleep(0)
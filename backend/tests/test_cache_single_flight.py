@@ -0,0 +1,173 @@
+"""
+Tests for fallback coalescing, early refresh and stale-while-revalidate in
+AdvancedCacheManager.
+"""
+
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from app.core.cache import AdvancedCacheManager, CacheConfig, CacheLevel, CachePattern, advanced_cache, cached
+
+
+class SlowSource:
+    """Fallback that counts its calls and takes ``delay`` seconds"""
+
+    def __init__(self, delay=0.05, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("backend down")
+        return f"value-{self.calls}"
+
+
+def manager(**config):
+    cache = AdvancedCacheManager()
+    cache.configure_cache("p", CacheConfig(levels=[CacheLevel.L1_MEMORY], **config))
+    return cache
+
+
+def age(cache, key, seconds):
+    """Moves an entry's creation time into the past"""
+    entry = cache.l1_cache[key]
+    entry.created_at -= timedelta(seconds=seconds)
+
+
+class TestSingleFlight:
+    """Test cases for coalescing concurrent fallbacks"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_fallback(self):
+        cache = manager()
+        source = SlowSource()
+
+        results = await asyncio.gather(*(cache.get("k", pattern="p", fallback=source) for _ in range(10)))
+
+        assert results == ["value-1"] * 10
+        assert source.calls == 1
+        stats = cache.get_stats()
+        assert stats["coalesced"] == 9 and stats["fallback_calls"] == 1
+        assert stats["inflight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_errors_reach_every_waiter(self):
+        cache = manager()
+        source = SlowSource(fail=True)
+
+        results = await asyncio.gather(
+            *(cache.get("k", pattern="p", fallback=source) for _ in range(3)),
+            return_exceptions=True
+        )
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert source.calls == 1
+        assert "k" not in cache.l1_cache
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_computation(self):
+        cache = manager()
+        source = SlowSource(delay=0.1)
+
+        first = asyncio.create_task(cache.get("k", pattern="p", fallback=source))
+        await asyncio.sleep(0.01)
+        second = asyncio.create_task(cache.get("k", pattern="p", fallback=source))
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        assert await second == "value-1"
+        assert source.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_cached_decorator_coalesces(self):
+        advanced_cache.configure_cache("single_flight_test", CacheConfig(levels=[CacheLevel.L1_MEMORY]))
+        calls = []
+
+        @cached(pattern="single_flight_test", key_func=lambda ticket: f"ticket:{ticket}")
+        async def load_ticket(ticket):
+            calls.append(ticket)
+            await asyncio.sleep(0.05)
+            return {"id": ticket}
+
+        results = await asyncio.gather(*(load_ticket("INC-1") for _ in range(5)))
+
+        assert results == [{"id": "INC-1"}] * 5
+        assert calls == ["INC-1"]
+        advanced_cache._drop_l1("ticket:INC-1")
+
+
+class TestRefreshAhead:
+    """Test cases for XFetch early refresh and stale-while-revalidate"""
+
+    @pytest.mark.asyncio
+    async def test_early_refresh_near_expiry(self):
+        cache = manager(pattern=CachePattern.REFRESH_AHEAD, ttl=60, refresh_beta=1.0)
+        source = SlowSource(delay=0.01)
+
+        assert await cache.get("k", pattern="p", fallback=source) == "value-1"
+        cache.l1_cache["k"].compute_seconds = 120.0
+        age(cache, "k", 59)
+
+        # The current value is served while a refresh runs in the background
+        assert await cache.get("k", pattern="p", fallback=source) == "value-1"
+        await asyncio.sleep(0.05)
+
+        assert source.calls == 2
+        assert cache.stats["early_refreshes"] == 1
+        assert await cache.get("k", pattern="p", fallback=source) == "value-2"
+
+    @pytest.mark.asyncio
+    async def test_fresh_entries_are_not_refreshed(self):
+        cache = manager(pattern=CachePattern.REFRESH_AHEAD, ttl=3600)
+        source = SlowSource(delay=0.001)
+
+        await cache.get("k", pattern="p", fallback=source)
+        for _ in range(20):
+            await cache.get("k", pattern="p", fallback=source)
+
+        assert source.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_while_revalidate(self):
+        cache = manager(pattern=CachePattern.REFRESH_AHEAD, ttl=60, stale_ttl=30, refresh_beta=0)
+        source = SlowSource(delay=0.05)
+        await cache.get("k", pattern="p", fallback=source)
+        age(cache, "k", 70)
+
+        results = await asyncio.gather(*(cache.get("k", pattern="p", fallback=source) for _ in range(5)))
+
+        assert results == ["value-1"] * 5
+        assert cache.stats["stale_served"] == 5
+        await asyncio.sleep(0.1)
+        assert source.calls == 2
+        assert await cache.get("k", pattern="p", fallback=source) == "value-2"
+
+    @pytest.mark.asyncio
+    async def test_past_stale_window_is_a_miss(self):
+        cache = manager(pattern=CachePattern.REFRESH_AHEAD, ttl=60, stale_ttl=30)
+        source = SlowSource(delay=0.001)
+        await cache.get("k", pattern="p", fallback=source)
+        age(cache, "k", 100)
+
+        assert await cache.get("k", pattern="p", fallback=source) == "value-2"
+        assert cache.stats["stale_served"] == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_keeps_current_value(self):
+        cache = manager(pattern=CachePattern.REFRESH_AHEAD, ttl=60, stale_ttl=30)
+        source = SlowSource(delay=0.001)
+        await cache.get("k", pattern="p", fallback=source)
+        age(cache, "k", 70)
+        source.fail = True
+
+        assert await cache.get("k", pattern="p", fallback=source) == "value-1"
+        await asyncio.sleep(0.02)
+
+        assert cache.stats["refresh_errors"] == 1
+        assert cache.l1_cache["k"].value == "value-1"
+        await cache.stop()
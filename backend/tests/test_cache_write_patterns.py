@@ -0,0 +1,198 @@
+"""
+Tests for the write-through, write-behind and circuit-breaker patterns in
+AdvancedCacheManager.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.core.cache import AdvancedCacheManager, CacheConfig, CacheLevel, CachePattern
+from app.core.cache import strategy
+from app.core.cache.circuit import CircuitBreaker, CircuitState
+
+
+class FakeRedis:
+    """Records calls in place of the Redis CacheManager; can be made to fail"""
+
+    def __init__(self):
+        self.data = {}
+        self.round_trips = 0
+        self.down = False
+
+    def _call(self):
+        self.round_trips += 1
+        if self.down:
+            raise ConnectionError("redis down")
+
+    async def get(self, key):
+        self._call()
+        return self.data.get(key)
+
+    async def set(self, key, value, expire=None):
+        self._call()
+        self.data[key] = value
+        return True
+
+    async def set_many(self, items):
+        self._call()
+        for key, value, _ in items:
+            self.data[key] = value
+        return len(items)
+
+    async def delete(self, key):
+        self._call()
+        return self.data.pop(key, None) is not None
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    fake = FakeRedis()
+    monkeypatch.setattr(strategy, "cache_manager", fake)
+    return fake
+
+
+def manager(pattern, levels=(CacheLevel.L1_MEMORY, CacheLevel.L2_REDIS), writer=None, **kwargs):
+    cache = AdvancedCacheManager(**kwargs)
+    cache.configure_cache("p", CacheConfig(levels=list(levels), pattern=pattern, writer=writer))
+    return cache
+
+
+class TestWriteThrough:
+    """Test cases for the write-through pattern"""
+
+    @pytest.mark.asyncio
+    async def test_backing_store_written_first(self, redis):
+        written = []
+
+        async def writer(key, value):
+            assert key not in redis.data
+            written.append((key, value))
+
+        cache = manager(CachePattern.WRITE_THROUGH, writer=writer)
+        await cache.set("ticket:1", {"state": "open"}, pattern="p")
+
+        assert written == [("ticket:1", {"state": "open"})]
+        assert redis.data["ticket:1"] == {"state": "open"}
+        assert cache.stats["write_through"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_store_write_is_not_cached(self, redis):
+        def writer(key, value):
+            raise IOError("database unavailable")
+
+        cache = manager(CachePattern.WRITE_THROUGH, writer=writer)
+        with pytest.raises(IOError):
+            await cache.set("ticket:1", "open", pattern="p")
+
+        assert "ticket:1" not in cache.l1_cache and "ticket:1" not in redis.data
+
+
+class TestWriteBehind:
+    """Test cases for the write-behind pattern"""
+
+    @pytest.mark.asyncio
+    async def test_writes_are_coalesced_and_batched(self, redis):
+        cache = manager(CachePattern.WRITE_BEHIND, write_behind_interval=0.05)
+
+        for i in range(50):
+            await cache.set(f"progress:{i % 5}", i, pattern="p")
+
+        assert redis.round_trips == 0
+        assert await cache.get("progress:4", pattern="p") == 49
+
+        await asyncio.sleep(0.1)
+        assert redis.round_trips == 1
+        assert redis.data == {f"progress:{i}": 45 + i for i in range(5)}
+        assert cache.stats["write_behind_coalesced"] == 45
+        assert cache.get_stats()["write_behind_pending"] == 0
+
+    @pytest.mark.asyncio
+    async def test_full_batch_flushes_early(self, redis):
+        cache = manager(CachePattern.WRITE_BEHIND, write_behind_interval=10, write_behind_batch_size=3)
+
+        for i in range(3):
+            await cache.set(f"k{i}", i, pattern="p")
+        await asyncio.sleep(0.01)
+
+        assert len(redis.data) == 3
+
+    @pytest.mark.asyncio
+    async def test_pending_writes_visible_without_l1(self, redis):
+        cache = manager(CachePattern.WRITE_BEHIND, levels=[CacheLevel.L2_REDIS], write_behind_interval=10)
+
+        await cache.set("session:1", {"user": "a"}, pattern="p")
+
+        assert await cache.get("session:1", pattern="p") == {"user": "a"}
+        assert redis.round_trips == 0
+        await cache.stop()
+        assert redis.data["session:1"] == {"user": "a"}
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_is_retried_without_overwriting_newer_writes(self, redis):
+        stored = {}
+        cache = manager(CachePattern.WRITE_BEHIND, writer=lambda key, value: stored.__setitem__(key, value),
+                        write_behind_interval=10)
+        await cache.set("a", 1, pattern="p")
+        await cache.set("b", 1, pattern="p")
+        redis.down = True
+
+        assert await cache.flush() == 0
+        await cache.set("a", 2, pattern="p")
+        redis.down = False
+
+        assert await cache.flush() == 2
+        assert redis.data == {"a": 2, "b": 1}
+        assert stored == {"a": 2, "b": 1}
+        await cache.stop()
+
+    @pytest.mark.asyncio
+    async def test_delete_drops_pending_write(self, redis):
+        cache = manager(CachePattern.WRITE_BEHIND, write_behind_interval=10)
+        await cache.set("a", 1, pattern="p")
+        await cache.delete("a")
+
+        assert await cache.flush() == 0
+        assert "a" not in redis.data
+
+
+class TestCircuitBreaker:
+    """Test cases for the L2 circuit breaker"""
+
+    def test_opens_and_half_opens(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+        breaker.record_failure()
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == CircuitState.OPEN and not breaker.allow()
+
+        time.sleep(0.06)
+        assert breaker.allow()
+        assert not breaker.allow()  # only one trial call while half-open
+        breaker.record_success()
+        assert breaker.state == CircuitState.CLOSED
+
+    @pytest.mark.asyncio
+    async def test_serves_l1_while_redis_is_down(self, redis):
+        cache = manager(CachePattern.CIRCUIT_BREAKER, l2_failure_threshold=2)
+        await cache.set("k", "v", pattern="p")
+        redis.down = True
+
+        for i in range(5):
+            await cache.set(f"new{i}", i, pattern="p")
+            assert await cache.get("k", pattern="p") == "v"
+            assert await cache.get("missing", pattern="p") is None
+
+        # Redis was tried until the breaker opened, then skipped
+        assert redis.round_trips == 3
+        stats = cache.get_stats()
+        assert stats["l2_circuit"]["state"] == "open"
+        assert stats["l2_errors"] == 2 and stats["l2_skipped"] == 8
+
+    @pytest.mark.asyncio
+    async def test_other_patterns_still_raise(self, redis):
+        cache = manager(CachePattern.CACHE_ASIDE)
+        redis.down = True
+        with pytest.raises(ConnectionError):
+            await cache.set("k", "v", pattern="p")
@@ -0,0 +1,63 @@
+"""
+Tests for the memoized CanonicalTokenizer.
+"""
+
+from nltk.stem import PorterStemmer
+
+from app.core.processing.api.tokenizers import TOKEN_PATTERN, CanonicalTokenizer
+
+TEXTS = [
+    "/api/v1/incidents/{incidentId} getIncidentById Incidents Retrieve an incident",
+    "listAllOpenIncidents HTTPResponse_codes for the service_catalogue",
+    "",
+]
+
+
+def reference_tokenize(text):
+    stemmer = PorterStemmer()
+    return [stemmer.stem(token.lower()) for token in TOKEN_PATTERN.split(text) if token]
+
+
+class TestCanonicalTokenizer:
+    """Test cases for CanonicalTokenizer"""
+
+    def test_matches_uncached_stemming(self):
+        tokenizer = CanonicalTokenizer()
+        for text in TEXTS:
+            assert tokenizer.tokenize(text) == reference_tokenize(text)
+        assert tokenizer.tokenize("getIncidentById") == ["get", "incid", "by", "id"]
+
+    def test_tokenize_many_matches_tokenize(self):
+        tokenizer = CanonicalTokenizer()
+        assert tokenizer.tokenize_many(TEXTS) == [reference_tokenize(text) for text in TEXTS]
+
+    def test_repeated_words_hit_cache(self):
+        tokenizer = CanonicalTokenizer()
+        tokenizer.tokenize("incidents incidents incidents")
+        assert tokenizer.stats == {"hits": 2, "misses": 1}
+
+    def test_cache_is_bounded(self):
+        tokenizer = CanonicalTokenizer(cache_size=2)
+        assert tokenizer.tokenize("alpha beta gamma alpha") == ["alpha", "beta", "gamma", "alpha"]
+        assert len(tokenizer._cache) == 2
+
+    def test_stem_table_round_trip(self):
+        tokenizer = CanonicalTokenizer()
+        tokenizer.tokenize_many(TEXTS)
+        table = tokenizer.export_stem_table(TEXTS)
+        assert table["incidents"] == "incid"
+
+        warm = CanonicalTokenizer(stem_table=table)
+        warm.stemmer = None  # every word of TEXTS must come from the table
+        assert warm.tokenize_many(TEXTS) == [reference_tokenize(text) for text in TEXTS]
+
+    def test_stem_table_only_covers_given_texts(self):
+        tokenizer = CanonicalTokenizer(stem_table={"retired": "retir"})
+        tokenizer.tokenize("removedEndpoint")
+
+        assert tokenizer.export_stem_table(["listIncidents"]) == {"list": "list", "incidents": "incid"}
+
+    def test_cache_evicts_least_recently_used(self):
+        tokenizer = CanonicalTokenizer(cache_size=2)
+        tokenizer.tokenize("alpha beta alpha gamma")
+        assert list(tokenizer._cache) == ["alpha", "gamma"]
@@ -0,0 +1,89 @@
+"""
+Tests for the batched embedding pipeline and its persistent vector cache.
+"""
+
+import threading
+import numpy as np
+import pytest
+
+from app.core.processing.document.embeddings import BatchedEmbedder, EmbeddingCache, content_hash
+
+
+class FakeEmbeddings:
+    """Deterministic embeddings: [len(text), number of spaces, 1.0]."""
+
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def embed_documents(self, texts):
+        with self.lock:
+            self.calls.append(list(texts))
+        return [[float(len(text)), float(text.count(" ")), 1.0] for text in texts]
+
+
+class TestEmbeddingCache:
+    """Test cases for EmbeddingCache"""
+
+    def test_put_and_reload(self, tmp_path):
+        cache = EmbeddingCache(str(tmp_path), "BAAI/bge-m3")
+        cache.put_many(["a", "b"], np.array([[1, 2], [3, 4]], dtype=np.float32))
+        cache.put_many(["c"], np.array([[5, 6]], dtype=np.float32))
+
+        reloaded = EmbeddingCache(str(tmp_path), "BAAI/bge-m3")
+        assert len(reloaded) == 3
+        assert reloaded.get_many(["c", "a"]).tolist() == [[5, 6], [1, 2]]
+
+    def test_caches_are_per_model(self, tmp_path):
+        EmbeddingCache(str(tmp_path), "model-a").put_many(["a"], np.ones((1, 2)))
+        assert "a" not in EmbeddingCache(str(tmp_path), "model-b")
+
+    def test_dimension_mismatch(self, tmp_path):
+        cache = EmbeddingCache(str(tmp_path), "m")
+        cache.put_many(["a"], np.ones((1, 2)))
+        with pytest.raises(ValueError):
+            cache.put_many(["b"], np.ones((1, 3)))
+
+    def test_compact_drops_stale_rows(self, tmp_path):
+        cache = EmbeddingCache(str(tmp_path), "m")
+        cache.put_many(["a", "b", "c"], np.array([[1, 1], [2, 2], [3, 3]], dtype=np.float32))
+
+        cache.compact(["c"])
+        assert len(cache) == 1
+        assert EmbeddingCache(str(tmp_path), "m").get_many(["c"]).tolist() == [[3, 3]]
+
+
+class TestBatchedEmbedder:
+    """Test cases for BatchedEmbedder"""
+
+    def test_batches_and_order(self, tmp_path):
+        embeddings = FakeEmbeddings()
+        embedder = BatchedEmbedder(embeddings, EmbeddingCache(str(tmp_path), "m"), batch_size=2, max_workers=2)
+        texts = ["one", "two words", "three more words", "x", "two words"]
+
+        vectors = embedder.embed(texts)
+        assert vectors[:, 0].tolist() == [len(text) for text in texts]
+        assert sorted(len(call) for call in embeddings.calls) == [2, 2]
+        assert embedder.stats["embedded"] == 4
+
+    def test_unchanged_chunks_are_not_reembedded(self, tmp_path):
+        embeddings = FakeEmbeddings()
+        BatchedEmbedder(embeddings, EmbeddingCache(str(tmp_path), "m")).embed(["alpha", "beta"])
+
+        embeddings.calls.clear()
+        embedder = BatchedEmbedder(embeddings, EmbeddingCache(str(tmp_path), "m"))
+        progress = []
+        vectors = embedder.embed(["alpha", "beta edited"], progress_callback=progress.append)
+
+        assert embeddings.calls == [["beta edited"]]
+        assert embedder.stats["cache_hits"] == 1
+        assert vectors[1, 0] == len("beta edited")
+        assert progress[-1] == 100
+
+    def test_without_cache(self):
+        embedder = BatchedEmbedder(FakeEmbeddings(), cache=None, batch_size=1)
+        assert embedder.embed(["a b", "c"])[:, 1].tolist() == [1.0, 0.0]
+
+    def test_content_hash(self):
+        assert content_hash("a") != content_hash("b")
+        assert len(content_hash("a")) == 64
@@ -0,0 +1,66 @@
+"""
+Tests for the configurable document FAISS index types.
+"""
+
+import numpy as np
+import pytest
+
+faiss = pytest.importorskip("faiss")
+
+from app.core.processing.document.faiss_index import (
+    build_factory_string,
+    build_faiss_index,
+    search_parameters,
+)
+
+
+@pytest.fixture
+def vectors():
+    rng = np.random.default_rng(0)
+    return rng.standard_normal((1000, 16)).astype(np.float32)
+
+
+class TestFactoryString:
+    """Test cases for build_factory_string"""
+
+    def test_flat_and_quantized_storage(self):
+        assert build_factory_string("flat", "none", 1000, 16) == "Flat"
+        assert build_factory_string("flat", "fp16", 1000, 16) == "SQfp16"
+        assert build_factory_string("hnsw", "int8", 1000, 16, hnsw_m=16) == "HNSW16,SQ8"
+
+    def test_nlist_is_clamped_to_trainable_size(self):
+        assert build_factory_string("ivf_flat", "none", 1000, 16, nlist=256) == "IVF25,Flat"
+
+    def test_pq_sub_quantizers_divide_dimension(self):
+        assert build_factory_string("ivf_pq", "none", 20000, 1024, pq_m=48) == "IVF256,PQ16x8"
+
+    def test_pq_falls_back_to_ivf_flat_on_tiny_corpora(self):
+        assert build_factory_string("ivf_pq", "none", 300, 16) == "IVF7,Flat"
+
+    def test_rejects_unknown_options(self):
+        with pytest.raises(ValueError):
+            build_factory_string("lsh", "none", 1000, 16)
+        with pytest.raises(ValueError):
+            build_factory_string("flat", "int4", 1000, 16)
+
+
+class TestFaissIndex:
+    """Test cases for build_faiss_index and search_parameters"""
+
+    @pytest.mark.parametrize("index_type", ["flat", "ivf_flat", "hnsw", "ivf_pq"])
+    def test_finds_exact_vector(self, vectors, index_type):
+        index = build_faiss_index(vectors, index_type, "none", nlist=8, hnsw_m=8, pq_m=4)
+        params = search_parameters(index, nprobe=8, ef_search=32)
+        _, ids = index.search(vectors[:5], 1, params=params)
+        assert index.ntotal == len(vectors)
+        assert ids[:, 0].tolist() == [0, 1, 2, 3, 4]
+
+    def test_search_parameters_match_index_type(self, vectors):
+        ivf = build_faiss_index(vectors, "ivf_flat", "none", nlist=8)
+        hnsw = build_faiss_index(vectors, "hnsw", "none", hnsw_m=8)
+        flat = build_faiss_index(vectors, "flat", "int8")
+
+        assert search_parameters(ivf, nprobe=4, ef_search=32).nprobe == 4
+        assert search_parameters(hnsw, nprobe=4, ef_search=32).efSearch == 32
+        assert search_parameters(flat, nprobe=4, ef_search=32) is None
+        assert search_parameters(ivf) is None
@@ -0,0 +1,75 @@
+"""
+Tests for rank fusion in the retrieval Fuser.
+"""
+
+import pytest
+
+from app.core.retrieval.fusion.fuser import Fuser, content_key
+
+
+class FakeDocument:
+    def __init__(self, page_content):
+        self.page_content = page_content
+
+
+class TestFuser:
+    """Test cases for Fuser"""
+
+    def test_rrf_interleaves_lists(self):
+        fuser = Fuser(method="rrf", rrf_k=60, weights=[1.0, 1.0])
+        api = [{"path": "/a"}, {"path": "/b"}]
+        docs = [FakeDocument("x"), FakeDocument("y")]
+
+        fused = fuser.fuse([api, docs])
+
+        # Equal ranks tie; ties keep rank order, then list order
+        assert fused == [api[0], docs[0], api[1], docs[1]]
+
+    def test_rrf_rewards_agreement_and_dedups(self):
+        fuser = Fuser(method="rrf", rrf_k=60, weights=[1.0, 1.0])
+        shared = {"path": "/shared"}
+        fused = fuser.fuse([[{"path": "/a"}, shared], [dict(shared), {"path": "/b"}]])
+
+        assert fused[0] == shared
+        assert len(fused) == 3
+
+    def test_duplicates_within_one_list_count_once(self):
+        fuser = Fuser(method="rrf", weights=[1.0, 1.0])
+        fused = fuser.fuse([[{"path": "/a"}, {"path": "/a"}], [{"path": "/b"}]])
+        assert fused == [{"path": "/a"}, {"path": "/b"}]
+
+    def test_weighted_fusion_uses_normalized_scores(self):
+        fuser = Fuser(method="weighted", weights=[1.0, 0.5])
+        api = [({"path": "/a"}, 9.0), ({"path": "/b"}, -3.0)]
+        docs = [(FakeDocument("x"), -0.1), (FakeDocument("y"), -0.9)]
+
+        fused = fuser.fuse_scored([api, docs])
+
+        # /a -> 1.0, x -> 0.5, /b and y -> 0.0
+        assert fused[:2] == [api[0][0], docs[0][0]]
+
+    def test_weights_can_favour_one_retriever(self):
+        fuser = Fuser(method="rrf", weights=[1.0, 3.0])
+        fused = fuser.fuse([[{"path": "/a"}], [FakeDocument("x")]])
+        assert isinstance(fused[0], FakeDocument)
+
+    def test_top_k_truncates_each_list_to_candidate_depth(self):
+        fuser = Fuser(method="rrf", weights=[1.0, 1.0])
+        api = [{"path": f"/{i}"} for i in range(10)]
+        fused = fuser.fuse([api, []], top_k=3)
+        assert fused == api[:3]
+        assert fuser.candidate_depth(3) == 3
+
+    def test_error_results_are_skipped(self):
+        fuser = Fuser(method="rrf")
+        api = [{"path": "/a"}]
+        assert fuser.fuse([api, {"error": "FAISS index is not available."}]) == api
+        assert fuser.fuse_scored([[(api[0], 1.0)], {"error": "down"}]) == api
+
+    def test_rejects_unknown_method(self):
+        with pytest.raises(ValueError):
+            Fuser(method="concat")
+
+    def test_content_key_ignores_dict_order(self):
+        assert content_key({"a": 1, "b": 2}) == content_key({"b": 2, "a": 1})
+        assert content_key(FakeDocument("x")) != content_key(FakeDocument("y"))
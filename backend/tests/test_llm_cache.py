@@ -0,0 +1,131 @@
+"""
+Tests for the opt-in prompt/response cache in LLMService.
+"""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.agents.base.config import BaseAgentConfig
+from app.core.agents.base.llm_cache import LLMResponseCache
+from app.core.agents.base.llm_client import PooledLLMClient
+from app.core.agents.base.llm_service import LLMService
+from app.core.cache import AdvancedCacheManager
+
+
+class CountingCompletions:
+    def __init__(self, content="incident, ticket", delay=0.01):
+        self.content = content
+        self.delay = delay
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if kwargs["stream"]:
+            return self._stream()
+        message = SimpleNamespace(content=f" {self.content} ")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    async def _stream(self):
+        for part in self.content.split(" "):
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=part + " "))])
+
+
+@pytest.fixture
+def completions():
+    return CountingCompletions()
+
+
+@pytest.fixture
+def service(completions):
+    service = LLMService(BaseAgentConfig(openrouter_api_key="test-key"))
+    service.client = PooledLLMClient(SimpleNamespace(chat=SimpleNamespace(completions=completions)))
+    service.response_cache = LLMResponseCache(cache=AdvancedCacheManager())
+    return service
+
+
+class TestLLMResponseCache:
+    """Test cases for LLMResponseCache"""
+
+    def test_key_covers_every_parameter(self):
+        cache = LLMResponseCache(cache=AdvancedCacheManager())
+        messages = [{"role": "system", "content": "s"}, {"role": "user", "content": "p"}]
+        key = cache.make_key("text", "m", messages, 0.0, 100)
+
+        assert key == cache.make_key("text", "m", [dict(m) for m in messages], 0.0, 100)
+        assert key != cache.make_key("text", "m", messages[1:], 0.0, 100)
+        assert key != cache.make_key("text", "other", messages, 0.0, 100)
+        assert key != cache.make_key("text", "m", messages, 0.0, 200)
+        assert key != cache.make_key("chat", "m", messages, 0.0, 100)
+
+    def test_only_deterministic_calls_are_accepted(self):
+        cache = LLMResponseCache(cache=AdvancedCacheManager(), max_temperature=0.2)
+        assert cache.accepts(0.0) and cache.accepts(0.2)
+        assert not cache.accepts(0.7)
+
+
+class TestLLMServiceCaching:
+    """Test cases for caching in LLMService"""
+
+    @pytest.mark.asyncio
+    async def test_repeat_call_served_from_cache(self, service, completions):
+        first = await service.generate_response("extract keywords", "system", temperature=0.0)
+        second = await service.generate_response("extract keywords", "system", temperature=0.0)
+
+        assert first == second == "incident, ticket"
+        assert completions.calls == 1
+        stats = service.get_model_info()["cache"]
+        assert stats["hits"] == 1 and stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+        assert stats["latency_saved_ms"] >= 10
+
+    @pytest.mark.asyncio
+    async def test_bypass_and_sampled_calls(self, service, completions):
+        await service.generate_response("extract keywords", temperature=0.0)
+        await service.generate_response("extract keywords", temperature=0.0, use_cache=False)
+        await service.generate_response("extract keywords", temperature=0.7)
+        await service.generate_response("extract keywords", temperature=0.7)
+
+        assert completions.calls == 4
+        assert service.response_cache.stats["bypassed"] == 3
+
+    @pytest.mark.asyncio
+    async def test_streamed_response_is_cached(self, service, completions):
+        received = []
+
+        async def on_token(delta):
+            received.append(delta)
+
+        first = await service.generate_response("extract keywords", temperature=0.0, on_token=on_token)
+        second = await service.generate_response("extract keywords", temperature=0.0, on_token=on_token)
+
+        assert completions.calls == 1
+        assert first == second
+        assert received[-1] == first
+
+    @pytest.mark.asyncio
+    async def test_structured_and_chat_responses(self, service):
+        service.client.client.chat.completions.content = json.dumps({"keywords": ["incident"]})
+
+        first = await service.generate_structured_response("classify", temperature=0.0)
+        first["keywords"].append("mutated")
+        second = await service.generate_structured_response("classify", temperature=0.0)
+        assert second == {"keywords": ["incident"]}
+
+        messages = [{"role": "user", "content": "hello"}]
+        await service.generate_chat_response(messages, temperature=0.0)
+        await service.generate_chat_response(messages, temperature=0.0)
+        assert service.response_cache.stats["hits"] == 2
+
+    @pytest.mark.asyncio
+    async def test_clear(self, service, completions):
+        await service.generate_response("extract keywords", temperature=0.0)
+        assert await service.response_cache.clear() == 1
+        await service.generate_response("extract keywords", temperature=0.0)
+        assert completions.calls == 2
+
+    def test_disabled_by_default(self):
+        assert LLMService(BaseAgentConfig(openrouter_api_key="test-key")).response_cache is None
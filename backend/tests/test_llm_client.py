@@ -0,0 +1,196 @@
+"""
+Tests for the shared, rate-limited LLM client behind LLMService.
+"""
+
+import asyncio
+import sys
+from types import SimpleNamespace
+
+import openai
+import pytest
+
+from app.core.agents.base.config import BaseAgentConfig
+from app.core.agents.base.llm_client import (
+    PooledLLMClient,
+    TokenBucket,
+    clear_llm_clients,
+    get_llm_client,
+    is_retryable,
+    retry_after_seconds,
+)
+from app.core.agents.base.llm_service import LLMService
+
+
+class StatusError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(headers=headers or {})
+
+
+class ScriptedCompletions:
+    """Fails with the scripted errors first, then answers after ``delay`` seconds."""
+
+    def __init__(self, errors=(), delays=()):
+        self.errors = list(errors)
+        self.delays = list(delays)
+        self.calls = 0
+        self.active = 0
+        self.peak = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            call = self.calls
+            if self.errors:
+                raise self.errors.pop(0)
+            await asyncio.sleep(self.delays.pop(0) if self.delays else 0.01)
+            return SimpleNamespace(call=call)
+        finally:
+            self.active -= 1
+
+
+def pooled(completions, **kwargs):
+    kwargs.setdefault("retry_base_delay", 0.001)
+    return PooledLLMClient(SimpleNamespace(chat=SimpleNamespace(completions=completions)), **kwargs)
+
+
+REQUEST = {"model": "m", "messages": [{"role": "user", "content": "hi"}], "max_tokens": 10}
+
+
+class TestRetryPolicy:
+    """Test cases for retry classification and backoff"""
+
+    def test_is_retryable(self):
+        assert is_retryable(StatusError(429))
+        assert is_retryable(StatusError(503))
+        assert not is_retryable(StatusError(400))
+        assert not is_retryable(ValueError("bad"))
+
+    def test_retry_after(self):
+        assert retry_after_seconds(StatusError(429, {"retry-after": "2"})) == 2.0
+        assert retry_after_seconds(StatusError(429, {"retry-after-ms": "250"})) == 0.25
+        assert retry_after_seconds(StatusError(429)) is None
+
+    def test_backoff_is_capped_and_honours_retry_after(self):
+        client = pooled(ScriptedCompletions(), retry_base_delay=1.0, retry_max_delay=4.0)
+        assert all(0 <= client._backoff(10, StatusError(500)) <= 4.0 for _ in range(20))
+        assert client._backoff(0, StatusError(429, {"retry-after": "3"})) >= 3.0
+        assert client._backoff(0, StatusError(429, {"retry-after": "60"})) == 4.0
+
+
+class TestPooledLLMClient:
+    """Test cases for PooledLLMClient"""
+
+    @pytest.mark.asyncio
+    async def test_retries_rate_limits_and_server_errors(self):
+        completions = ScriptedCompletions(errors=[StatusError(429), StatusError(502)])
+        client = pooled(completions)
+
+        response = await client.create_chat_completion(**REQUEST)
+
+        assert response.call == 3
+        assert client.stats["retries"] == 2
+
+    @pytest.mark.asyncio
+    async def test_gives_up_on_client_errors_and_after_max_retries(self):
+        client = pooled(ScriptedCompletions(errors=[StatusError(400)]))
+        with pytest.raises(StatusError):
+            await client.create_chat_completion(**REQUEST)
+        assert client.stats["retries"] == 0
+
+        completions = ScriptedCompletions(errors=[StatusError(500)] * 5)
+        client = pooled(completions, max_retries=2)
+        with pytest.raises(StatusError):
+            await client.create_chat_completion(**REQUEST)
+        assert completions.calls == 3
+        assert client.stats["failures"] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit(self):
+        completions = ScriptedCompletions()
+        client = pooled(completions, max_concurrency=2)
+
+        await asyncio.gather(*(client.create_chat_completion(**REQUEST) for _ in range(6)))
+
+        assert completions.peak == 2
+
+    @pytest.mark.asyncio
+    async def test_hedged_request_wins(self):
+        completions = ScriptedCompletions(delays=[1.0, 0.01])
+        client = pooled(completions, hedge_after=0.05)
+
+        response = await client.create_chat_completion(**REQUEST)
+
+        assert response.call == 2
+        assert client.stats["hedged"] == 1 and client.stats["hedge_wins"] == 1
+        assert client.stats["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_fast_request_is_not_hedged(self):
+        client = pooled(ScriptedCompletions(), hedge_after=0.5)
+        await client.create_chat_completion(**REQUEST)
+        assert client.stats["hedged"] == 0
+
+    @pytest.mark.asyncio
+    async def test_token_bucket_waits_for_refill(self):
+        bucket = TokenBucket(rate_per_minute=600, capacity=2)
+        assert await bucket.acquire() == 0.0
+        assert await bucket.acquire() == 0.0
+        assert await bucket.acquire() == pytest.approx(0.1, abs=0.02)
+
+    @pytest.mark.asyncio
+    async def test_per_model_rate_limits(self):
+        client = pooled(ScriptedCompletions(), requests_per_minute=60)
+        await client.create_chat_completion(**REQUEST)
+        await client.create_chat_completion(**{**REQUEST, "model": "other"})
+        assert client.get_stats()["models"] == ["m", "other"]
+        assert client.stats["rate_limited_seconds"] == 0.0
+
+
+class TestSharedClient:
+    """Test cases for sharing one client per base URL and key"""
+
+    def test_services_share_a_client(self):
+        clear_llm_clients()
+        config = BaseAgentConfig(openrouter_api_key="key-a")
+
+        first, second = LLMService(config), LLMService(BaseAgentConfig(openrouter_api_key="key-a", model_name="other"))
+
+        assert first.client is second.client
+        assert get_llm_client(BaseAgentConfig(openrouter_api_key="key-b")) is not first.client
+        assert first.client.client.max_retries == 0
+        clear_llm_clients()
+
+    @pytest.mark.asyncio
+    async def test_real_openai_client_sends_requests(self, monkeypatch):
+        # The HTTP library the installed SDK is built on (httpx, or a fork of it)
+        httpx = sys.modules[openai.DefaultAsyncHttpxClient.__mro__[1].__module__]
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json={
+                "id": "cmpl-1",
+                "object": "chat.completion",
+                "created": 0,
+                "model": "m",
+                "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "hello"}}]
+            })
+
+        http_client = openai.DefaultAsyncHttpxClient
+        monkeypatch.setattr(openai, "DefaultAsyncHttpxClient",
+                            lambda **kwargs: http_client(transport=httpx.MockTransport(handler), **kwargs))
+        clear_llm_clients()
+        client = get_llm_client(BaseAgentConfig(openrouter_api_key="key-a", llm_timeout=7.0))
+
+        response = await client.create_chat_completion(**REQUEST)
+
+        assert response.choices[0].message.content == "hello"
+        assert len(requests) == 1
+        assert requests[0].url.path.endswith("/chat/completions")
+        assert requests[0].headers["Authorization"] == "Bearer key-a"
+        assert requests[0].extensions["timeout"]["read"] == 7.0
+        clear_llm_clients()
@@ -0,0 +1,86 @@
+"""
+Tests for the shared, lazily loaded model registry.
+"""
+
+import threading
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.core.model_registry import CROSS_ENCODER, EMBEDDINGS, ModelRegistry, model_registry
+
+
+class FakeModel:
+    def predict(self, pairs):
+        return [0.5 for _ in pairs]
+
+
+class TestModelRegistry:
+    """Test cases for ModelRegistry"""
+
+    def test_loads_lazily_and_shares_instance(self):
+        registry = ModelRegistry()
+        loads = []
+        registry.register("model", lambda: loads.append(1) or FakeModel())
+
+        assert not registry.is_loaded("model")
+        assert loads == []
+        first = registry.get("model")
+        assert registry.get("model") is first
+        assert loads == [1]
+
+        stats = registry.get_stats()["model"]
+        assert stats["loaded"] and stats["load_seconds"] >= 0 and stats["memory_bytes"] >= 0
+
+    def test_concurrent_first_use_loads_once(self):
+        registry = ModelRegistry()
+        loads = []
+
+        def slow_factory():
+            loads.append(1)
+            time.sleep(0.05)
+            return FakeModel()
+
+        registry.register("model", slow_factory)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(registry.get("model"))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert loads == [1]
+        assert all(result is results[0] for result in results)
+
+    def test_lazy_proxy_forwards_attributes(self):
+        registry = ModelRegistry()
+        registry.register("model", FakeModel)
+        proxy = registry.lazy("model")
+
+        assert not registry.is_loaded("model")
+        assert proxy.predict([("q", "d")]) == [0.5]
+        assert registry.is_loaded("model")
+
+    def test_warmup_reports_failures_without_raising(self):
+        registry = ModelRegistry()
+        registry.register("ok", FakeModel)
+        registry.register("broken", lambda: 1 / 0)
+
+        stats = registry.warmup()
+
+        assert stats["ok"]["loaded"]
+        assert not stats["broken"]["loaded"] and "division by zero" in stats["broken"]["error"]
+
+    def test_unknown_model(self):
+        with pytest.raises(KeyError):
+            ModelRegistry().get("missing")
+
+    def test_retriever_construction_does_not_load_models(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "PROCESSED_DATA_DIR", str(tmp_path))
+        from app.core.retrieval.api.retriever import ApiRetriever
+
+        ApiRetriever()
+
+        assert not model_registry.is_loaded(CROSS_ENCODER)
+        assert not model_registry.is_loaded(EMBEDDINGS)
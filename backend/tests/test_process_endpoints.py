@@ -0,0 +1,240 @@
+"""
+Tests for the background indexing job endpoints and the job runner.
+"""
+
+import json
+import uuid
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1.endpoints import process
+from app.core.cache import index_tag
+from app.core.config import settings
+from app.core.state import state_manager, ProcessingStatus
+from app.core.tasks import tasks
+from app.core.tasks.queue import TaskInfo, TaskStatus
+
+
+class FakeTaskQueue:
+    """In-memory stand-in for the Redis task queue"""
+
+    def __init__(self):
+        self.tasks = {}
+        self.enqueued = []
+        self.fail_enqueue = False
+
+    async def enqueue_task(self, task_name, args=None, kwargs=None, priority=0, delay=None, metadata=None):
+        if self.fail_enqueue:
+            raise ConnectionError("redis down")
+        task_id = str(uuid.uuid4())
+        self.enqueued.append((task_name, kwargs))
+        self.tasks[task_id] = TaskInfo(
+            id=task_id, name=task_name, status=TaskStatus.PENDING,
+            created_at=datetime.utcnow(), metadata=metadata or {}
+        )
+        return task_id
+
+    async def get_task_info(self, task_id):
+        return self.tasks.get(task_id)
+
+    async def update_task_status(self, task_id, status, result=None, error=None, progress=None):
+        task_info = self.tasks[task_id]
+        task_info.status = status
+        if progress is not None:
+            task_info.progress = progress
+
+
+class FakeTracker:
+    def __init__(self, operation_id):
+        self.operation_id = operation_id
+        self.metadata = {}
+        self.steps = []
+        self.events = []
+        self.callbacks = []
+
+    def add_steps(self, steps):
+        self.steps = [step["step_id"] for step in steps]
+
+    def add_progress_callback(self, callback):
+        self.callbacks.append(callback)
+
+    async def start(self):
+        self.events.append("start")
+
+    async def update_step_progress(self, step_id, progress, status=None):
+        self.events.append((step_id, progress))
+        for callback in self.callbacks:
+            await callback(type("Metrics", (), {"total_progress": progress})())
+
+    async def complete_step(self, step_id):
+        self.events.append(("done", step_id))
+
+    async def complete(self, result=None):
+        self.events.append("complete")
+
+    async def fail(self, error):
+        self.events.append(("fail", error))
+
+    def get_status(self):
+        return {"operation_id": self.operation_id, "events": len(self.events)}
+
+
+class FakeProgressManager:
+    def __init__(self):
+        self.trackers = {}
+
+    def create_tracker(self, operation_name, operation_type, operation_id=None):
+        tracker = self.trackers[operation_id] = FakeTracker(operation_id)
+        return tracker
+
+    async def get_progress_status(self, operation_id):
+        tracker = self.trackers.get(operation_id)
+        return tracker.get_status() if tracker else None
+
+
+class FakeCache:
+    def __init__(self):
+        self.invalidated = []
+
+    async def invalidate_tags(self, tags):
+        self.invalidated.extend(tags)
+        return 0
+
+
+@pytest.fixture
+def state_file(tmp_path, monkeypatch):
+    path = tmp_path / "processing_state.json"
+    path.write_text(json.dumps({"document": "READY", "api": "READY"}))
+    monkeypatch.setattr(settings, "STATE_FILE", str(path))
+    monkeypatch.setattr(state_manager, "_mtime", None)
+    yield path
+    # Re-read the real state file for other tests
+    monkeypatch.undo()
+    state_manager._mtime = None
+    state_manager._refresh_from_disk()
+
+
+@pytest.fixture
+def queue(monkeypatch):
+    fake = FakeTaskQueue()
+    monkeypatch.setattr(process, "task_queue", fake)
+    monkeypatch.setattr(tasks, "task_queue", fake)
+    return fake
+
+
+@pytest.fixture
+def progress(monkeypatch):
+    fake = FakeProgressManager()
+    monkeypatch.setattr(process, "progress_manager", fake)
+    monkeypatch.setattr(tasks, "progress_manager", fake)
+    return fake
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    fake = FakeCache()
+    monkeypatch.setattr(tasks, "advanced_cache", fake)
+    return fake
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(process.router, prefix="/api/v1/process")
+    return TestClient(app)
+
+
+class TestProcessEndpoints:
+    """Test cases for enqueueing and polling indexing jobs"""
+
+    def test_enqueues_job_and_returns_202(self, client, state_file, queue, progress):
+        response = client.post("/api/v1/process/api", params={"incremental": "false"})
+
+        assert response.status_code == 202
+        body = response.json()
+        assert body["status"] == "PROCESSING"
+        assert body["status_url"] == f"/api/v1/process/jobs/{body['job_id']}"
+        assert queue.enqueued == [("index_api_spec", {"incremental": False})]
+        assert state_manager.get_status("api") == ProcessingStatus.PROCESSING
+
+    def test_second_request_conflicts(self, client, state_file, queue, progress):
+        assert client.post("/api/v1/process/document").status_code == 202
+
+        response = client.post("/api/v1/process/document")
+
+        assert response.status_code == 409
+        assert len(queue.enqueued) == 1
+
+    def test_enqueue_failure_restores_state(self, client, state_file, queue, progress):
+        queue.fail_enqueue = True
+
+        response = client.post("/api/v1/process/api")
+
+        assert response.status_code == 503
+        assert state_manager.get_status("api") == ProcessingStatus.READY
+        assert client.post("/api/v1/process/api").status_code == 503
+
+    def test_job_status(self, client, state_file, queue, progress):
+        job_id = client.post("/api/v1/process/api").json()["job_id"]
+        progress.create_tracker("API spec indexing", "indexing", operation_id=job_id)
+
+        body = client.get(f"/api/v1/process/jobs/{job_id}").json()
+
+        assert body["job_id"] == job_id
+        assert body["source"] == "api"
+        assert body["status"] == "pending"
+        assert body["phases"] == {"operation_id": job_id, "events": 0}
+        assert client.get("/api/v1/process/jobs/unknown").status_code == 404
+
+
+class TestRunIndexingJob:
+    """Test cases for the background indexing job runner"""
+
+    async def enqueue(self, queue):
+        return await queue.enqueue_task("index_api_spec", metadata={"source": "api"})
+
+    @pytest.mark.asyncio
+    async def test_mirrors_phases_and_invalidates_results(self, state_file, queue, progress, cache):
+        task_id = await self.enqueue(queue)
+
+        def run_indexer(progress_callback):
+            progress_callback("load", 100.0)
+            progress_callback("tokenize", 50.0)
+            return True
+
+        result = await tasks._run_indexing_job(task_id, "api", "API spec indexing", tasks.API_INDEXING_STEPS, run_indexer)
+
+        tracker = progress.trackers[task_id]
+        assert tracker.events == ["start", ("load", 100.0), ("done", "load"), ("tokenize", 50.0), "complete"]
+        assert queue.tasks[task_id].progress == 50
+        assert cache.invalidated == [index_tag("api")]
+        assert result["source"] == "api" and result["status"] == "READY"
+
+    @pytest.mark.asyncio
+    async def test_failure_marks_source_as_error(self, state_file, queue, progress, cache):
+        task_id = await self.enqueue(queue)
+        state_manager.begin_processing("api")
+
+        def run_indexer(progress_callback):
+            raise RuntimeError("spec not found")
+
+        with pytest.raises(RuntimeError):
+            await tasks._run_indexing_job(task_id, "api", "API spec indexing", tasks.API_INDEXING_STEPS, run_indexer)
+
+        assert state_manager.get_status("api") == ProcessingStatus.ERROR
+        assert progress.trackers[task_id].events[-1] == ("fail", "spec not found")
+        assert cache.invalidated == []
+
+    @pytest.mark.asyncio
+    async def test_unsuccessful_indexer_fails_the_job(self, state_file, queue, progress, cache):
+        task_id = await self.enqueue(queue)
+
+        with pytest.raises(Exception, match="API spec indexing failed"):
+            await tasks._run_indexing_job(task_id, "api", "API spec indexing", tasks.API_INDEXING_STEPS,
+                                          lambda progress_callback: False)
+
+        assert progress.trackers[task_id].events[-1] == ("fail", "API spec indexing failed")
+        assert cache.invalidated == []
@@ -0,0 +1,50 @@
+"""
+Tests for cross-process consistency of ProcessingStateManager.
+"""
+
+import json
+import os
+import pytest
+
+from app.core.config import settings
+from app.core.state import state_manager, ProcessingStatus
+
+
+class TestProcessingStateManager:
+    """Test cases for the shared processing state file"""
+
+    @pytest.fixture
+    def state_file(self, tmp_path, monkeypatch):
+        path = tmp_path / "processing_state.json"
+        path.write_text(json.dumps({"document": "READY", "api": "UNPROCESSED"}))
+        monkeypatch.setattr(settings, "STATE_FILE", str(path))
+        monkeypatch.setattr(state_manager, "_mtime", None)
+        yield path
+        # Re-read the real state file for other tests
+        monkeypatch.undo()
+        state_manager._mtime = None
+        state_manager._refresh_from_disk()
+
+    def write_from_other_process(self, path, data):
+        path.write_text(json.dumps(data))
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    def test_reads_changes_from_other_processes(self, state_file):
+        assert state_manager.get_status("api") == ProcessingStatus.UNPROCESSED
+
+        self.write_from_other_process(state_file, {"document": "READY", "api": "PROCESSING"})
+        assert state_manager.get_status("api") == ProcessingStatus.PROCESSING
+
+    def test_set_status_preserves_other_sources(self, state_file):
+        state_manager.get_status("api")
+        self.write_from_other_process(state_file, {"document": "ERROR", "api": "UNPROCESSED"})
+
+        state_manager.set_status("api", ProcessingStatus.READY)
+        assert json.loads(state_file.read_text()) == {"document": "ERROR", "api": "READY"}
+
+    def test_begin_processing_is_exclusive(self, state_file):
+        assert state_manager.begin_processing("api") == ProcessingStatus.UNPROCESSED
+        assert state_manager.begin_processing("api") is None
+        assert state_manager.get_status("api") == ProcessingStatus.PROCESSING
+        assert state_manager.begin_processing("unknown") is None
@@ -0,0 +1,60 @@
+"""
+Tests for the document retriever's query-embedding LRU.
+"""
+
+import numpy as np
+
+from app.core.retrieval.document.query_cache import QueryEmbeddingCache
+
+
+class CountingEmbedder:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, text):
+        self.calls.append(text)
+        return [float(len(text)), 1.0]
+
+
+class TestQueryEmbeddingCache:
+    """Test cases for QueryEmbeddingCache"""
+
+    def test_repeated_queries_hit_cache(self):
+        embed = CountingEmbedder()
+        cache = QueryEmbeddingCache(embed, max_size=8)
+
+        first = cache.get("List open incidents")
+        second = cache.get("  list   OPEN incidents ")
+
+        assert embed.calls == ["list open incidents"]
+        assert second is first
+        assert first.dtype == np.float32
+        stats = cache.get_stats()
+        assert stats["hits"] == 1 and stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_evicts_least_recently_used(self):
+        embed = CountingEmbedder()
+        cache = QueryEmbeddingCache(embed, max_size=2)
+
+        cache.get("a")
+        cache.get("b")
+        cache.get("a")
+        cache.get("c")  # evicts "b"
+        cache.get("a")
+        cache.get("b")
+
+        assert embed.calls == ["a", "b", "c", "b"]
+        assert cache.get_stats()["evictions"] == 2
+        assert cache.get_stats()["size"] == 2
+
+    def test_cached_vectors_are_read_only(self):
+        cache = QueryEmbeddingCache(CountingEmbedder(), max_size=2)
+        assert not cache.get("query").flags.writeable
+
+    def test_zero_size_disables_caching(self):
+        embed = CountingEmbedder()
+        cache = QueryEmbeddingCache(embed, max_size=0)
+        cache.get("q")
+        cache.get("q")
+        assert len(embed.calls) == 2
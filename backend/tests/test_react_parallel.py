@@ -0,0 +1,120 @@
+"""
+Tests for parallel action planning, tool-call memoization and early exit in
+ReActStrategy.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.core.agents.augment.strategies.react import ReActStrategy
+from app.core.agents.base.config import BaseAgentConfig
+
+FOUND = [{"path": "/incidents", "method": "GET", "description": "List incidents", "operationId": "listIncidents"}]
+
+
+class SlowRetriever:
+    name = "knowledge_retriever"
+    description = "Search Infraon documentation and APIs"
+
+    def __init__(self, results=None, delay=0.1):
+        self.results = results or {}
+        self.delay = delay
+        self.calls = []
+
+    async def retrieve(self, query):
+        self.calls.append(query)
+        await asyncio.sleep(self.delay)
+        return self.results.get(query, [])
+
+
+class Calculator:
+    name = "calculator"
+    description = "Perform mathematical calculations"
+
+    def func(self, expression):
+        return str(eval(expression))
+
+
+def strategy(**config):
+    # No API key: the final answer falls back to the heuristic one
+    return ReActStrategy({"parallel_actions": True, "max_reasoning_loops": 3, **config}, BaseAgentConfig(openrouter_api_key=""))
+
+
+def planner(*thoughts, delay=0.0):
+    """Replaces the LLM planner with scripted thoughts"""
+    calls = []
+
+    async def generate_thought(query, observations, available_tools, iteration, plan=False):
+        calls.append(iteration)
+        await asyncio.sleep(delay)
+        return thoughts[min(iteration, len(thoughts) - 1)]
+
+    return generate_thought, calls
+
+
+class TestPlanActions:
+    """Test cases for ReActStrategy._plan_actions"""
+
+    def test_parses_multiple_actions(self):
+        thought = "I should look up both.\n1. search: incident SLA\n2. search: change approval\n- calculate: 2*4\n1. search: incident SLA"
+        actions = strategy()._plan_actions(thought, "q", [], [SlowRetriever(), Calculator()])
+        assert actions == [("search", "incident SLA"), ("search", "change approval"), ("calculate", "2*4")]
+
+    def test_limits_and_filters(self):
+        thought = "search: a\nsearch: b\nsearch: c\ncalculate: 1+1"
+        assert strategy(max_parallel_actions=2)._plan_actions(thought, "q", [], [SlowRetriever()]) == [("search", "a"), ("search", "b")]
+        assert strategy()._plan_actions("calculate: 1+1", "q", [], [SlowRetriever()]) == [("search", "q")]
+
+    def test_conclude_needs_observations(self):
+        assert strategy()._plan_actions("conclude", "q", [], []) == [("search", "q")]
+        assert strategy()._plan_actions("conclude", "q", ["obs"], []) == [("conclude", "")]
+
+    def test_falls_back_to_heuristic_action(self):
+        thought = "Let me search for relevant information first."
+        assert strategy()._plan_actions(thought, "what is an incident", [], []) == [("search", "what is an incident")]
+
+
+class TestParallelExecution:
+    """Test cases for ReActStrategy parallel execution"""
+
+    @pytest.mark.asyncio
+    async def test_planned_actions_run_concurrently(self):
+        react = strategy()
+        react._generate_thought, _ = planner("search: incident SLA\nsearch: change approval\nsearch: problem records")
+        retriever = SlowRetriever(delay=0.2)
+
+        start = time.perf_counter()
+        response = await react.execute("compare SLAs", None, [retriever])
+        elapsed = time.perf_counter() - start
+
+        # The three planned searches and the speculative search of the query
+        # overlap; three empty observations are enough to conclude
+        assert sorted(retriever.calls) == ["change approval", "compare SLAs", "incident SLA", "problem records"]
+        assert elapsed < 0.35
+        assert response.metadata["iterations"] == 3
+
+    @pytest.mark.asyncio
+    async def test_early_exit_skips_planner(self):
+        react = strategy()
+        react._generate_thought, calls = planner("search: something else", delay=1.0)
+        retriever = SlowRetriever(results={"list incidents": FOUND}, delay=0.01)
+
+        start = time.perf_counter()
+        response = await react.execute("list incidents", None, [retriever])
+
+        assert time.perf_counter() - start < 0.5
+        assert calls == [0]
+        assert retriever.calls == ["list incidents"]
+        assert response.sources[0].reference == "listIncidents"
+        assert response.reasoning_chain[-2].content == "The initial search already answers the query."
+
+    @pytest.mark.asyncio
+    async def test_serial_mode_memoizes_repeated_searches(self):
+        react = strategy(parallel_actions=False)
+        retriever = SlowRetriever(delay=0.0)
+
+        await react.execute("unknown topic", None, [retriever])
+
+        assert retriever.calls == ["unknown topic"]
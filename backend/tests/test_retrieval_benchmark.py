@@ -0,0 +1,170 @@
+"""
+Tests for the offline retrieval benchmark, including a relevance regression
+check of the API first stage over the Infraon OpenAPI spec.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from app.core.config import settings
+from app.core.manoman.agents.testing_agent import TestingAgent
+from app.core.manoman.models.service_registry import APIEndpoint, ServiceDefinition, ServiceOperation, ServiceRegistry
+from app.core.processing.api.indexer import ApiIndexer
+from app.core.processing.api.openapi import load_openapi_endpoints
+from app.core.retrieval.benchmark import (
+    LabeledQuery,
+    RetrievalBenchmark,
+    compare_results,
+    labeled_queries_from_test_suite,
+    latency_summary,
+    load_labeled_queries,
+    load_results,
+    recall_at_k,
+    reciprocal_rank,
+    save_results,
+)
+from app.core.retrieval.timing import timed_stage
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+SPEC_PATH = BACKEND_DIR.parent / "user_docs" / "infraon-openapi.yaml"
+QUERIES_PATH = BACKEND_DIR / "benchmarks" / "retrieval_queries.json"
+
+
+class PassthroughCrossEncoder:
+    """Scores every pair equally, so reranking keeps the first-stage order."""
+
+    def predict(self, pairs, **kwargs):
+        return [0.0] * len(pairs)
+
+
+@pytest.fixture
+def registry():
+    service = ServiceDefinition(
+        service_name="user_management",
+        service_description="Handles user creation and management.",
+        business_context="Core identity service for the platform.",
+        tier1_operations={
+            "create_user": ServiceOperation(
+                endpoint=APIEndpoint(path="/users", method="POST", operation_id="createUser"),
+                description="Create a new user.",
+            ),
+        },
+        tier2_operations={
+            "get_user": ServiceOperation(
+                endpoint=APIEndpoint(path="/users/{id}", method="GET", operation_id="getUser"),
+                description="Get a user by ID.",
+            ),
+        },
+    )
+    return ServiceRegistry(
+        registry_id="test-registry",
+        version="1.0",
+        services={"user_management": service},
+        created_timestamp="2025-01-01T00:00:00Z",
+        last_updated="2025-01-01T00:00:00Z",
+    )
+
+
+class TestRetrievalMetrics:
+    """Test cases for the benchmark metrics"""
+
+    def test_recall_at_k(self):
+        ranked = [["a"], ["b"], [], ["c"]]
+        assert recall_at_k(ranked, ["a", "c"], 1) == 0.5
+        assert recall_at_k(ranked, ["a", "c"], 4) == 1.0
+        assert recall_at_k([], ["a"], 5) == 0.0
+        assert recall_at_k(ranked, [], 5) == 0.0
+
+    def test_reciprocal_rank(self):
+        assert reciprocal_rank([["a"], ["b"], ["c"]], ["c"]) == pytest.approx(1 / 3)
+        assert reciprocal_rank([["a"], ["b", "c"]], ["c", "a"]) == 1.0
+        assert reciprocal_rank([["a"]], ["z"]) == 0.0
+
+    def test_latency_summary(self):
+        summary = latency_summary(range(1, 101))
+        assert summary["count"] == 100
+        assert summary["p50"] == pytest.approx(50.5)
+        assert summary["p99"] == pytest.approx(99.01)
+        assert latency_summary([]) == {"count": 0}
+
+    def test_timed_stage(self):
+        trace = {}
+        with timed_stage(trace, "rerank"):
+            pass
+        with timed_stage(trace, "rerank"):
+            pass
+        assert set(trace["timings_ms"]) == {"rerank"}
+        with timed_stage(None, "rerank"):
+            pass
+
+
+class TestLabeledQueries:
+    """Test cases for seeding labeled queries from a TestSuite"""
+
+    @pytest.mark.asyncio
+    async def test_seeded_from_test_suite(self, registry):
+        agent = TestingAgent(llm_service=None, query_classifier=None, api_client=None)
+        test_suite = await agent.generate_test_suite(registry)
+
+        labeled = {query.source.split(":")[0]: query for query in labeled_queries_from_test_suite(test_suite, registry)}
+
+        assert labeled["basic_crud"].relevant_operations == ["createUser"]
+        assert labeled["service_identification"].query == "Handles user creation and management."
+        assert sorted(labeled["service_identification"].relevant_operations) == ["createUser", "getUser"]
+
+    def test_query_set_round_trip(self, tmp_path):
+        path = tmp_path / "queries.json"
+        path.write_text(json.dumps([LabeledQuery("list users", relevant_operations=["listUsers"]).to_dict()]))
+        assert load_labeled_queries(str(path)) == [LabeledQuery("list users", relevant_operations=["listUsers"])]
+
+
+class TestRetrievalBenchmark:
+    """Test cases for RetrievalBenchmark over the Infraon API spec"""
+
+    @pytest.fixture
+    def api_retriever(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "PROCESSED_DATA_DIR", str(tmp_path))
+        monkeypatch.setattr(settings, "STATE_FILE", str(tmp_path / "processing_state.json"))
+        monkeypatch.setattr(settings, "API_SPEC_PATH", str(tmp_path / "spec.json"))
+        monkeypatch.setattr(settings, "API_FIRST_STAGE", "bm25")
+        (tmp_path / "spec.json").write_text(json.dumps(load_openapi_endpoints(SPEC_PATH)))
+        assert ApiIndexer().index()
+
+        from app.core.retrieval.api.retriever import ApiRetriever
+        retriever = ApiRetriever()
+        retriever.reranker.cross_encoder = PassthroughCrossEncoder()
+        return retriever
+
+    def test_first_stage_relevance(self, api_retriever):
+        queries = [query for query in load_labeled_queries(str(QUERIES_PATH)) if query.relevant_operations]
+        results = RetrievalBenchmark(api_retriever=api_retriever, repeat=1).run(queries)
+
+        quality = results["api"]["quality"]
+        assert quality["evaluated"] == len(queries)
+        # Floors for the BM25 first stage alone; raise them when it improves
+        assert quality["candidate_recall"] == 1.0
+        assert quality["recall@5"] >= 0.9
+        assert quality["mrr"] >= 0.75
+        assert set(results["api"]["latency_ms"]) == {"tokenize", "candidates", "rerank", "total"}
+
+    def test_save_and_compare(self, api_retriever, tmp_path):
+        benchmark = RetrievalBenchmark(api_retriever=api_retriever, k_values=(1, 5), repeat=2)
+        baseline = benchmark.run([LabeledQuery("list all incidents", relevant_operations=["ux_sd_inci_incident_list"])])
+        save_results(baseline, str(tmp_path / "results" / "baseline.json"))
+
+        comparison = compare_results(load_results(str(tmp_path / "results" / "baseline.json")), baseline)
+
+        assert comparison["api"]["quality"] == {"recall@1": 0.0, "recall@5": 0.0, "candidate_recall": 0.0, "mrr": 0.0}
+        assert comparison["api"]["latency_ms"]["total"] == {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+        assert "document" not in comparison
+
+    def test_unavailable_model_is_reported(self, api_retriever):
+        class BrokenCrossEncoder:
+            def predict(self, pairs, **kwargs):
+                raise RuntimeError("model not installed")
+
+        api_retriever.reranker.cross_encoder = BrokenCrossEncoder()
+        results = RetrievalBenchmark(api_retriever=api_retriever).run([LabeledQuery("list incidents")])
+        assert "model not installed" in results["api"]["error"]
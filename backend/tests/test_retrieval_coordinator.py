@@ -0,0 +1,71 @@
+"""
+Tests for concurrent retrieval legs with per-leg timeouts.
+"""
+
+import time
+
+import pytest
+
+from app.core.retrieval.fusion.coordinator import RetrievalCoordinator
+from app.core.retrieval.fusion.fuser import Fuser
+
+
+def sleepy_leg(delay, results):
+    def leg():
+        time.sleep(delay)
+        return results
+    return leg
+
+
+def failing_leg():
+    raise RuntimeError("cross-encoder unavailable")
+
+
+@pytest.fixture
+def coordinator():
+    return RetrievalCoordinator(Fuser(method="rrf", weights=[1.0, 1.0]), timeouts={"api": 0.5, "document": 0.5})
+
+
+API = [({"path": "/incidents"}, 3.0)]
+DOCS = [({"path": "/guide"}, -0.2)]
+
+
+class TestRetrievalCoordinator:
+    """Test cases for RetrievalCoordinator"""
+
+    def test_legs_run_concurrently(self, coordinator):
+        start = time.perf_counter()
+        fused = coordinator.run({"api": sleepy_leg(0.2, API), "document": sleepy_leg(0.2, DOCS)}, top_k=5)
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.35
+        assert fused["results"] == [API[0][0], DOCS[0][0]]
+        assert not fused["partial"]
+        legs = fused["timings"]["legs"]
+        assert legs["api"]["status"] == "ok" and legs["api"]["count"] == 1
+        assert legs["document"]["elapsed_ms"] >= 200
+
+    def test_slow_leg_returns_partial_results(self, coordinator):
+        fused = coordinator.run({"api": sleepy_leg(0.0, API), "document": sleepy_leg(1.0, DOCS)}, top_k=5)
+
+        assert fused["results"] == [API[0][0]]
+        assert fused["partial"]
+        assert fused["timings"]["legs"]["document"]["status"] == "timeout"
+
+    def test_failed_and_error_legs_are_reported(self, coordinator):
+        fused = coordinator.run({"api": failing_leg, "document": lambda: {"error": "FAISS index is not available."}}, top_k=5)
+
+        assert fused["results"] == []
+        legs = fused["timings"]["legs"]
+        assert legs["api"] == {"status": "error", "elapsed_ms": legs["api"]["elapsed_ms"], "count": 0,
+                               "error": "cross-encoder unavailable"}
+        assert legs["document"]["error"] == "FAISS index is not available."
+
+    @pytest.mark.asyncio
+    async def test_async_run_matches_sync(self, coordinator):
+        start = time.perf_counter()
+        fused = await coordinator.arun({"api": sleepy_leg(0.0, API), "document": sleepy_leg(1.0, DOCS)}, top_k=5)
+
+        assert time.perf_counter() - start < 0.9
+        assert fused["results"] == [API[0][0]]
+        assert fused["timings"]["legs"]["document"]["status"] == "timeout"
@@ -0,0 +1,220 @@
+"""
+Tests for the semantic response cache in front of BaseAgent.process.
+"""
+
+import zlib
+from unittest.mock import AsyncMock
+
+import numpy as np
+import pytest
+
+from app.core.agents.base.agent import BaseAgent
+from app.core.agents.base.config import BaseAgentConfig
+from app.core.agents.base.memory import AgentMemory
+from app.core.agents.base.memory_store import RedisMemoryStore
+from app.core.agents.base.response import AgentRequest, AgentResponse
+from app.core.agents.base.semantic_cache import SemanticResponseCache
+from app.core.agents.base.strategy import AgentStrategy
+from app.core.cache import SERVICE_REGISTRY_TAG, AdvancedCacheManager, index_tag
+from app.core.cache import strategy as cache_strategy
+
+# Hand-made unit vectors: "list" and "show" paraphrases point the same way
+VECTORS = {
+    "list open incidents": [1.0, 0.0, 0.0],
+    "show open incidents": [0.98, 0.2, 0.0],
+    "delete a user": [0.0, 0.0, 1.0],
+}
+
+
+class FakeEmbedder:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, query):
+        self.calls += 1
+        if query in VECTORS:
+            return np.pad(VECTORS[query], (0, 61))
+        # Any other query gets its own random direction
+        return np.random.default_rng(zlib.crc32(query.encode())).standard_normal(64)
+
+
+@pytest.fixture(autouse=True)
+def no_redis(monkeypatch):
+    monkeypatch.setattr(cache_strategy.cache_manager, "delete", AsyncMock(return_value=True))
+
+
+@pytest.fixture
+def embedder():
+    return FakeEmbedder()
+
+
+@pytest.fixture
+def cache(embedder):
+    return SemanticResponseCache(embedder, cache=AdvancedCacheManager(), threshold=0.9, max_entries=4)
+
+
+class TestSemanticResponseCache:
+    """Test cases for SemanticResponseCache"""
+
+    @pytest.mark.asyncio
+    async def test_exact_match_skips_embedding(self, cache, embedder):
+        await cache.store("list open incidents", AgentResponse(answer="42 incidents", confidence=0.9))
+        calls = embedder.calls
+
+        response = await cache.lookup("  List OPEN incidents ")
+
+        assert response.answer == "42 incidents"
+        assert response.metadata["semantic_cache"]["similarity"] == 1.0
+        assert embedder.calls == calls
+        assert cache.stats["exact_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_near_duplicate_hit_and_distant_miss(self, cache):
+        await cache.store("list open incidents", AgentResponse(answer="42 incidents", confidence=0.9))
+
+        response = await cache.lookup("show open incidents")
+        assert response.answer == "42 incidents"
+        assert response.metadata["semantic_cache"]["matched_query"] == "list open incidents"
+        assert response.metadata["semantic_cache"]["similarity"] == pytest.approx(0.98, abs=0.01)
+
+        assert await cache.lookup("delete a user") is None
+        assert cache.stats["hits"] == 1 and cache.stats["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_scopes_are_isolated(self, cache):
+        await cache.store("list open incidents", AgentResponse(answer="direct", confidence=0.9), scope="direct")
+        assert await cache.lookup("show open incidents", scope="react") is None
+        assert (await cache.lookup("show open incidents", scope="direct")).answer == "direct"
+
+    @pytest.mark.asyncio
+    async def test_tag_invalidation(self, cache):
+        await cache.store("list open incidents", AgentResponse(answer="42 incidents", confidence=0.9))
+
+        assert await cache.cache.invalidate_tags([index_tag("api")]) == 1
+
+        assert await cache.lookup("show open incidents") is None
+        assert cache.stats["stale"] == 1
+        assert cache.get_stats()["entries"] == 0
+
+        await cache.store("delete a user", AgentResponse(answer="done", confidence=0.9))
+        assert await cache.cache.invalidate_tags([SERVICE_REGISTRY_TAG]) == 1
+
+    @pytest.mark.asyncio
+    async def test_bounded_entries(self, cache):
+        for i in range(6):
+            await cache.store(f"query {i}", AgentResponse(answer=str(i), confidence=0.9))
+        assert cache.get_stats()["entries"] == 4
+        assert await cache.lookup("query 0") is None
+        assert (await cache.lookup("query 5")).answer == "5"
+
+    @pytest.mark.asyncio
+    async def test_embedding_failure_keeps_exact_matches(self):
+        def broken(query):
+            raise RuntimeError("model unavailable")
+
+        cache = SemanticResponseCache(broken, cache=AdvancedCacheManager())
+        await cache.store("list open incidents", AgentResponse(answer="42 incidents", confidence=0.9))
+
+        assert (await cache.lookup("list open incidents")).answer == "42 incidents"
+        assert await cache.lookup("show open incidents") is None
+
+
+class CountingStrategy(AgentStrategy):
+    def __init__(self):
+        super().__init__({})
+        self.calls = 0
+        self.memory_contexts = []
+
+    async def execute(self, query, context, tools, memory_context=""):
+        self.calls += 1
+        self.memory_contexts.append(memory_context)
+        if query == "fail":
+            return AgentResponse(answer="error", confidence=0.0, metadata={"error": "boom"})
+        return AgentResponse(answer=f"answer {self.calls}", confidence=0.8, metadata={"strategy": "counting"})
+
+    def get_strategy_name(self):
+        return "counting"
+
+
+class DictCacheManager:
+    """Dict-backed stand-in for the Redis CacheManager"""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key, prefix="cache", default=None):
+        return self.data.get(f"{prefix}:{key}", default)
+
+    async def set(self, key, value, expire=None, prefix="cache"):
+        self.data[f"{prefix}:{key}"] = value
+        return True
+
+
+class CachedAgent(BaseAgent):
+    def _initialize_retriever(self):
+        return None
+
+    def _initialize_tools(self):
+        return []
+
+    def _initialize_strategy(self):
+        return CountingStrategy()
+
+    def _initialize_response_cache(self):
+        return SemanticResponseCache(FakeEmbedder(), cache=AdvancedCacheManager(), threshold=self.config.semantic_cache_threshold)
+
+
+class TestBaseAgentResponseCache:
+    """Test cases for the semantic cache in BaseAgent.process"""
+
+    @pytest.fixture
+    def agent(self):
+        return CachedAgent(BaseAgentConfig(retrieval_enabled=False, enable_memory=False,
+                                           semantic_cache_enabled=True, semantic_cache_threshold=0.9))
+
+    @pytest.mark.asyncio
+    async def test_near_duplicate_served_from_cache(self, agent):
+        first = await agent.process(AgentRequest(query="list open incidents"))
+        second = await agent.process(AgentRequest(query="show open incidents"))
+
+        assert agent.strategy.calls == 1
+        assert second.answer == first.answer
+        assert second.metadata["semantic_cache"]["hit"] is True
+
+    @pytest.mark.asyncio
+    async def test_bypass_and_failures_not_cached(self, agent):
+        await agent.process(AgentRequest(query="list open incidents"))
+        await agent.process(AgentRequest(query="list open incidents", context={"user_role": "admin"}))
+        await agent.process(AgentRequest(query="list open incidents", options={"use_cache": False}))
+        assert agent.strategy.calls == 3
+
+        await agent.process(AgentRequest(query="fail"))
+        await agent.process(AgentRequest(query="fail"))
+        assert agent.strategy.calls == 5
+
+    @pytest.mark.asyncio
+    async def test_sessions_with_history_are_not_shared(self, agent):
+        agent.memory = AgentMemory(max_tokens=1000, store=RedisMemoryStore(DictCacheManager()),
+                                   token_counter=lambda text: len(text.split()))
+        await agent.process(AgentRequest(query="delete a user", session_id="a", options={"use_cache": False}))
+        await agent.process(AgentRequest(query="what is an incident", session_id="b", options={"use_cache": False}))
+
+        first = await agent.process(AgentRequest(query="list open incidents", session_id="a"))
+        second = await agent.process(AgentRequest(query="show open incidents", session_id="b"))
+
+        # Each follow-up was answered with its own session's history
+        assert agent.strategy.calls == 4
+        assert second.answer != first.answer
+        assert "delete a user" in agent.strategy.memory_contexts[2]
+        assert "what is an incident" in agent.strategy.memory_contexts[3]
+        assert "delete a user" not in agent.strategy.memory_contexts[3]
+
+        # Fresh sessions still share answers
+        fresh = await agent.process(AgentRequest(query="list open incidents", session_id="c"))
+        repeat = await agent.process(AgentRequest(query="show open incidents", session_id="d"))
+        assert agent.strategy.calls == 5
+        assert repeat.answer == fresh.answer
+
+    def test_disabled_by_default(self):
+        agent = CachedAgent(BaseAgentConfig(retrieval_enabled=False, enable_memory=False))
+        assert agent.response_cache is None
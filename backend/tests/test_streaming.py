@@ -0,0 +1,200 @@
+"""
+Tests for streaming the final answer from LLMService through the agent
+strategies to WebSocket clients.
+"""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.agents.augment.strategies.direct import DirectStrategy
+from app.core.agents.augment.strategies.react import ReActStrategy
+from app.core.agents.base.agent import BaseAgent
+from app.core.agents.base.config import BaseAgentConfig
+from app.core.agents.base.llm_client import PooledLLMClient
+from app.core.agents.base.llm_service import LLMService, LLMServiceError
+from app.core.agents.base.response import AgentRequest, AgentResponse
+from app.core.agents.base.strategy import AgentStrategy
+from app.core.websocket import MessageType, WebSocketConnection, WebSocketManager, WebSocketMessage
+
+DELTAS = ["Open ", "incidents ", "are listed ", "under Service Desk."]
+
+
+def chunk(content):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=content))])
+
+
+class FakeStream:
+    def __init__(self, deltas, fail_after=None):
+        self.deltas = deltas
+        self.fail_after = fail_after
+
+    async def __aiter__(self):
+        yield SimpleNamespace(choices=[])
+        for i, delta in enumerate(self.deltas):
+            if i == self.fail_after:
+                raise ConnectionError("stream dropped")
+            yield chunk(delta)
+        yield chunk(None)
+
+
+class FakeCompletions:
+    def __init__(self, deltas, fail_after=None):
+        self.deltas = deltas
+        self.fail_after = fail_after
+        self.calls = []
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        if kwargs["stream"]:
+            return FakeStream(self.deltas, self.fail_after)
+        message = SimpleNamespace(content="".join(self.deltas))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def fake_client(deltas=DELTAS, fail_after=None):
+    return PooledLLMClient(SimpleNamespace(chat=SimpleNamespace(completions=FakeCompletions(deltas, fail_after))))
+
+
+@pytest.fixture
+def agent_config():
+    return BaseAgentConfig(openrouter_api_key="test-key", retrieval_enabled=False, enable_memory=False)
+
+
+class TestLLMServiceStreaming:
+    """Test cases for LLMService.stream_response"""
+
+    @pytest.mark.asyncio
+    async def test_stream_yields_deltas(self, agent_config):
+        service = LLMService(agent_config)
+        service.client = fake_client()
+
+        deltas = [delta async for delta in service.stream_response("list incidents", system_prompt="Be brief")]
+
+        assert deltas == DELTAS
+        call = service.client.client.chat.completions.calls[0]
+        assert call["stream"] is True
+        assert call["messages"][0] == {"role": "system", "content": "Be brief"}
+
+    @pytest.mark.asyncio
+    async def test_generate_response_with_on_token(self, agent_config):
+        service = LLMService(agent_config)
+        service.client = fake_client()
+        received = []
+
+        async def on_token(delta):
+            received.append(delta)
+
+        answer = await service.generate_response("list incidents", on_token=on_token)
+
+        assert received == DELTAS
+        assert answer == "".join(DELTAS).strip()
+        assert await service.generate_response("list incidents") == answer
+
+    @pytest.mark.asyncio
+    async def test_stream_errors_are_wrapped(self, agent_config):
+        service = LLMService(agent_config)
+        service.client = fake_client(fail_after=2)
+
+        with pytest.raises(LLMServiceError):
+            async for _ in service.stream_response("list incidents"):
+                pass
+
+
+class TestStrategyStreaming:
+    """Test cases for streaming final answers from DirectStrategy and ReActStrategy"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("strategy_class", [DirectStrategy, ReActStrategy])
+    async def test_final_answer_streamed(self, strategy_class, agent_config):
+        strategy = strategy_class({"max_reasoning_loops": 1}, agent_config)
+        strategy.llm_service.client = fake_client()
+        received = []
+
+        async def on_token(delta):
+            received.append(delta)
+
+        response = await strategy.execute("list incidents", None, [], on_token=on_token)
+
+        # ReAct also asks the LLM for a thought, which is not streamed
+        assert received == DELTAS
+        assert response.answer == "".join(DELTAS).strip()
+
+
+class PlainStrategy(AgentStrategy):
+    async def execute(self, query, context, tools, memory_context=""):
+        return AgentResponse(answer=f"answer to {query}", confidence=0.8)
+
+    def get_strategy_name(self):
+        return "plain"
+
+
+class PlainAgent(BaseAgent):
+    def _initialize_retriever(self):
+        return None
+
+    def _initialize_tools(self):
+        return []
+
+    def _initialize_strategy(self):
+        return PlainStrategy({})
+
+
+class RecordingWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send_text(self, text):
+        self.sent.append(json.loads(text))
+
+
+class TestAgentStreaming:
+    """Test cases for streaming through BaseAgent.process and the WebSocket manager"""
+
+    @pytest.mark.asyncio
+    async def test_non_streaming_strategy_sends_one_chunk(self):
+        agent = PlainAgent(BaseAgentConfig(retrieval_enabled=False, enable_memory=False, semantic_cache_enabled=False))
+        received = []
+
+        async def on_token(delta):
+            received.append(delta)
+
+        response = await agent.process(AgentRequest(query="list incidents"), on_token=on_token)
+
+        assert received == [response.answer]
+
+    @pytest.mark.asyncio
+    async def test_websocket_sends_chunks_then_response(self, agent_config):
+        agent = PlainAgent(agent_config.model_copy(update={"semantic_cache_enabled": False}))
+        agent.strategy = DirectStrategy({}, agent_config)
+        agent.strategy.llm_service.client = fake_client()
+
+        manager = WebSocketManager()
+        manager._get_agent = lambda agent_type: agent
+        websocket = RecordingWebSocket()
+        connection = WebSocketConnection(id="c1", websocket=websocket, user_id="u1", authenticated=True)
+
+        await manager._handle_agent_query(connection, WebSocketMessage(
+            type=MessageType.AGENT_QUERY, data={"query": "list incidents"}, correlation_id="q1"
+        ))
+
+        types = [sent["type"] for sent in websocket.sent]
+        assert types == ["agent_thinking"] + ["agent_response_chunk"] * len(DELTAS) + ["agent_response"]
+        assert [sent["data"]["delta"] for sent in websocket.sent[1:-1]] == DELTAS
+        final = websocket.sent[-1]
+        assert final["correlation_id"] == "q1"
+        assert final["data"]["response"] == "".join(DELTAS).strip()
+        assert final["data"]["chunks"] == len(DELTAS)
+
+    @pytest.mark.asyncio
+    async def test_websocket_unknown_agent(self):
+        manager = WebSocketManager()
+        websocket = RecordingWebSocket()
+        connection = WebSocketConnection(id="c1", websocket=websocket, user_id="u1", authenticated=True)
+
+        await manager._handle_agent_query(connection, WebSocketMessage(
+            type=MessageType.AGENT_QUERY, data={"query": "hi", "agent_type": "nope"}
+        ))
+
+        assert websocket.sent[-1]["type"] == "agent_error"